@@ -0,0 +1,265 @@
+"""
+Serviço HTTP (FastAPI) de análise de compatibilidade
+
+Expõe os endpoints de análise individual, análise em lote e busca no índice de
+candidatos. As chamadas de encode de requisições concorrentes são agrupadas por
+um micro-batcher dinâmico: ele acumula os textos por alguns milissegundos (ou
+até encher o lote) e os envia ao modelo em uma única chamada.
+
+Uso:
+    python api.py
+    uvicorn api:app --host 127.0.0.1 --port 8000
+"""
+
+import asyncio
+import dataclasses
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Callable, Dict, List, Any, Optional, Tuple
+import logging
+
+import numpy as np
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
+
+from config import get_config
+from semantic_engine import SemanticEngine, JobProfile
+from candidate_index import CandidateIndex
+import metrics
+import profiling
+
+logger = logging.getLogger(__name__)
+
+class MicroBatcher:
+    """
+    Agrupa textos de requisições concorrentes em chamadas únicas de encode
+    """
+
+    def __init__(self, encode_fn: Callable[[List[str]], np.ndarray],
+                 max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        """
+        Inicializa o micro-batcher
+
+        Args:
+            encode_fn: Função que codifica uma lista de textos em uma matriz
+            max_batch_size: Textos por chamada agrupada
+            max_wait_ms: Tempo máximo de espera para completar um lote
+        """
+        self.encode_fn = encode_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        # Uma única thread: o modelo processa um lote por vez
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='encode')
+
+    async def start(self):
+        """Inicia o laço de agrupamento no event loop atual"""
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Interrompe o laço e libera a thread de encode"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        self._executor.shutdown(wait=False)
+
+    async def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Codifica textos compartilhando a chamada ao modelo com outras requisições
+
+        Args:
+            texts: Textos a codificar
+
+        Returns:
+            Matriz (n_textos, dimensão) de embeddings normalizados
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((list(texts), future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[List[str], asyncio.Future]]:
+        """Aguarda o primeiro pedido e agrupa os seguintes até o limite de tempo ou tamanho"""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        size = len(batch[0][0])
+        deadline = loop.time() + self.max_wait
+
+        while size < self.max_batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            batch.append(item)
+            size += len(item[0])
+
+        return batch
+
+    async def _run(self):
+        """Laço principal: um encode por lote agrupado"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = await self._collect()
+            texts = [text for item_texts, _ in batch for text in item_texts]
+
+            try:
+                embeddings = await loop.run_in_executor(self._executor, self.encode_fn, texts)
+            except Exception as e:
+                logger.error(f"Erro no encode agrupado: {str(e)}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            offset = 0
+            for item_texts, future in batch:
+                if not future.done():
+                    future.set_result(embeddings[offset:offset + len(item_texts)])
+                offset += len(item_texts)
+
+class AnalyzeRequest(BaseModel):
+    resume_text: str
+    job_description: str
+    job_level: str = "Pleno"
+    profile: bool = False  # Perfila a análise completa (encode incluído) em Config.PROFILING_DIR
+
+class ResumeItem(BaseModel):
+    text: str
+    filename: str = "unknown"
+    id: Optional[str] = None
+
+class BatchAnalyzeRequest(BaseModel):
+    resumes: List[ResumeItem]
+    job_description: str
+    job_level: str = "Pleno"
+    profile: bool = False
+
+class SearchRequest(BaseModel):
+    job_description: str
+    job_level: str = "Pleno"
+    k: int = 50
+
+def _call_with_profiling(fn: Callable, *args) -> Any:
+    # O perfil forçado é ligado dentro da thread do threadpool que executa a chamada
+    with profiling.force_profiling():
+        return fn(*args)
+
+def create_app(engine: Optional[SemanticEngine] = None, index: Optional[CandidateIndex] = None) -> FastAPI:
+    """
+    Cria a aplicação FastAPI
+
+    Args:
+        engine: Motor semântico (padrão: modelo padrão da configuração)
+        index: Índice de candidatos para /search (padrão: Config.INDEX_DIR, se existir)
+
+    Returns:
+        Aplicação FastAPI
+    """
+    app_config = get_config()
+    engine = engine or SemanticEngine(app_config.DEFAULT_MODEL)
+    batcher = MicroBatcher(
+        engine.encode_texts,
+        max_batch_size=app_config.MICROBATCH_MAX_SIZE,
+        max_wait_ms=app_config.MICROBATCH_MAX_WAIT_MS
+    )
+    state: Dict[str, Any] = {'index': index}
+
+    @lru_cache(maxsize=128)
+    def lexical_job_profile(job_description: str, job_level: str) -> JobProfile:
+        # Perfil léxico da vaga (sem embedding) reaproveitado entre requisições
+        return engine.build_job_profile(job_description, job_level, with_embedding=False)
+
+    async def job_profile_with_embedding(job_description: str, job_level: str,
+                                         embedding: np.ndarray) -> JobProfile:
+        profile = await run_in_threadpool(lexical_job_profile, job_description, job_level)
+        return dataclasses.replace(profile, embedding=embedding)
+
+    @asynccontextmanager
+    async def lifespan(_app: FastAPI):
+        await run_in_threadpool(engine.warmup)
+
+        if state['index'] is None and os.path.exists(os.path.join(app_config.INDEX_DIR, 'ids.json')):
+            try:
+                state['index'] = await run_in_threadpool(CandidateIndex.load, engine, app_config.INDEX_DIR)
+            except Exception as e:
+                logger.error(f"Erro ao carregar índice de candidatos: {str(e)}")
+
+        await batcher.start()
+        yield
+        await batcher.stop()
+
+    app = FastAPI(title="MatchSense AI", lifespan=lifespan)
+
+    @app.get("/health")
+    async def health() -> Dict[str, Any]:
+        index_size = len(state['index']) if state['index'] is not None else 0
+        return {'status': 'ok', 'indexed_resumes': index_size}
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def metrics_endpoint() -> PlainTextResponse:
+        # Formato de texto do Prometheus; as séries só avançam com Config.METRICS_ENABLED
+        return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+    @app.post("/analyze")
+    async def analyze(request: AnalyzeRequest) -> Dict[str, Any]:
+        try:
+            if request.profile:
+                # Caminho completo (encode incluído) dentro do perfil, fora do micro-batcher
+                return await run_in_threadpool(_call_with_profiling, engine.analyze_compatibility,
+                                               request.resume_text, request.job_description, request.job_level)
+
+            # Vaga e currículo entram juntos no mesmo lote agrupado
+            embeddings = await batcher.encode([request.job_description, request.resume_text])
+            job_profile = await job_profile_with_embedding(request.job_description, request.job_level, embeddings[0])
+            similarity = max(0.0, float(np.dot(embeddings[0], embeddings[1])))
+
+            return await run_in_threadpool(engine.analyze_with_profile, request.resume_text, job_profile, similarity)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    @app.post("/batch-analyze")
+    async def batch_analyze(request: BatchAnalyzeRequest) -> List[Dict[str, Any]]:
+        resumes = [resume.model_dump(exclude_none=True) for resume in request.resumes]
+        if request.profile:
+            return await run_in_threadpool(_call_with_profiling, engine.batch_analyze,
+                                           resumes, request.job_description, request.job_level)
+
+        embeddings = await batcher.encode([request.job_description] + [resume['text'] for resume in resumes])
+        job_profile = await job_profile_with_embedding(request.job_description, request.job_level, embeddings[0])
+        semantic_scores = np.maximum(embeddings[1:] @ embeddings[0], 0.0)
+
+        return await run_in_threadpool(engine.score_candidates, resumes, job_profile, semantic_scores)
+
+    @app.post("/search")
+    async def search(request: SearchRequest) -> List[Dict[str, Any]]:
+        index = state['index']
+        if index is None:
+            raise HTTPException(status_code=503, detail="Índice de candidatos não carregado")
+
+        embeddings = await batcher.encode([request.job_description])
+        job_profile = await job_profile_with_embedding(request.job_description, request.job_level, embeddings[0])
+
+        return await run_in_threadpool(index.rank_profile, job_profile, request.k)
+
+    return app
+
+app = create_app()
+
+if __name__ == "__main__":
+    import uvicorn
+
+    api_config = get_config().get_api_config()
+    uvicorn.run(app, host=api_config['host'], port=api_config['port'])
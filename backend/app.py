@@ -10,6 +10,7 @@ import os
 
 from semantic_engine import SemanticEngine
 from document_processor import DocumentProcessor
+from score_table import ScoreTable
 from utils import *
 
 # Configuração da página
@@ -563,25 +564,46 @@ def show_comparison_page(semantic_engine, doc_processor):
                 # Adicionar currículos manuais
                 all_resumes.extend(manual_resumes)
                 
-                # Realizar análises
+                # Realizar análises em streaming (vaga pré-processada uma única vez)
+                progress_bar = st.progress(0.0)
+                partial_ranking = st.empty()
                 results = []
-                for resume in all_resumes:
-                    try:
-                        analysis = semantic_engine.analyze_compatibility(
-                            resume['text'], 
-                            job_description,
-                            "Senior"
-                        )
-                        results.append({
-                            'candidate': resume['name'],
-                            'analysis': analysis,
-                            'resume_text': resume['text']
-                        })
-                    except Exception as e:
-                        st.error(f"Erro na análise de {resume['name']}: {str(e)}")
+                
+                def show_partial_ranking(processed, total):
+                    progress_bar.progress(processed / total)
+                    ranking = sorted(results, key=lambda x: x['analysis']['overall_score'], reverse=True)
+                    partial_ranking.dataframe(pd.DataFrame([
+                        {
+                            'Candidato': r['candidate'],
+                            'Score Geral': f"{r['analysis']['overall_score']:.1f}%"
+                        }
+                        for r in ranking[:10]
+                    ]), use_container_width=True)
+                
+                stream = semantic_engine.iter_batch_analyze(
+                    [{'id': i, 'filename': r['name'], 'text': r['text']} for i, r in enumerate(all_resumes)],
+                    job_description,
+                    "Senior",
+                    progress_callback=show_partial_ranking,
+                    chunk_size=4
+                )
+                for analysis in stream:
+                    resume = all_resumes[analysis['id']]
+                    if 'error' in analysis:
+                        st.error(f"Erro na análise de {resume['name']}: {analysis['error']}")
+                        continue
+                    results.append({
+                        'candidate': resume['name'],
+                        'analysis': analysis,
+                        'resume_text': resume['text']
+                    })
                 
                 # Salvar resultados na sessão
                 st.session_state.comparison_results = results
+                st.session_state.comparison_score_table = ScoreTable.from_results(
+                    [r['analysis'] for r in results],
+                    ids=[r['candidate'] for r in results]
+                )
                 st.session_state.job_description = job_description
                 st.session_state.comparison_show_explanations = show_explanations
                 
@@ -808,21 +830,37 @@ def show_settings_page(semantic_engine):
     else:
         st.success("✅ Pesos configurados corretamente!")
     
+    weights = {
+        'semantic': semantic_weight,
+        'skills': skills_weight,
+        'experience': experience_weight,
+        'education': education_weight,
+        'soft_skills': soft_skills_weight
+    }
+    
+    # Re-ranqueamento instantâneo da última comparação (sem reprocessar currículos)
+    score_table = st.session_state.get('comparison_score_table')
+    if score_table is not None and len(score_table):
+        st.subheader("🔄 Ranking com os Pesos Atuais")
+        ranking = score_table.to_dataframe(weights)
+        st.dataframe(pd.DataFrame({
+            'Candidato': ranking['id'],
+            'Score Geral': ranking['overall_score'].map(lambda score: f"{score:.1f}%")
+        }), use_container_width=True)
+    
     # Botão para salvar configurações
     if st.button("💾 Salvar Configurações", type="primary"):
         config = {
             'model_name': model_name,
             'similarity_threshold': similarity_threshold,
-            'weights': {
-                'semantic': semantic_weight,
-                'skills': skills_weight,
-                'experience': experience_weight,
-                'education': education_weight,
-                'soft_skills': soft_skills_weight
-            }
+            'weights': weights
         }
         
         st.session_state['config'] = config
+        semantic_engine.update_config({
+            'similarity_threshold': similarity_threshold,
+            'weights': weights
+        })
         st.success("✅ Configurações salvas!")
 
 if __name__ == "__main__":
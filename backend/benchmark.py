@@ -0,0 +1,351 @@
+"""
+Micro-benchmarks das etapas do pipeline de pontuação
+
+Mede latência (p50/p95), vazão e pico de memória residente (RSS) de cada etapa:
+extração de texto por formato, extract_resume_info, os métodos extract_* do
+SemanticEngine, calculate_semantic_similarity, analyze_compatibility e
+batch_analyze em pools de tamanhos diferentes. Os dados de entrada são gerados
+de forma determinística (mesma semente, mesmos documentos) e o relatório é
+salvo em JSON para servir de baseline nas próximas execuções.
+
+Uso:
+    python benchmark.py                                   # todas as etapas
+    python benchmark.py --sizes 1 100 --only extract      # apenas etapas cujo nome contém 'extract'
+    python benchmark.py --compare benchmarks/baseline.json
+"""
+
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import logging
+
+import numpy as np
+
+from config import get_config
+from document_processor import DocumentProcessor
+from semantic_engine import SemanticEngine, TECHNICAL_SKILLS, SOFT_SKILLS
+from utils import create_sample_job_description, create_sample_resume, text_to_docx_bytes, text_to_pdf_bytes
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = (1, 100, 10000)
+
+# Métodos extract_* do SemanticEngine e o texto que cada um recebe
+ENGINE_EXTRACTORS = [
+    ('extract_skills', 'resume'),
+    ('extract_soft_skills', 'resume'),
+    ('extract_experience_info', 'resume'),
+    ('extract_education_info', 'resume'),
+    ('extract_resume_features', 'resume'),
+    ('extract_education_requirements', 'job'),
+]
+
+def reset_peak_rss() -> bool:
+    """
+    Zera o pico de RSS do processo (Linux: /proc/self/clear_refs)
+
+    Returns:
+        True se o pico foi zerado; caso contrário o pico medido é o do processo inteiro
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+def peak_rss_mb() -> float:
+    """Pico de memória residente do processo em MB"""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss é em KB no Linux e em bytes no macOS
+    return peak / (1024 * 1024) if platform.system() == 'Darwin' else peak / 1024
+
+def measure(fn: Callable[[Any], Any], inputs: Sequence[Any], items_per_call: int = 1,
+            warmup: int = 1) -> Dict[str, float]:
+    """
+    Mede uma função chamando-a uma vez para cada entrada
+
+    Args:
+        fn: Função medida
+        inputs: Entradas, uma por chamada (o número de entradas é o número de execuções)
+        items_per_call: Itens processados por chamada (para a vazão)
+        warmup: Chamadas de aquecimento com a primeira entrada, fora da medição
+
+    Returns:
+        Estatísticas de latência (ms), vazão (itens/s) e pico de RSS (MB)
+    """
+    for _ in range(warmup):
+        fn(inputs[0])
+
+    reset_peak_rss()
+    latencies = np.empty(len(inputs))
+    for run, value in enumerate(inputs):
+        start = time.perf_counter()
+        fn(value)
+        latencies[run] = time.perf_counter() - start
+
+    total = float(latencies.sum())
+    return {
+        'runs': len(inputs),
+        'items_per_run': items_per_call,
+        'p50_ms': float(np.percentile(latencies, 50) * 1000),
+        'p95_ms': float(np.percentile(latencies, 95) * 1000),
+        'mean_ms': float(latencies.mean() * 1000),
+        'min_ms': float(latencies.min() * 1000),
+        'throughput_per_s': items_per_call * len(inputs) / total if total > 0 else float('inf'),
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+def make_resumes(count: int, seed: int = 0) -> List[str]:
+    """
+    Gera currículos distintos e reproduzíveis a partir do currículo de exemplo
+
+    Cada variação tem skills, anos de experiência e tamanho diferentes, para
+    que nenhuma etapa se beneficie de caches entre execuções.
+
+    Args:
+        count: Número de currículos
+        seed: Semente do gerador
+
+    Returns:
+        Lista de textos
+    """
+    rng = random.Random(seed)
+    base = create_sample_resume()
+    resumes = []
+
+    for index in range(count):
+        skills = rng.sample(TECHNICAL_SKILLS, rng.randint(3, 15))
+        soft_skills = rng.sample(SOFT_SKILLS, rng.randint(1, 5))
+        resumes.append(
+            f"{base}\nCandidato {index}\n"
+            f"{rng.randint(1, 20)} anos de experiência com {', '.join(skills)}.\n"
+            f"Competências: {', '.join(soft_skills)}.\n"
+            + "Projetos relevantes em equipes ágeis.\n" * rng.randint(0, 10)
+        )
+
+    return resumes
+
+def _as_file(content: bytes, filename: str) -> io.BytesIO:
+    """Arquivo em memória com o atributo name, como os uploads do Streamlit"""
+    file = io.BytesIO(content)
+    file.name = filename
+    return file
+
+def run_benchmarks(engine: Optional[SemanticEngine] = None, processor: Optional[DocumentProcessor] = None,
+                   sizes: Sequence[int] = DEFAULT_SIZES, repeat: int = 20, only: Optional[str] = None,
+                   seed: int = 0, use_cache: bool = False) -> Dict[str, Any]:
+    """
+    Executa os benchmarks
+
+    Args:
+        engine: Motor semântico (padrão: modelo padrão)
+        processor: Processador de documentos
+        sizes: Tamanhos de pool para batch_analyze
+        repeat: Execuções por etapa (batch_analyze usa menos nos pools grandes)
+        only: Executa apenas etapas cujo nome contém este texto
+        seed: Semente dos dados gerados
+        use_cache: Se False, desativa o cache de embeddings em disco durante a medição
+
+    Returns:
+        Relatório com metadados e estatísticas por etapa
+    """
+    engine = engine or SemanticEngine()
+    processor = processor or DocumentProcessor()
+    if not use_cache:
+        engine.update_config({'cache': dict(engine.config['cache'], enabled=False)})
+    engine.warmup()
+
+    job_description = create_sample_job_description()
+    resumes = make_resumes(max(repeat, max(sizes, default=1)), seed)
+    samples = resumes[:repeat]
+    results: Dict[str, Dict[str, float]] = {}
+
+    def run(name: str, fn: Callable[[Any], Any], inputs: Sequence[Any], items_per_call: int = 1, warmup: int = 1):
+        if only and only not in name:
+            return
+        logger.info(f"Medindo {name}...")
+        results[name] = measure(fn, inputs, items_per_call, warmup)
+
+    # Extração de texto por formato (arquivos gerados antes da medição)
+    documents = {
+        'txt': [text.encode('utf-8') for text in samples],
+        'docx': [text_to_docx_bytes(text) for text in samples],
+        'pdf': [text_to_pdf_bytes(text) for text in samples],
+    }
+    for extension, contents in documents.items():
+        run(
+            f'extract_text[{extension}]',
+            lambda content, extension=extension: processor.extract_text(_as_file(content, f'curriculo.{extension}')),
+            contents
+        )
+
+    run('extract_resume_info', processor.extract_resume_info, samples)
+
+    for method, source in ENGINE_EXTRACTORS:
+        inputs = samples if source == 'resume' else [f"{job_description}\n{index}" for index in range(repeat)]
+        run(method, getattr(engine, method), inputs)
+
+    run('calculate_semantic_similarity', lambda text: engine.calculate_semantic_similarity(text, job_description), samples)
+    run('analyze_compatibility', lambda text: engine.analyze_compatibility(text, job_description, "Sênior"), samples)
+
+    for size in sizes:
+        # Pools grandes: menos execuções, sem aquecimento (o modelo já está carregado)
+        runs = max(1, min(repeat, 1000 // size))
+        pools = [
+            [{'text': text, 'filename': f'curriculo_{index}.txt'} for index, text in enumerate(resumes[:size])]
+            for _ in range(runs)
+        ]
+        run(
+            f'batch_analyze[{size}]',
+            lambda pool: engine.batch_analyze(pool, job_description, "Sênior"),
+            pools,
+            items_per_call=size,
+            warmup=1 if size <= 100 else 0
+        )
+
+    return {'meta': _metadata(engine, seed, repeat, use_cache), 'results': results}
+
+def _metadata(engine: SemanticEngine, seed: int, repeat: int, use_cache: bool) -> Dict[str, Any]:
+    """Ambiente da execução, para que relatórios só sejam comparados entre condições equivalentes"""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'model': engine.model_name,
+        'inference': engine.config['inference'],
+        'cache': use_cache,
+        'seed': seed,
+        'repeat': repeat
+    }
+
+def save_report(report: Dict[str, Any], path: Optional[str] = None) -> str:
+    """
+    Salva o relatório em JSON
+
+    Args:
+        report: Relatório de run_benchmarks
+        path: Caminho do arquivo (padrão: Config.BENCHMARK_DIR/benchmark_<data>.json)
+
+    Returns:
+        Caminho do arquivo salvo
+    """
+    if path is None:
+        path = os.path.join(get_config().BENCHMARK_DIR, f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    return path
+
+def compare_reports(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.1) -> List[Dict[str, Any]]:
+    """
+    Compara as latências p50/p95 de duas execuções
+
+    Args:
+        current: Relatório atual
+        baseline: Relatório de referência
+        threshold: Variação relativa do p50 considerada regressão (0.1 = 10%)
+
+    Returns:
+        Uma linha por etapa presente nos dois relatórios
+    """
+    rows = []
+    for name, stats in current['results'].items():
+        reference = baseline['results'].get(name)
+        if reference is None:
+            continue
+
+        change = stats['p50_ms'] / reference['p50_ms'] - 1 if reference['p50_ms'] > 0 else 0.0
+        rows.append({
+            'name': name,
+            'baseline_p50_ms': reference['p50_ms'],
+            'p50_ms': stats['p50_ms'],
+            'baseline_p95_ms': reference['p95_ms'],
+            'p95_ms': stats['p95_ms'],
+            'p50_change': change,
+            'regression': change > threshold
+        })
+
+    return rows
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Tabela em texto com as estatísticas de cada etapa"""
+    lines = [f"{'etapa':<34}{'p50 ms':>11}{'p95 ms':>11}{'itens/s':>12}{'pico RSS MB':>13}"]
+    for name, stats in report['results'].items():
+        lines.append(
+            f"{name:<34}{stats['p50_ms']:>11.3f}{stats['p95_ms']:>11.3f}"
+            f"{stats['throughput_per_s']:>12.1f}{stats['peak_rss_mb']:>13.1f}"
+        )
+    return '\n'.join(lines)
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Micro-benchmarks do pipeline de pontuação")
+    parser.add_argument('--model', default="sentence-transformers/all-MiniLM-L6-v2")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help="Tamanhos de pool do batch_analyze")
+    parser.add_argument('--repeat', type=int, default=20, help="Execuções por etapa")
+    parser.add_argument('--only', default=None, help="Executa apenas etapas cujo nome contém este texto")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--cache', action='store_true', help="Mantém o cache de embeddings em disco ativo")
+    parser.add_argument('--output', default=None, help="Arquivo JSON de saída")
+    parser.add_argument('--compare', default=None, help="Relatório JSON usado como baseline")
+    parser.add_argument('--threshold', type=float, default=0.1, help="Aumento relativo do p50 tratado como regressão")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format=get_config().LOG_FORMAT)
+    # Os logs por análise do motor distorceriam as medições
+    logging.getLogger('semantic_engine').setLevel(logging.WARNING)
+
+    report = run_benchmarks(
+        SemanticEngine(args.model), sizes=args.sizes, repeat=args.repeat,
+        only=args.only, seed=args.seed, use_cache=args.cache
+    )
+    print(format_report(report))
+    print(f"\nRelatório salvo em: {save_report(report, args.output)}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+        print(f"\nComparação com {args.compare} (p50):")
+        rows = compare_reports(report, baseline, args.threshold)
+        for row in rows:
+            flag = '  <-- REGRESSÃO' if row['regression'] else ''
+            print(f"{row['name']:<34}{row['baseline_p50_ms']:>11.3f} -> {row['p50_ms']:>11.3f} ms ({row['p50_change']:+.1%}){flag}")
+
+        if any(row['regression'] for row in rows):
+            raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,624 @@
+"""
+Índice vetorial de currículos para recuperação top-k em grandes bancos de talentos
+
+Os embeddings normalizados dos currículos ficam em uma matriz. Para bancos
+pequenos a busca é exata (um único produto matricial); acima de
+Config.INDEX_EXACT_THRESHOLD o índice treina um IVF (k-means esférico) em
+processo e visita apenas as listas mais próximas da vaga. Somente a shortlist
+recuperada passa pela pontuação completa do SemanticEngine. Os vetores podem ser
+guardados em float16 ou int8 (Config.INDEX_PRECISION) para reduzir a memória.
+
+Atualizações são incrementais: remoções marcam a linha com uma lápide (tombstone)
+filtrada nas consultas, atualizações removem e reinserem, e compact() recupera o
+espaço em segundo plano sem bloquear as buscas.
+"""
+
+import json
+import os
+import threading
+from typing import Dict, List, Any, Optional, Tuple
+import logging
+
+import numpy as np
+
+from config import get_config
+from semantic_engine import SemanticEngine, JobProfile
+from embedding_storage import CompactEmbeddings, grow_buffer
+
+logger = logging.getLogger(__name__)
+
+class VectorIndex:
+    """
+    Índice de vetores de norma unitária com busca exata ou IVF
+    """
+
+    def __init__(self, exact_threshold: Optional[int] = None, nprobe: Optional[int] = None,
+                 nlist: Optional[int] = None, precision: Optional[str] = None):
+        """
+        Inicializa o índice vazio
+
+        Args:
+            exact_threshold: Número de vetores a partir do qual o IVF é usado
+            nprobe: Número de listas IVF visitadas por consulta
+            nlist: Número de listas IVF (padrão: ~sqrt(n))
+            precision: Precisão de armazenamento ('float32', 'float16' ou 'int8')
+        """
+        index_config = get_config().get_index_config()
+        self.exact_threshold = exact_threshold if exact_threshold is not None else index_config['exact_threshold']
+        self.nprobe = nprobe if nprobe is not None else index_config['nprobe']
+        self.nlist = nlist
+
+        self.ids: List[str] = []
+        self.id_to_row: Dict[str, int] = {}
+        self.storage = CompactEmbeddings(precision or index_config['precision'])
+        self._lock = threading.RLock()
+        self._compaction_lock = threading.Lock()  # Uma compactação por vez
+
+        # Lápides e atribuições IVF ficam em buffers com folga (ver grow_buffer),
+        # alinhados com as linhas; as propriedades expõem só as linhas ocupadas
+        self._deleted = np.zeros(0, dtype=bool)
+        self._assignments: Optional[np.ndarray] = None
+
+        # Estruturas do IVF (None enquanto a busca for exata)
+        self.centroids: Optional[np.ndarray] = None
+        self.inverted_lists: Optional[List[np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self.id_to_row)
+
+    @property
+    def deleted(self) -> np.ndarray:
+        """Lápides, uma por linha"""
+        return self._deleted[:len(self.ids)]
+
+    @deleted.setter
+    def deleted(self, value: np.ndarray):
+        self._deleted = value
+
+    @property
+    def assignments(self) -> Optional[np.ndarray]:
+        """Lista IVF de cada linha (None enquanto a busca for exata)"""
+        return self._assignments[:len(self.ids)] if self._assignments is not None else None
+
+    @assignments.setter
+    def assignments(self, value: Optional[np.ndarray]):
+        self._assignments = value
+
+    @property
+    def tombstone_ratio(self) -> float:
+        """Fração das linhas ocupada por itens removidos"""
+        return float(self.deleted.mean()) if len(self.deleted) else 0.0
+
+    @property
+    def is_approximate(self) -> bool:
+        """Indica se as consultas usam o IVF"""
+        return self.centroids is not None
+
+    @property
+    def vectors(self) -> Optional[np.ndarray]:
+        """Vetores reconstruídos em float32 (None se o índice estiver vazio)"""
+        return self.storage.to_float() if len(self.storage) else None
+
+    def add(self, ids: List[str], vectors: np.ndarray):
+        """
+        Adiciona vetores ao índice
+
+        O custo sob o lock é proporcional aos vetores novos (e às listas IVF que
+        eles alcançam), não ao tamanho do índice, para que as buscas concorrentes
+        não fiquem bloqueadas.
+
+        Args:
+            ids: Identificadores únicos, alinhados com `vectors`
+            vectors: Matriz (n, dimensão) de embeddings normalizados
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if len(ids) != len(vectors):
+            raise ValueError("Número de ids diferente do número de vetores")
+
+        with self._lock:
+            for item_id in ids:
+                if item_id in self.id_to_row:
+                    raise ValueError(f"Id duplicado no índice: {item_id}")
+
+            start = len(self.ids)
+            rows = np.arange(start, start + len(ids))
+            self.storage.append(vectors)
+            self._deleted = grow_buffer(self._deleted, start, len(ids))
+            self._deleted[rows] = False
+
+            if self.is_approximate:
+                # Novos vetores entram na lista do centróide mais próximo, sem retreinar
+                new_assignments = self._assign(vectors)
+                self._assignments = grow_buffer(self._assignments, start, len(ids))
+                self._assignments[rows] = new_assignments
+                self._append_to_inverted_lists(rows, new_assignments)
+
+            self.ids.extend(ids)
+            for offset, item_id in enumerate(ids):
+                self.id_to_row[item_id] = start + offset
+
+            if not self.is_approximate and len(self) >= self.exact_threshold:
+                self.build()
+
+    def update(self, ids: List[str], vectors: np.ndarray):
+        """
+        Substitui (ou insere) vetores: a versão anterior vira lápide
+
+        Args:
+            ids: Identificadores, alinhados com `vectors`
+            vectors: Matriz (n, dimensão) de embeddings normalizados
+        """
+        with self._lock:
+            self.delete(ids)
+            self.add(ids, vectors)
+
+    def delete(self, ids: List[str]) -> int:
+        """
+        Remove itens marcando suas linhas com lápides (filtradas nas consultas)
+
+        Args:
+            ids: Identificadores a remover (ids inexistentes são ignorados)
+
+        Returns:
+            Número de itens removidos
+        """
+        removed = 0
+        with self._lock:
+            for item_id in ids:
+                row = self.id_to_row.pop(item_id, None)
+                if row is not None:
+                    self.deleted[row] = True
+                    removed += 1
+        return removed
+
+    def get_vectors(self, ids: List[str]) -> np.ndarray:
+        """
+        Retorna os vetores (float32) de itens indexados
+
+        Args:
+            ids: Identificadores presentes no índice
+
+        Returns:
+            Matriz (n, dimensão) alinhada com `ids`
+        """
+        with self._lock:
+            rows = np.array([self.id_to_row[item_id] for item_id in ids], dtype=np.int64)
+            return self.storage.to_float(rows)
+
+    def compact(self):
+        """
+        Reconstrói o índice sem as linhas removidas
+
+        A cópia compactada é montada fora do lock; as buscas continuam usando a
+        versão atual até a troca final, que também aplica as inserções e remoções
+        feitas durante a compactação.
+        """
+        with self._compaction_lock:
+            self._compact()
+
+    def _compact(self):
+        """Etapas da compactação (chamado com _compaction_lock)"""
+        with self._lock:
+            n_rows = len(self.ids)
+            keep = np.flatnonzero(~self.deleted[:n_rows])
+            storage = self.storage
+            ids = list(self.ids)
+
+        if len(keep) == n_rows:
+            return
+
+        # Etapa pesada, sem lock: copiar apenas as linhas vivas
+        new_storage = storage.take(keep)
+        new_ids = [ids[row] for row in keep]
+
+        with self._lock:
+            added = np.arange(n_rows, len(self.ids))
+            if len(added):
+                new_storage.extend(self.storage.take(added))
+                new_ids.extend(self.ids[n_rows:])
+
+            rows = np.concatenate([keep, added])
+            new_deleted = self.deleted[rows]
+
+            if self.assignments is not None:
+                self.assignments = self.assignments[rows]
+
+            self.storage = new_storage
+            self.ids = new_ids
+            self.deleted = new_deleted
+            self.id_to_row = {item_id: row for row, item_id in enumerate(new_ids) if not new_deleted[row]}
+
+            if self.assignments is not None:
+                self._rebuild_inverted_lists()
+
+        logger.info(f"Índice compactado: {n_rows - len(keep)} linhas removidas")
+
+    def build(self, iterations: int = 10, seed: int = 0):
+        """
+        Treina o IVF (k-means esférico) quando o índice ultrapassa o limiar da busca exata
+
+        Args:
+            iterations: Iterações do k-means
+            seed: Semente para reprodutibilidade
+        """
+        n = len(self.ids)
+        if len(self) < self.exact_threshold:
+            self.centroids = None
+            self.assignments = None
+            self.inverted_lists = None
+            return
+
+        # Linhas removidas não entram no treino, só na atribuição final
+        alive = np.flatnonzero(~self.deleted)
+        nlist = min(self.nlist or max(1, int(np.sqrt(len(alive)))), len(alive))
+        rng = np.random.default_rng(seed)
+
+        # Treinar em uma amostra para manter o custo proporcional a nlist
+        sample_size = min(len(alive), nlist * 64)
+        sample = self.storage.to_float(np.sort(rng.choice(alive, sample_size, replace=False)))
+        centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+
+        for _ in range(iterations):
+            labels = self._nearest(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=nlist)
+
+            empty = counts == 0
+            if empty.any():
+                # Reiniciar listas vazias com pontos aleatórios
+                sums[empty] = sample[rng.choice(sample_size, int(empty.sum()), replace=False)]
+
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = sums / np.maximum(norms, 1e-12)
+
+        self.centroids = centroids.astype(np.float32)
+        self.assignments = np.concatenate([self._assign(block) for block in self.storage.iter_float_chunks()])
+        self._rebuild_inverted_lists()
+
+        logger.info(f"Índice IVF treinado: {n} vetores em {nlist} listas")
+
+    @staticmethod
+    def _nearest(vectors: np.ndarray, centroids: np.ndarray, chunk_size: int = 8192) -> np.ndarray:
+        """Retorna o centróide mais próximo de cada vetor, processando em blocos"""
+        labels = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), chunk_size):
+            block = vectors[start:start + chunk_size]
+            labels[start:start + chunk_size] = np.argmax(block @ centroids.T, axis=1)
+        return labels
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        """Atribui vetores às listas IVF"""
+        return self._nearest(vectors, self.centroids)
+
+    def _rebuild_inverted_lists(self):
+        """Reconstrói as listas invertidas a partir das atribuições"""
+        order = np.argsort(self.assignments, kind='stable')
+        boundaries = np.searchsorted(self.assignments[order], np.arange(len(self.centroids) + 1))
+        self.inverted_lists = [order[boundaries[i]:boundaries[i + 1]] for i in range(len(self.centroids))]
+
+    def _append_to_inverted_lists(self, rows: np.ndarray, labels: np.ndarray):
+        """Acrescenta linhas novas apenas às listas invertidas que elas alcançam"""
+        # Lista nova: buscas em andamento continuam com a versão que capturaram
+        inverted_lists = list(self.inverted_lists)
+        for label in np.unique(labels):
+            inverted_lists[label] = np.concatenate([inverted_lists[label], rows[labels == label]])
+        self.inverted_lists = inverted_lists
+
+    def _candidate_rows(self, query: np.ndarray, centroids: Optional[np.ndarray],
+                        inverted_lists: Optional[List[np.ndarray]]) -> Optional[np.ndarray]:
+        """Linhas a avaliar para a consulta (None = todas)"""
+        if centroids is None:
+            return None
+
+        nprobe = min(self.nprobe, len(centroids))
+        centroid_scores = centroids @ query
+        probes = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        return np.concatenate([inverted_lists[p] for p in probes])
+
+    def search(self, query: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        """
+        Busca os k vetores mais similares à consulta
+
+        Args:
+            query: Embedding normalizado da consulta
+            k: Número de resultados
+
+        Returns:
+            Lista de (id, similaridade cosseno) em ordem decrescente
+        """
+        if not len(self) or k <= 0:
+            return []
+
+        # Referências consistentes do estado atual; a busca em si roda sem lock
+        with self._lock:
+            storage, ids, deleted = self.storage, self.ids, self.deleted
+            centroids, inverted_lists = self.centroids, self.inverted_lists
+            n_rows = len(deleted)
+
+        query = np.asarray(query, dtype=np.float32)
+        rows = self._candidate_rows(query, centroids, inverted_lists)
+
+        scores = storage.dot(query, rows)
+        if rows is None:
+            scores = scores[:n_rows]
+            rows = np.arange(n_rows)
+
+        # Filtrar lápides
+        alive = ~deleted[rows]
+        rows, scores = rows[alive], scores[alive]
+        if not len(scores):
+            return []
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+
+        return [(ids[rows[i]], float(scores[i])) for i in top]
+
+    def save(self, directory: str):
+        """
+        Salva o índice em disco
+
+        Args:
+            directory: Diretório de destino
+        """
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            arrays = self.storage.to_arrays()
+            arrays['deleted'] = self.deleted
+            if self.is_approximate:
+                arrays['centroids'] = self.centroids
+                arrays['assignments'] = self.assignments
+            ids = list(self.ids)
+        np.savez(os.path.join(directory, 'vectors.npz'), **arrays)
+
+        with open(os.path.join(directory, 'ids.json'), 'w', encoding='utf-8') as f:
+            json.dump({
+                'ids': ids,
+                'exact_threshold': self.exact_threshold,
+                'nprobe': self.nprobe,
+                'nlist': self.nlist
+            }, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, directory: str) -> 'VectorIndex':
+        """
+        Carrega um índice salvo com save()
+
+        Args:
+            directory: Diretório do índice
+
+        Returns:
+            Índice carregado
+        """
+        with open(os.path.join(directory, 'ids.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+
+        index = cls(exact_threshold=meta['exact_threshold'], nprobe=meta['nprobe'], nlist=meta['nlist'])
+        data = np.load(os.path.join(directory, 'vectors.npz'))
+
+        index.ids = meta['ids']
+        index.deleted = data['deleted'] if 'deleted' in data else np.zeros(len(index.ids), dtype=bool)
+        index.id_to_row = {item_id: row for row, item_id in enumerate(index.ids) if not index.deleted[row]}
+        if 'data' in data:
+            index.storage = CompactEmbeddings.from_arrays(data)
+        else:
+            # Formato anterior: matriz float32 em 'vectors'
+            index.storage = CompactEmbeddings('float32')
+            if index.ids:
+                index.storage.append(data['vectors'])
+
+        if 'centroids' in data:
+            index.centroids = data['centroids']
+            index.assignments = data['assignments']
+            index._rebuild_inverted_lists()
+
+        return index
+
+class CandidateIndex:
+    """
+    Índice de currículos: recupera a shortlist por embedding e pontua só ela
+    """
+
+    def __init__(self, engine: SemanticEngine, vector_index: Optional[VectorIndex] = None):
+        """
+        Inicializa o índice de candidatos
+
+        Args:
+            engine: Motor semântico usado para codificar e pontuar
+            vector_index: Índice vetorial existente (opcional)
+        """
+        self.engine = engine
+        self.vector_index = vector_index or VectorIndex()
+        self.resumes: Dict[str, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.vector_index)
+
+    def add_resumes(self, resumes: List[Dict[str, Any]], embeddings: Optional[np.ndarray] = None):
+        """
+        Codifica e indexa currículos
+
+        Args:
+            resumes: Lista de currículos (cada um com 'id' e 'text'; 'filename' opcional)
+            embeddings: Embeddings já calculados, alinhados com `resumes` (opcional)
+        """
+        if not resumes:
+            return
+
+        ids = [str(resume['id']) for resume in resumes]
+        if embeddings is None:
+            embeddings = self.engine.encode_texts([resume['text'] for resume in resumes])
+        self.vector_index.add(ids, embeddings)
+
+        for item_id, resume in zip(ids, resumes):
+            self.resumes[item_id] = {
+                'id': item_id,
+                'filename': resume.get('filename', item_id),
+                'text': resume['text']
+            }
+
+        logger.info(f"{len(ids)} currículos indexados (total: {len(self)})")
+
+    def update_resumes(self, resumes: List[Dict[str, Any]]):
+        """
+        Reindexa currículos alterados (ids ainda não indexados são inseridos)
+
+        Args:
+            resumes: Lista de currículos (cada um com 'id' e 'text'; 'filename' opcional)
+        """
+        if not resumes:
+            return
+
+        ids = [str(resume['id']) for resume in resumes]
+        embeddings = self.engine.encode_texts([resume['text'] for resume in resumes])
+
+        for item_id, resume in zip(ids, resumes):
+            self.resumes[item_id] = {
+                'id': item_id,
+                'filename': resume.get('filename', item_id),
+                'text': resume['text']
+            }
+        self.vector_index.update(ids, embeddings)
+
+        logger.info(f"{len(ids)} currículos atualizados (total: {len(self)})")
+
+    def delete_resumes(self, ids: List[Any]) -> int:
+        """
+        Remove currículos do índice
+
+        Args:
+            ids: Identificadores dos currículos
+
+        Returns:
+            Número de currículos removidos
+        """
+        ids = [str(item_id) for item_id in ids]
+        removed = self.vector_index.delete(ids)
+        for item_id in ids:
+            self.resumes.pop(item_id, None)
+
+        logger.info(f"{removed} currículos removidos (total: {len(self)})")
+        return removed
+
+    def export_resumes(self, ids: List[Any]) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+        """
+        Retorna currículos indexados junto com seus embeddings (ex: para movê-los de índice)
+
+        Args:
+            ids: Identificadores dos currículos (ids ausentes são ignorados)
+
+        Returns:
+            (currículos, matriz de embeddings alinhada)
+        """
+        ids = [str(item_id) for item_id in ids if str(item_id) in self.vector_index.id_to_row]
+        return [self.resumes[item_id] for item_id in ids], self.vector_index.get_vectors(ids)
+
+    @property
+    def tombstone_ratio(self) -> float:
+        return self.vector_index.tombstone_ratio
+
+    def compact(self):
+        """Recupera o espaço dos currículos removidos (ver VectorIndex.compact)"""
+        self.vector_index.compact()
+
+    def search(self, job: Any, k: int = 50) -> List[Tuple[str, float]]:
+        """
+        Recupera os k currículos mais próximos da vaga apenas por embedding
+
+        Args:
+            job: Texto da vaga ou JobProfile já construído
+            k: Número de currículos
+
+        Returns:
+            Lista de (id do currículo, similaridade cosseno)
+        """
+        if isinstance(job, JobProfile):
+            query = job.embedding
+        else:
+            query = self.engine.encode_texts([job])[0]
+
+        if query is None:
+            return []
+
+        return self.vector_index.search(query, k)
+
+    def rank(self, job_description: str, job_level: str = "Pleno", k: int = 50,
+             shortlist_size: Optional[int] = None) -> List[Dict]:
+        """
+        Retorna os k melhores currículos para a vaga com a pontuação completa
+
+        Apenas a shortlist recuperada pelo índice passa pelos scores léxicos, e a
+        similaridade semântica reutiliza os embeddings já armazenados.
+
+        Args:
+            job_description: Descrição da vaga
+            job_level: Nível da vaga
+            k: Número de currículos retornados
+            shortlist_size: Tamanho da shortlist (padrão: k * INDEX_SHORTLIST_FACTOR)
+
+        Returns:
+            Lista de resultados ordenados por score (mesmo formato de batch_analyze)
+        """
+        job_profile = self.engine.build_job_profile(job_description, job_level)
+        return self.rank_profile(job_profile, k, shortlist_size)
+
+    def rank_profile(self, job_profile: JobProfile, k: int = 50,
+                     shortlist_size: Optional[int] = None) -> List[Dict]:
+        """
+        Igual a rank(), para uma vaga já pré-processada (com embedding)
+
+        Args:
+            job_profile: Perfil da vaga gerado por build_job_profile
+            k: Número de currículos retornados
+            shortlist_size: Tamanho da shortlist (padrão: k * INDEX_SHORTLIST_FACTOR)
+
+        Returns:
+            Lista de resultados ordenados por score (mesmo formato de batch_analyze)
+        """
+        if shortlist_size is None:
+            shortlist_size = k * get_config().INDEX_SHORTLIST_FACTOR
+
+        hits = self.search(job_profile, max(k, shortlist_size))
+
+        # Currículos removidos entre a busca e a pontuação ficam de fora
+        hits = [(item_id, score) for item_id, score in hits if item_id in self.resumes]
+        shortlist = [self.resumes[item_id] for item_id, _ in hits]
+        semantic_scores = np.maximum(np.array([score for _, score in hits], dtype=np.float32), 0.0)
+
+        results = self.engine.score_candidates(shortlist, job_profile, semantic_scores)
+        return results[:k]
+
+    def save(self, directory: Optional[str] = None):
+        """
+        Salva o índice e os currículos em disco
+
+        Args:
+            directory: Diretório de destino (padrão: Config.INDEX_DIR)
+        """
+        directory = directory or get_config().INDEX_DIR
+        self.vector_index.save(directory)
+        with open(os.path.join(directory, 'resumes.json'), 'w', encoding='utf-8') as f:
+            json.dump(dict(self.resumes), f, ensure_ascii=False)
+
+        logger.info(f"Índice de candidatos salvo em: {directory}")
+
+    @classmethod
+    def load(cls, engine: SemanticEngine, directory: Optional[str] = None) -> 'CandidateIndex':
+        """
+        Carrega um índice salvo com save()
+
+        Args:
+            engine: Motor semântico
+            directory: Diretório do índice (padrão: Config.INDEX_DIR)
+
+        Returns:
+            Índice de candidatos carregado
+        """
+        directory = directory or get_config().INDEX_DIR
+        index = cls(engine, VectorIndex.load(directory))
+        with open(os.path.join(directory, 'resumes.json'), 'r', encoding='utf-8') as f:
+            index.resumes = json.load(f)
+
+        return index
@@ -0,0 +1,95 @@
+"""
+Compactação em segundo plano dos índices incrementais
+
+Remoções e atualizações nos índices (VectorIndex, BM25Index, CandidateIndex,
+LexicalPrefilter) deixam lápides que as consultas filtram. Uma thread daemon
+verifica periodicamente a fração de lápides de cada índice e chama compact()
+quando ela passa do limite, mantendo a latência das consultas estável enquanto
+o pool de currículos muda.
+"""
+
+import threading
+from typing import Any, List, Optional
+import logging
+
+from config import get_config
+
+logger = logging.getLogger(__name__)
+
+class BackgroundCompactor:
+    """
+    Thread que compacta índices com muitas lápides
+    """
+
+    def __init__(self, indexes: List[Any], interval_seconds: Optional[float] = None,
+                 tombstone_ratio: Optional[float] = None):
+        """
+        Inicializa o compactador
+
+        Args:
+            indexes: Índices com `tombstone_ratio` e `compact()`
+            interval_seconds: Intervalo entre verificações (padrão: Config.COMPACTION_INTERVAL_SECONDS)
+            tombstone_ratio: Fração de lápides que dispara a compactação
+                (padrão: Config.COMPACTION_TOMBSTONE_RATIO)
+        """
+        compaction_config = get_config().get_compaction_config()
+        self.indexes = list(indexes)
+        self.interval_seconds = interval_seconds if interval_seconds is not None else compaction_config['interval_seconds']
+        self.tombstone_ratio = tombstone_ratio if tombstone_ratio is not None else compaction_config['tombstone_ratio']
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> 'BackgroundCompactor':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Inicia a thread de compactação"""
+        if self.running:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='index-compactor', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Interrompe a thread (uma compactação em andamento é concluída antes)
+
+        Args:
+            timeout: Tempo máximo de espera em segundos
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run_once(self) -> int:
+        """
+        Compacta os índices acima do limite de lápides
+
+        Returns:
+            Número de índices compactados
+        """
+        compacted = 0
+        for index in self.indexes:
+            try:
+                if index.tombstone_ratio >= self.tombstone_ratio:
+                    index.compact()
+                    compacted += 1
+            except Exception as e:
+                logger.error(f"Erro ao compactar índice {type(index).__name__}: {str(e)}")
+
+        return compacted
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval_seconds):
+            self.run_once()
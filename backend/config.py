@@ -12,9 +12,20 @@ class Config:
     DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
     MULTILINGUAL_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
     
+    # Configurações do backend de inferência ("torch" ou "onnx")
+    INFERENCE_BACKEND = "torch"
+    ONNX_QUANTIZE = True                # Quantização dinâmica int8 dos pesos
+    ONNX_DIR = "models/onnx"
+    ONNX_MIN_COSINE_AGREEMENT = 0.98    # Cosseno mínimo contra o PyTorch na validação
+    
     # Configurações de similaridade
     DEFAULT_SIMILARITY_THRESHOLD = 0.7
     
+    # Match semântico de skills (sinônimos via matriz de embeddings do vocabulário)
+    SEMANTIC_SKILL_MATCHING = False
+    SKILL_EMBEDDINGS_PATH = "cache/skill_embeddings.npz"
+    SKILL_MAX_NGRAM = 2   # Tamanho máximo dos n-gramas comparados ao vocabulário
+    
     # Pesos padrão para análise
     DEFAULT_WEIGHTS = {
         'semantic': 0.4,      # Similaridade semântica
@@ -39,12 +50,65 @@ class Config:
     LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     
     # Configurações de performance
-    BATCH_SIZE = 10
+    BATCH_SIZE = 64  # Textos por chamada de model.encode
     MAX_TEXT_LENGTH = 10000
+    PARALLEL_WORKERS = None      # Processos na pontuação paralela (None = núcleos disponíveis)
+    PARALLEL_SHARD_SIZE = 256    # Currículos enviados por vez a cada processo
+    BENCHMARK_DIR = "benchmarks" # Relatórios JSON de benchmark.py (baselines)
+    SYNTHETIC_CORPUS_DIR = "data/synthetic"  # Saída de corpus_generator.py
+    
+    # Configurações do índice vetorial de candidatos
+    INDEX_EXACT_THRESHOLD = 20000  # Abaixo disso a busca é exata (produto matricial)
+    INDEX_NPROBE = 8               # Listas IVF visitadas por consulta
+    INDEX_SHORTLIST_FACTOR = 4     # Shortlist = k * fator antes da pontuação completa
+    INDEX_PRECISION = "float32"    # "float32", "float16" ou "int8" (escala por vetor)
+    INDEX_DIR = "index"
+    
+    # Configurações do pré-filtro léxico (BM25)
+    BM25_K1 = 1.5
+    BM25_B = 0.75
+    LEXICAL_SHORTLIST_SIZE = 500   # Currículos que seguem para o modelo denso
+    LEXICAL_INDEX_DIR = "index/lexical"
+    
+    # Configurações do serviço HTTP (api.py)
+    API_HOST = "127.0.0.1"
+    API_PORT = 8000
+    MICROBATCH_MAX_SIZE = 64      # Textos por chamada agrupada de encode
+    MICROBATCH_MAX_WAIT_MS = 5.0  # Espera máxima para agrupar requisições concorrentes
+    
+    # Store memmap de embeddings de currículos (leitura por id em vez de encode)
+    EMBEDDING_STORE_ENABLED = False
+    EMBEDDING_STORE_DIR = "index/embeddings"
+    EMBEDDING_STORE_DTYPE = "float32"   # "float32" ou "float16"
+    
+    # Índice de candidatos distribuído em shards (sharded_index.py)
+    SHARD_HOST = "127.0.0.1"
+    SHARD_AUTHKEY = os.getenv('SHARD_AUTHKEY', '')  # Chave compartilhada entre coordenador e shards
+    SHARD_TIMEOUT_SECONDS = 60.0
+    SHARD_REBALANCE_TOLERANCE = 0.1   # Desvio tolerado do tamanho médio antes de mover currículos
+    
+    # Compactação em segundo plano dos índices (compaction.py)
+    COMPACTION_INTERVAL_SECONDS = 60.0
+    COMPACTION_TOMBSTONE_RATIO = 0.2    # Fração de linhas removidas que dispara a compactação
+    
+    # Métricas por etapa no formato do Prometheus (metrics.py)
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', '').lower() in ('1', 'true', 'yes')
+    METRICS_HOST = "127.0.0.1"
+    METRICS_PORT = 9464
+    
+    # Perfilamento sob demanda com dumps de pilhas colapsadas (profiling.py)
+    PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', '').lower() in ('1', 'true', 'yes')
+    PROFILING_SAMPLE_RATE = 0.01       # Fração das chamadas perfiladas quando habilitado
+    PROFILING_MODE = "sampling"        # "sampling" ou "deterministic"
+    PROFILING_INTERVAL_MS = 5.0        # Intervalo entre amostras (abaixo de sys.getswitchinterval() não ganha resolução)
+    PROFILING_MIN_DURATION_MS = 0.0    # Perfis amostrados mais rápidos que isso são descartados
+    PROFILING_DIR = "profiles"
     
     # Configurações de cache
     CACHE_ENABLED = True
     CACHE_TTL = 3600  # 1 hora
+    CACHE_DIR = "cache"
+    CACHE_MAX_SIZE_MB = 512.0
     
     @classmethod
     def get_model_config(cls) -> Dict[str, Any]:
@@ -55,6 +119,25 @@ class Config:
             'similarity_threshold': cls.DEFAULT_SIMILARITY_THRESHOLD
         }
     
+    @classmethod
+    def get_skill_matching_config(cls) -> Dict[str, Any]:
+        """Retorna configurações do match semântico de skills"""
+        return {
+            'enabled': cls.SEMANTIC_SKILL_MATCHING,
+            'artifact_path': cls.SKILL_EMBEDDINGS_PATH,
+            'max_ngram': cls.SKILL_MAX_NGRAM
+        }
+    
+    @classmethod
+    def get_inference_config(cls) -> Dict[str, Any]:
+        """Retorna configurações do backend de inferência"""
+        return {
+            'backend': cls.INFERENCE_BACKEND,
+            'quantize': cls.ONNX_QUANTIZE,
+            'onnx_dir': cls.ONNX_DIR,
+            'min_agreement': cls.ONNX_MIN_COSINE_AGREEMENT
+        }
+    
     @classmethod
     def get_weights_config(cls) -> Dict[str, float]:
         """Retorna configurações de pesos"""
@@ -67,7 +150,98 @@ class Config:
             'max_file_size_mb': cls.MAX_FILE_SIZE_MB,
             'supported_formats': cls.SUPPORTED_FORMATS,
             'batch_size': cls.BATCH_SIZE,
-            'max_text_length': cls.MAX_TEXT_LENGTH
+            'max_text_length': cls.MAX_TEXT_LENGTH,
+            'parallel_workers': cls.PARALLEL_WORKERS,
+            'parallel_shard_size': cls.PARALLEL_SHARD_SIZE
+        }
+    
+    @classmethod
+    def get_index_config(cls) -> Dict[str, Any]:
+        """Retorna configurações do índice vetorial"""
+        return {
+            'exact_threshold': cls.INDEX_EXACT_THRESHOLD,
+            'nprobe': cls.INDEX_NPROBE,
+            'shortlist_factor': cls.INDEX_SHORTLIST_FACTOR,
+            'precision': cls.INDEX_PRECISION,
+            'index_dir': cls.INDEX_DIR
+        }
+    
+    @classmethod
+    def get_lexical_config(cls) -> Dict[str, Any]:
+        """Retorna configurações do pré-filtro léxico"""
+        return {
+            'k1': cls.BM25_K1,
+            'b': cls.BM25_B,
+            'shortlist_size': cls.LEXICAL_SHORTLIST_SIZE,
+            'index_dir': cls.LEXICAL_INDEX_DIR
+        }
+    
+    @classmethod
+    def get_api_config(cls) -> Dict[str, Any]:
+        """Retorna configurações do serviço HTTP"""
+        return {
+            'host': cls.API_HOST,
+            'port': cls.API_PORT,
+            'max_batch_size': cls.MICROBATCH_MAX_SIZE,
+            'max_wait_ms': cls.MICROBATCH_MAX_WAIT_MS
+        }
+    
+    @classmethod
+    def get_cache_config(cls) -> Dict[str, Any]:
+        """Retorna configurações do cache de embeddings"""
+        return {
+            'enabled': cls.CACHE_ENABLED,
+            'ttl': cls.CACHE_TTL,
+            'cache_dir': cls.CACHE_DIR,
+            'max_size_mb': cls.CACHE_MAX_SIZE_MB
+        }
+    
+    @classmethod
+    def get_embedding_store_config(cls) -> Dict[str, Any]:
+        """Retorna configurações do store memmap de embeddings"""
+        return {
+            'enabled': cls.EMBEDDING_STORE_ENABLED,
+            'store_dir': cls.EMBEDDING_STORE_DIR,
+            'dtype': cls.EMBEDDING_STORE_DTYPE
+        }
+    
+    @classmethod
+    def get_shard_config(cls) -> Dict[str, Any]:
+        """Retorna configurações do índice distribuído em shards"""
+        return {
+            'host': cls.SHARD_HOST,
+            'authkey': cls.SHARD_AUTHKEY.encode('utf-8') if cls.SHARD_AUTHKEY else None,
+            'timeout_seconds': cls.SHARD_TIMEOUT_SECONDS,
+            'rebalance_tolerance': cls.SHARD_REBALANCE_TOLERANCE
+        }
+    
+    @classmethod
+    def get_compaction_config(cls) -> Dict[str, Any]:
+        """Retorna configurações da compactação de índices"""
+        return {
+            'interval_seconds': cls.COMPACTION_INTERVAL_SECONDS,
+            'tombstone_ratio': cls.COMPACTION_TOMBSTONE_RATIO
+        }
+    
+    @classmethod
+    def get_metrics_config(cls) -> Dict[str, Any]:
+        """Retorna configurações das métricas de desempenho"""
+        return {
+            'enabled': cls.METRICS_ENABLED,
+            'host': cls.METRICS_HOST,
+            'port': cls.METRICS_PORT
+        }
+    
+    @classmethod
+    def get_profiling_config(cls) -> Dict[str, Any]:
+        """Retorna configurações do perfilamento sob demanda"""
+        return {
+            'enabled': cls.PROFILING_ENABLED,
+            'sample_rate': cls.PROFILING_SAMPLE_RATE,
+            'mode': cls.PROFILING_MODE,
+            'interval_ms': cls.PROFILING_INTERVAL_MS,
+            'min_duration_ms': cls.PROFILING_MIN_DURATION_MS,
+            'output_dir': cls.PROFILING_DIR
         }
     
     @classmethod
@@ -77,7 +251,8 @@ class Config:
             'results_dir': cls.RESULTS_DIR,
             'exports_dir': cls.EXPORTS_DIR,
             'uploads_dir': cls.UPLOADS_DIR,
-            'logs_dir': cls.LOGS_DIR
+            'logs_dir': cls.LOGS_DIR,
+            'cache_dir': cls.CACHE_DIR
         }
     
     @classmethod
@@ -87,7 +262,8 @@ class Config:
             cls.RESULTS_DIR,
             cls.EXPORTS_DIR,
             cls.UPLOADS_DIR,
-            cls.LOGS_DIR
+            cls.LOGS_DIR,
+            cls.CACHE_DIR
         ]
         
         for directory in directories:
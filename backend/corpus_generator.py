@@ -0,0 +1,413 @@
+"""
+Gerador determinístico de corpus sintético de currículos e vagas (PT/EN)
+
+Cada documento é gerado a partir de (semente, tipo, índice): o mesmo índice
+produz sempre o mesmo documento, independentemente da ordem ou do número de
+processos. Skills, anos de experiência, formação, idioma, tamanho e formato de
+arquivo seguem distribuições configuráveis em CorpusSpec. Tudo roda offline: os
+arquivos DOCX e PDF são montados localmente (ver utils.text_to_docx_bytes e
+utils.text_to_pdf_bytes).
+
+A gravação em disco é feita em paralelo por blocos de índices, e um
+manifest.jsonl registra, para cada documento, o caminho e os atributos usados na
+geração (úteis como gabarito em testes de extração).
+
+Uso:
+    python corpus_generator.py --resumes 100000 --jobs 1000 --output data/synthetic
+"""
+
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import logging
+
+from config import get_config
+from semantic_engine import TECHNICAL_SKILLS
+from utils import text_to_docx_bytes, text_to_pdf_bytes
+
+logger = logging.getLogger(__name__)
+
+# Anos de experiência de cada nível (mesmas faixas de SemanticEngine.extract_experience_info)
+LEVEL_YEARS = {
+    'Júnior': (0, 3),
+    'Pleno': (4, 6),
+    'Sênior': (7, 10),
+    'Especialista': (11, 25),
+}
+
+# Experiências e tópicos por experiência de cada faixa de tamanho
+LENGTH_SHAPES = {
+    'short': ((1, 2), (1, 2)),
+    'medium': ((2, 4), (2, 4)),
+    'long': ((4, 8), (3, 6)),
+}
+
+SOFT_SKILLS_BY_LANGUAGE = {
+    'pt': ['liderança', 'comunicação', 'trabalho em equipe', 'resolução de problemas', 'criatividade',
+           'adaptabilidade', 'proatividade', 'organização', 'gestão de tempo', 'negociação', 'empatia',
+           'pensamento crítico', 'colaboração', 'autonomia', 'aprendizado contínuo'],
+    'en': ['leadership', 'communication', 'teamwork', 'problem solving', 'creativity', 'adaptability',
+           'proactivity', 'organization', 'time management', 'negotiation', 'empathy',
+           'critical thinking', 'collaboration', 'autonomy', 'continuous learning'],
+}
+
+FIRST_NAMES = ['Ana', 'Bruno', 'Carla', 'Diego', 'Eduarda', 'Felipe', 'Gabriela', 'Henrique', 'Isabela',
+               'João', 'Karina', 'Lucas', 'Mariana', 'Nicolas', 'Olívia', 'Pedro', 'Rafaela', 'Samuel',
+               'Tatiana', 'Vinícius', 'Alice', 'Daniel', 'Emily', 'James', 'Laura', 'Michael', 'Sofia']
+LAST_NAMES = ['Silva', 'Santos', 'Oliveira', 'Souza', 'Lima', 'Pereira', 'Costa', 'Rodrigues', 'Almeida',
+              'Nascimento', 'Carvalho', 'Ribeiro', 'Martins', 'Rocha', 'Smith', 'Johnson', 'Brown', 'Miller']
+CITIES = {
+    'pt': ['São Paulo, SP', 'Rio de Janeiro, RJ', 'Belo Horizonte, MG', 'Curitiba, PR', 'Porto Alegre, RS',
+           'Recife, PE', 'Florianópolis, SC', 'Campinas, SP', 'Salvador, BA', 'Brasília, DF'],
+    'en': ['São Paulo, Brazil', 'Lisbon, Portugal', 'Toronto, Canada', 'Austin, TX', 'London, UK',
+           'Berlin, Germany', 'Remote'],
+}
+COMPANIES = ['TechCorp', 'StartupXYZ', 'DataWave', 'Nuvem Sistemas', 'FinBank Digital', 'Loja Online S.A.',
+             'HealthTech', 'LogiTrans', 'EduPlataforma', 'AgroData', 'CloudNine', 'PayFast', 'Mercado Azul']
+TITLES = {
+    'pt': ['Desenvolvedor Backend', 'Desenvolvedor Frontend', 'Desenvolvedor Full Stack', 'Engenheiro de Dados',
+           'Engenheiro DevOps', 'Cientista de Dados', 'Engenheiro de Software', 'Analista de Sistemas'],
+    'en': ['Backend Developer', 'Frontend Developer', 'Full Stack Developer', 'Data Engineer',
+           'DevOps Engineer', 'Data Scientist', 'Software Engineer', 'Systems Analyst'],
+}
+LEVEL_NAMES = {
+    'pt': {'Júnior': 'Júnior', 'Pleno': 'Pleno', 'Sênior': 'Sênior', 'Especialista': 'Especialista'},
+    'en': {'Júnior': 'Junior', 'Pleno': 'Mid-level', 'Sênior': 'Senior', 'Especialista': 'Principal'},
+}
+BULLETS = {
+    'pt': ['Desenvolvimento de aplicações usando {skill}', 'Implementação de APIs com {skill}',
+           'Migração de sistemas legados para {skill}', 'Automação de processos com {skill}',
+           'Otimização de performance em serviços {skill}', 'Manutenção de pipelines com {skill}',
+           'Mentoria de desenvolvedores em {skill}', 'Criação de testes automatizados para {skill}'],
+    'en': ['Built applications using {skill}', 'Implemented APIs with {skill}',
+           'Migrated legacy systems to {skill}', 'Automated processes with {skill}',
+           'Improved performance of {skill} services', 'Maintained pipelines with {skill}',
+           'Mentored developers on {skill}', 'Wrote automated tests for {skill}'],
+}
+# Formações com os termos reconhecidos por SemanticEngine.extract_education_info
+EDUCATION = {
+    'técnico': {'pt': 'Curso Técnico em Informática', 'en': 'Technical degree in Computing'},
+    'graduação': {'pt': 'Bacharelado em Ciência da Computação', 'en': 'Bachelor of Computer Science'},
+    'pós_graduação': {'pt': 'Pós-graduação (Especialização) em Engenharia de Software',
+                      'en': 'Post graduation (Specialization) in Software Engineering'},
+    'mestrado': {'pt': 'Mestrado em Ciência da Computação', 'en': 'Master in Computer Science'},
+    'doutorado': {'pt': 'Doutorado em Inteligência Artificial', 'en': 'PhD in Artificial Intelligence'},
+}
+UNIVERSITIES = ['Universidade de São Paulo (USP)', 'Unicamp', 'UFMG', 'UFRJ', 'PUC-Rio', 'UFRGS',
+                'University of Toronto', 'Universidade de Lisboa']
+# Idioma nativo e opções de segundo idioma
+LANGUAGE_LEVELS = {
+    'pt': ('Português: Nativo', ['Inglês: Fluente', 'Inglês: Avançado', 'Inglês: Intermediário', 'Espanhol: Básico']),
+    'en': ('Portuguese: Native', ['English: Fluent', 'English: Advanced', 'Spanish: Intermediate']),
+}
+HEADINGS = {
+    'pt': {'summary': 'RESUMO PROFISSIONAL', 'experience': 'EXPERIÊNCIA PROFISSIONAL', 'education': 'EDUCAÇÃO',
+           'skills': 'HABILIDADES TÉCNICAS', 'soft_skills': 'COMPETÊNCIAS', 'languages': 'IDIOMAS',
+           'present': 'Presente'},
+    'en': {'summary': 'PROFESSIONAL SUMMARY', 'experience': 'WORK EXPERIENCE', 'education': 'EDUCATION',
+           'skills': 'TECHNICAL SKILLS', 'soft_skills': 'SOFT SKILLS', 'languages': 'LANGUAGES',
+           'present': 'Present'},
+}
+
+@dataclass
+class CorpusSpec:
+    """
+    Distribuições usadas na geração (pesos não precisam somar 1)
+    """
+    seed: int = 0
+    language_mix: Dict[str, float] = field(default_factory=lambda: {'pt': 0.7, 'en': 0.3})
+    level_mix: Dict[str, float] = field(default_factory=lambda: {'Júnior': 0.3, 'Pleno': 0.35, 'Sênior': 0.25, 'Especialista': 0.1})
+    education_mix: Dict[str, float] = field(default_factory=lambda: {
+        'técnico': 0.1, 'graduação': 0.55, 'pós_graduação': 0.15, 'mestrado': 0.15, 'doutorado': 0.05
+    })
+    length_mix: Dict[str, float] = field(default_factory=lambda: {'short': 0.3, 'medium': 0.5, 'long': 0.2})
+    format_mix: Dict[str, float] = field(default_factory=lambda: {'txt': 0.6, 'docx': 0.2, 'pdf': 0.2})
+    skills_per_resume: Tuple[int, int] = (3, 15)
+    skills_per_job: Tuple[int, int] = (3, 8)
+    soft_skills_per_document: Tuple[int, int] = (1, 5)
+
+def _choose(rng: random.Random, weights: Dict[str, float]) -> str:
+    """Sorteia uma chave proporcionalmente ao peso"""
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+def _rng(spec: CorpusSpec, kind: str, index: int) -> random.Random:
+    """Gerador próprio de cada documento: o resultado não depende da ordem de geração"""
+    return random.Random(f"{spec.seed}:{kind}:{index}")
+
+def generate_resume(index: int, spec: Optional[CorpusSpec] = None) -> Dict[str, Any]:
+    """
+    Gera um currículo sintético
+
+    Args:
+        index: Índice do documento
+        spec: Distribuições da geração
+
+    Returns:
+        Dicionário com 'id', 'text' e os atributos usados na geração
+    """
+    spec = spec or CorpusSpec()
+    rng = _rng(spec, 'resume', index)
+
+    language = _choose(rng, spec.language_mix)
+    level = _choose(rng, spec.level_mix)
+    education = _choose(rng, spec.education_mix)
+    jobs_range, bullets_range = LENGTH_SHAPES[_choose(rng, spec.length_mix)]
+    years = rng.randint(*LEVEL_YEARS[level])
+    skills = rng.sample(TECHNICAL_SKILLS, rng.randint(*spec.skills_per_resume))
+    soft_skills = rng.sample(SOFT_SKILLS_BY_LANGUAGE[language], rng.randint(*spec.soft_skills_per_document))
+    headings = HEADINGS[language]
+
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {rng.choice(LAST_NAMES)}"
+    title = f"{rng.choice(TITLES[language])} {LEVEL_NAMES[language][level]}"
+    summary = (
+        f"{title} com {years} anos de experiência, especializado em {', '.join(skills[:3])}."
+        if language == 'pt' else
+        f"{title} with {years} years of experience, focused on {', '.join(skills[:3])}."
+    )
+
+    lines = [
+        name,
+        f"{name.split()[0].lower()}.{name.split()[1].lower()}{index}@email.com",
+        f"({rng.randint(11, 99)}) 9{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}",
+        rng.choice(CITIES[language]),
+        '',
+        headings['summary'],
+        summary,
+        '',
+        headings['experience'],
+    ]
+
+    end_year = 2025
+    for position in range(rng.randint(*jobs_range)):
+        start_year = end_year - rng.randint(1, 4)
+        period = f"{start_year} - {headings['present'] if position == 0 else end_year}"
+        lines.extend([rng.choice(TITLES[language]), f"{rng.choice(COMPANIES)} | {period}"])
+        lines.extend(
+            f"• {rng.choice(BULLETS[language]).format(skill=rng.choice(skills))}"
+            for _ in range(rng.randint(*bullets_range))
+        )
+        lines.append('')
+        end_year = start_year
+
+    lines.extend([
+        headings['education'],
+        EDUCATION[education][language],
+        rng.choice(UNIVERSITIES),
+        '',
+        headings['skills'],
+        ', '.join(skills),
+        '',
+        headings['soft_skills'],
+        ', '.join(soft_skills),
+        '',
+        headings['languages'],
+        LANGUAGE_LEVELS[language][0],
+        rng.choice(LANGUAGE_LEVELS[language][1]),
+    ])
+
+    return {
+        'id': f"resume_{index:07d}",
+        'text': '\n'.join(lines),
+        'language': language,
+        'level': level,
+        'years': years,
+        'education': education,
+        'skills': skills,
+        'soft_skills': soft_skills
+    }
+
+def generate_job(index: int, spec: Optional[CorpusSpec] = None) -> Dict[str, Any]:
+    """
+    Gera uma vaga sintética
+
+    Args:
+        index: Índice do documento
+        spec: Distribuições da geração
+
+    Returns:
+        Dicionário com 'id', 'text' e os atributos usados na geração
+    """
+    spec = spec or CorpusSpec()
+    rng = _rng(spec, 'job', index)
+
+    language = _choose(rng, spec.language_mix)
+    level = _choose(rng, spec.level_mix)
+    education = _choose(rng, spec.education_mix)
+    min_years = LEVEL_YEARS[level][0]
+    skills = rng.sample(TECHNICAL_SKILLS, rng.randint(*spec.skills_per_job))
+    extras = rng.sample([skill for skill in TECHNICAL_SKILLS if skill not in skills], 2)
+    soft_skills = rng.sample(SOFT_SKILLS_BY_LANGUAGE[language], rng.randint(*spec.soft_skills_per_document))
+    title = f"{rng.choice(TITLES[language])} {LEVEL_NAMES[language][level]}".upper()
+    company = rng.choice(COMPANIES)
+
+    if language == 'pt':
+        lines = [
+            title, '',
+            'Sobre a Empresa:',
+            f"A {company} busca um profissional para integrar o time de tecnologia.", '',
+            'Requisitos Obrigatórios:',
+            f"• {min_years}+ anos de experiência em desenvolvimento",
+            *(f"• Experiência com {skill}" for skill in skills),
+            f"• {EDUCATION[education]['pt']} ou área relacionada",
+            f"• {', '.join(soft_skills).capitalize()}", '',
+            'Diferencial:',
+            *(f"• Conhecimento em {skill}" for skill in extras), '',
+            f"Localização: {rng.choice(CITIES['pt'])}",
+        ]
+    else:
+        lines = [
+            title, '',
+            'About us:',
+            f"{company} is hiring to grow its engineering team.", '',
+            'Requirements:',
+            f"• {min_years}+ years of experience in software development",
+            *(f"• Experience with {skill}" for skill in skills),
+            f"• {EDUCATION[education]['en']} or related field",
+            f"• {', '.join(soft_skills).capitalize()}", '',
+            'Nice to have:',
+            *(f"• Knowledge of {skill}" for skill in extras), '',
+            f"Location: {rng.choice(CITIES['en'])}",
+        ]
+
+    return {
+        'id': f"job_{index:06d}",
+        'text': '\n'.join(lines),
+        'language': language,
+        'level': level,
+        'min_years': min_years,
+        'education': education,
+        'skills': skills,
+        'soft_skills': soft_skills
+    }
+
+def iter_resumes(count: int, spec: Optional[CorpusSpec] = None, start: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    Gera currículos em memória, na ordem dos índices
+
+    Args:
+        count: Número de currículos
+        spec: Distribuições da geração
+        start: Primeiro índice
+
+    Yields:
+        Currículos no formato de generate_resume (compatível com batch_analyze após definir 'filename')
+    """
+    for index in range(start, start + count):
+        yield generate_resume(index, spec)
+
+def _write_document(document: Dict[str, Any], directory: str, extension: str) -> str:
+    """Grava um documento no formato pedido e retorna o caminho"""
+    path = os.path.join(directory, f"{document['id']}.{extension}")
+
+    if extension == 'txt':
+        content = document['text'].encode('utf-8')
+    elif extension == 'docx':
+        content = text_to_docx_bytes(document['text'])
+    elif extension == 'pdf':
+        content = text_to_pdf_bytes(document['text'])
+    else:
+        raise ValueError(f"Formato não suportado: {extension}")
+
+    with open(path, 'wb') as f:
+        f.write(content)
+    return path
+
+def _write_block(kind: str, start: int, end: int, spec: CorpusSpec, output_dir: str) -> List[Dict[str, Any]]:
+    """Gera e grava os documentos [start, end) de um tipo (executado nos processos de trabalho)"""
+    generate = generate_resume if kind == 'resume' else generate_job
+    directory = os.path.join(output_dir, f"{kind}s")
+    entries = []
+
+    for index in range(start, end):
+        document = generate(index, spec)
+        extension = _choose(_rng(spec, f'{kind}-format', index), spec.format_mix)
+        entry = {key: value for key, value in document.items() if key != 'text'}
+        entry['path'] = os.path.relpath(_write_document(document, directory, extension), output_dir)
+        entry['format'] = extension
+        entries.append(entry)
+
+    return entries
+
+def write_corpus(output_dir: Optional[str] = None, num_resumes: int = 1000, num_jobs: int = 10,
+                 spec: Optional[CorpusSpec] = None, num_workers: Optional[int] = None,
+                 block_size: int = 500) -> Dict[str, int]:
+    """
+    Gera o corpus em disco em paralelo
+
+    Args:
+        output_dir: Diretório de saída (padrão: Config.SYNTHETIC_CORPUS_DIR)
+        num_resumes: Número de currículos
+        num_jobs: Número de vagas
+        spec: Distribuições da geração
+        num_workers: Processos de escrita (padrão: núcleos disponíveis)
+        block_size: Documentos por tarefa
+
+    Returns:
+        Número de documentos gravados por tipo
+    """
+    output_dir = output_dir or get_config().SYNTHETIC_CORPUS_DIR
+    spec = spec or CorpusSpec()
+    unsupported = set(spec.format_mix) - {'txt', 'docx', 'pdf'}
+    if unsupported:
+        raise ValueError(f"Formatos não suportados: {sorted(unsupported)}")
+    num_workers = num_workers or os.cpu_count() or 1
+
+    for kind in ('resume', 'job'):
+        os.makedirs(os.path.join(output_dir, f"{kind}s"), exist_ok=True)
+
+    with open(os.path.join(output_dir, 'spec.json'), 'w', encoding='utf-8') as f:
+        json.dump(asdict(spec), f, ensure_ascii=False, indent=2)
+
+    tasks = [
+        (kind, start, min(start + block_size, total))
+        for kind, total in (('resume', num_resumes), ('job', num_jobs))
+        for start in range(0, total, block_size)
+    ]
+
+    counts = {'resume': 0, 'job': 0}
+    with ProcessPoolExecutor(max_workers=num_workers) as pool, \
+            open(os.path.join(output_dir, 'manifest.jsonl'), 'w', encoding='utf-8') as manifest:
+        futures = [pool.submit(_write_block, kind, start, end, spec, output_dir) for kind, start, end in tasks]
+
+        # O manifest segue a ordem dos índices, qualquer que seja a ordem de conclusão
+        for (kind, _, _), future in zip(tasks, futures):
+            entries = future.result()
+            for entry in entries:
+                manifest.write(json.dumps(dict(entry, kind=kind), ensure_ascii=False) + '\n')
+            counts[kind] += len(entries)
+
+    logger.info(f"Corpus sintético gravado em {output_dir}: {counts['resume']} currículos, {counts['job']} vagas")
+    return counts
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Gerador de corpus sintético de currículos e vagas")
+    parser.add_argument('--resumes', type=int, default=1000)
+    parser.add_argument('--jobs', type=int, default=10)
+    parser.add_argument('--output', default=None, help="Diretório de saída (padrão: Config.SYNTHETIC_CORPUS_DIR)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--formats', default='txt=0.6,docx=0.2,pdf=0.2', help="Pesos dos formatos, ex: txt=1,pdf=1")
+    parser.add_argument('--portuguese', type=float, default=0.7, help="Fração de documentos em português")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format=get_config().LOG_FORMAT)
+
+    formats = {}
+    for item in args.formats.split(','):
+        extension, _, weight = item.partition('=')
+        formats[extension.strip()] = float(weight or 1)
+
+    spec = CorpusSpec(
+        seed=args.seed,
+        language_mix={'pt': args.portuguese, 'en': 1 - args.portuguese},
+        format_mix=formats
+    )
+    write_corpus(args.output, args.resumes, args.jobs, spec, args.workers)
+
+if __name__ == "__main__":
+    main()
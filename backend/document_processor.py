@@ -5,6 +5,9 @@ import io
 from typing import Dict, List, Any, Optional
 import logging
 
+import metrics
+import profiling
+
 logger = logging.getLogger(__name__)
 
 class DocumentProcessor:
@@ -12,10 +15,17 @@ class DocumentProcessor:
     Processador de documentos para extração de texto e informações estruturadas
     """
     
-    def __init__(self):
-        """Inicializa o processador de documentos"""
-        pass
+    def __init__(self, profiling_config: Optional[Dict[str, Any]] = None):
+        """
+        Inicializa o processador de documentos
+        
+        Args:
+            profiling_config: Configuração do perfilamento (padrão: Config.get_profiling_config())
+        """
+        self.profiler = profiling.Profiler(profiling_config)
     
+    @metrics.timed('extract_text')
+    @profiling.profiled('extract_text', 'file')
     def extract_text(self, file) -> str:
         """
         Extrai texto de um arquivo
@@ -119,6 +129,8 @@ class DocumentProcessor:
             logger.error(f"Erro ao extrair texto do TXT: {str(e)}")
             raise
     
+    @metrics.timed('extract_resume_info')
+    @profiling.profiled('extract_resume_info', 'text')
     def extract_resume_info(self, text: str) -> Dict[str, Any]:
         """
         Extrai informações estruturadas de um currículo
@@ -363,7 +375,8 @@ class DocumentProcessor:
         for pattern in language_patterns:
             match = re.search(pattern, text, re.IGNORECASE)
             if match:
-                languages.append(match.group(1).strip())
+                # O segundo padrão não tem grupo: usar o trecho inteiro
+                languages.append(match.group(match.lastindex or 0).strip())
         
         return languages if languages else ["Não especificado"]
     
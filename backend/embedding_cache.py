@@ -0,0 +1,230 @@
+"""
+Cache persistente de embeddings para o MatchSense AI
+
+Os embeddings ficam em um banco SQLite local, endereçados pelo hash do
+modelo + texto normalizado, e sobrevivem a reinícios do processo.
+Entradas expiram após o TTL e, quando o tamanho total passa do limite,
+as menos usadas recentemente (LRU) são removidas.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Dict, List, Optional, Any
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class EmbeddingCache:
+    """
+    Cache de embeddings em disco com TTL e remoção LRU por tamanho
+    """
+
+    DB_FILENAME = "embeddings.sqlite3"
+
+    def __init__(self, cache_dir: str = "cache", ttl: int = 3600, max_size_mb: float = 512.0):
+        """
+        Inicializa o cache
+
+        Args:
+            cache_dir: Diretório onde o banco do cache é salvo
+            ttl: Tempo de vida das entradas em segundos (0 desativa a expiração)
+            max_size_mb: Tamanho máximo dos vetores armazenados em MB
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self.db_path = os.path.join(cache_dir, self.DB_FILENAME)
+
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON embeddings(last_access)")
+        self._conn.commit()
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """
+        Normaliza o texto antes do hash (Unicode NFC e espaços colapsados)
+
+        Args:
+            text: Texto original
+
+        Returns:
+            Texto normalizado
+        """
+        text = unicodedata.normalize('NFC', text or '')
+        return re.sub(r'\s+', ' ', text).strip()
+
+    @classmethod
+    def make_key(cls, model_name: str, text: str) -> str:
+        """
+        Gera a chave de conteúdo (modelo + hash do texto normalizado)
+
+        Args:
+            model_name: Nome do modelo de embedding
+            text: Texto codificado
+
+        Returns:
+            Chave hexadecimal SHA-256
+        """
+        digest = hashlib.sha256()
+        digest.update(model_name.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(cls.normalize_text(text).encode('utf-8'))
+        return digest.hexdigest()
+
+    def get_many(self, model_name: str, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """
+        Busca embeddings no cache
+
+        Args:
+            model_name: Nome do modelo de embedding
+            texts: Textos a buscar
+
+        Returns:
+            Lista alinhada com `texts`, com o embedding ou None quando ausente/expirado
+        """
+        keys = [self.make_key(model_name, text) for text in texts]
+        now = time.time()
+        found: Dict[str, np.ndarray] = {}
+        expired = []
+
+        with self._lock:
+            unique_keys = list(dict.fromkeys(keys))
+            # SQLite limita o número de parâmetros por consulta
+            for start in range(0, len(unique_keys), 500):
+                chunk = unique_keys[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, dim, vector, created_at FROM embeddings WHERE key IN ({placeholders})",
+                    chunk
+                ).fetchall()
+
+                for key, dim, vector, created_at in rows:
+                    if self.ttl and now - created_at > self.ttl:
+                        expired.append(key)
+                        continue
+                    found[key] = np.frombuffer(vector, dtype=np.float32, count=dim)
+
+            if expired:
+                self._conn.executemany("DELETE FROM embeddings WHERE key = ?", [(k,) for k in expired])
+            if found:
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                    [(now, k) for k in found]
+                )
+            if expired or found:
+                self._conn.commit()
+
+        results = [found.get(key) for key in keys]
+        hits = sum(1 for r in results if r is not None)
+        self.hits += hits
+        self.misses += len(results) - hits
+        return results
+
+    def set_many(self, model_name: str, texts: List[str], embeddings: np.ndarray):
+        """
+        Armazena embeddings no cache
+
+        Args:
+            model_name: Nome do modelo de embedding
+            texts: Textos codificados
+            embeddings: Matriz (n_textos, dimensão) de embeddings
+        """
+        now = time.time()
+        rows = []
+        for text, embedding in zip(texts, embeddings):
+            vector = np.ascontiguousarray(embedding, dtype=np.float32)
+            rows.append((self.make_key(model_name, text), model_name, int(vector.shape[0]),
+                         vector.tobytes(), now, now))
+
+        if not rows:
+            return
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, dim, vector, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+            self._evict(now)
+
+    def _evict(self, now: float):
+        """Remove entradas expiradas e, se necessário, as menos usadas (LRU)"""
+        if self.ttl:
+            self._conn.execute("DELETE FROM embeddings WHERE created_at < ?", (now - self.ttl,))
+
+        total_size = self._conn.execute("SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings").fetchone()[0]
+
+        if total_size > self.max_size_bytes:
+            # Remover até 90% do limite para não despejar a cada inserção
+            to_free = total_size - int(self.max_size_bytes * 0.9)
+            freed = 0
+            victims = []
+            for key, size in self._conn.execute(
+                "SELECT key, LENGTH(vector) FROM embeddings ORDER BY last_access ASC"
+            ):
+                victims.append((key,))
+                freed += size
+                if freed >= to_free:
+                    break
+
+            self._conn.executemany("DELETE FROM embeddings WHERE key = ?", victims)
+            logger.info(f"Cache de embeddings: {len(victims)} entradas removidas (LRU)")
+
+        self._conn.commit()
+
+    def clear(self):
+        """Remove todas as entradas do cache"""
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas do cache
+
+        Returns:
+            Dicionário com entradas, tamanho, hits e misses
+        """
+        with self._lock:
+            entries, total_size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings"
+            ).fetchone()
+
+        return {
+            'entries': entries,
+            'size_mb': total_size / (1024 * 1024),
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+    def close(self):
+        """Fecha a conexão com o banco do cache"""
+        with self._lock:
+            self._conn.close()
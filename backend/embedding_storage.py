@@ -0,0 +1,350 @@
+"""
+Armazenamento compacto de embeddings com precisão selecionável
+
+Precisões suportadas:
+    float32: referência (4 bytes por dimensão)
+    float16: meia precisão (2 bytes por dimensão)
+    int8: quantização escalar simétrica com uma escala float32 por vetor (~1 byte por dimensão)
+
+A similaridade é calculada diretamente sobre a forma compacta, em blocos, sem
+reconstruir a matriz inteira em float32. ranking_agreement mede quanto o
+ranking de cada precisão concorda com o float32 para escolher o modo mais
+barato que continua seguro.
+"""
+
+from typing import Dict, Iterator, Optional, Tuple
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PRECISIONS = ('float32', 'float16', 'int8')
+
+# Linhas convertidas para float32 por bloco nos cálculos de similaridade
+CHUNK_SIZE = 16384
+
+def grow_buffer(buffer: np.ndarray, size: int, extra: int) -> np.ndarray:
+    """
+    Garante espaço para mais `extra` linhas após as `size` já ocupadas
+
+    A capacidade dobra quando acaba, então inserções sucessivas custam O(1)
+    amortizado por linha em vez de copiar o buffer inteiro a cada chamada.
+
+    Args:
+        buffer: Buffer atual (as linhas além de `size` são livres)
+        size: Linhas ocupadas
+        extra: Linhas a acrescentar
+
+    Returns:
+        O próprio buffer, se couber, ou uma cópia maior com as linhas ocupadas
+    """
+    if size + extra <= len(buffer):
+        return buffer
+
+    grown = np.empty((max(size + extra, 2 * len(buffer)),) + buffer.shape[1:], dtype=buffer.dtype)
+    grown[:size] = buffer[:size]
+    return grown
+
+class CompactEmbeddings:
+    """
+    Matriz de embeddings armazenada em float32, float16 ou int8 com escala por vetor
+    """
+
+    def __init__(self, precision: str = 'float32', dimension: Optional[int] = None):
+        """
+        Inicializa o armazenamento vazio
+
+        Args:
+            precision: 'float32', 'float16' ou 'int8'
+            dimension: Dimensão dos vetores (definida no primeiro append se omitida)
+        """
+        if precision not in PRECISIONS:
+            raise ValueError(f"Precisão não suportada: {precision}. Use uma de {PRECISIONS}")
+
+        self.precision = precision
+        self.dimension = dimension
+
+        # Buffers com folga no final; apenas as primeiras _size linhas são válidas
+        self._data: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def data(self) -> Optional[np.ndarray]:
+        """Linhas armazenadas na forma compacta (None se vazio)"""
+        return self._view()[0]
+
+    @data.setter
+    def data(self, value: Optional[np.ndarray]):
+        self._data = value
+        self._size = 0 if value is None else len(value)
+
+    @property
+    def scales(self) -> Optional[np.ndarray]:
+        """Escalas por vetor (apenas int8)"""
+        return self._view()[1]
+
+    @scales.setter
+    def scales(self, value: Optional[np.ndarray]):
+        self._scales = value
+
+    def _view(self) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        Visões consistentes de dados e escalas
+
+        O tamanho é lido antes dos buffers: append só publica o novo tamanho depois
+        de gravar as linhas, então uma leitura concorrente nunca vê linhas vazias.
+        """
+        size = self._size
+        data, scales = self._data, self._scales
+        if data is None:
+            return None, None
+        return data[:size], (scales[:size] if scales is not None else None)
+
+    @property
+    def nbytes(self) -> int:
+        """Memória ocupada pelos dados e escalas"""
+        data, scales = self._view()
+        if data is None:
+            return 0
+        return data.nbytes + (scales.nbytes if scales is not None else 0)
+
+    @classmethod
+    def from_float(cls, vectors: np.ndarray, precision: str = 'float32') -> 'CompactEmbeddings':
+        """
+        Cria o armazenamento a partir de uma matriz float32
+
+        Args:
+            vectors: Matriz (n, dimensão)
+            precision: Precisão de armazenamento
+
+        Returns:
+            Armazenamento compacto
+        """
+        storage = cls(precision)
+        storage.append(vectors)
+        return storage
+
+    def _compress(self, vectors: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Converte vetores float32 para a precisão configurada"""
+        if self.precision == 'float32':
+            return vectors, None
+
+        if self.precision == 'float16':
+            return vectors.astype(np.float16), None
+
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales = np.where(scales > 0, scales, 1.0).astype(np.float32)
+        quantized = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+        return quantized, scales
+
+    def append(self, vectors: np.ndarray):
+        """
+        Adiciona vetores ao final do armazenamento
+
+        Args:
+            vectors: Matriz (n, dimensão) em float32
+        """
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        if self.dimension is None:
+            self.dimension = vectors.shape[1]
+        elif vectors.shape[1] != self.dimension:
+            raise ValueError(f"Dimensão {vectors.shape[1]} diferente da esperada ({self.dimension})")
+
+        self._append_compressed(*self._compress(vectors))
+
+    def _append_compressed(self, data: np.ndarray, scales: Optional[np.ndarray]):
+        """Grava linhas já comprimidas na folga dos buffers (dobrando-os se preciso)"""
+        if self._data is None:
+            self._data, self._scales = data.copy(), (scales.copy() if scales is not None else None)
+            self._size = len(data)
+            return
+
+        size = self._size
+        self._data = grow_buffer(self._data, size, len(data))
+        self._data[size:size + len(data)] = data
+        if scales is not None:
+            self._scales = grow_buffer(self._scales, size, len(scales))
+            self._scales[size:size + len(scales)] = scales
+        self._size = size + len(data)
+
+    def take(self, rows: np.ndarray) -> 'CompactEmbeddings':
+        """
+        Copia um subconjunto de linhas sem reconverter a precisão
+
+        Args:
+            rows: Linhas a manter
+
+        Returns:
+            Novo armazenamento com as linhas na ordem informada
+        """
+        subset = CompactEmbeddings(self.precision, self.dimension)
+        data, scales = self._view()
+        if data is not None:
+            subset.data = data[rows]
+            subset.scales = scales[rows] if scales is not None else None
+        return subset
+
+    def extend(self, other: 'CompactEmbeddings'):
+        """
+        Acrescenta as linhas de outro armazenamento de mesma precisão
+
+        Args:
+            other: Armazenamento a acrescentar
+        """
+        if other.precision != self.precision:
+            raise ValueError("Precisões diferentes")
+        data, scales = other._view()
+        if data is None or not len(data):
+            return
+
+        if self.dimension is None:
+            self.dimension = other.dimension
+        self._append_compressed(data, scales)
+
+    def to_float(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Reconstrói vetores em float32
+
+        Args:
+            rows: Linhas desejadas (padrão: todas)
+
+        Returns:
+            Matriz (n, dimensão) em float32
+        """
+        data, scales = self._view()
+        if data is None:
+            return np.zeros((0, self.dimension or 0), dtype=np.float32)
+
+        data = data if rows is None else data[rows]
+        result = data.astype(np.float32)
+
+        if scales is not None:
+            scales = scales if rows is None else scales[rows]
+            result *= scales[:, None]
+
+        return result
+
+    def iter_float_chunks(self, chunk_size: int = CHUNK_SIZE) -> Iterator[np.ndarray]:
+        """
+        Percorre a matriz em blocos float32 sem reconstruí-la inteira
+
+        Args:
+            chunk_size: Linhas por bloco
+
+        Yields:
+            Blocos (linhas, dimensão) em float32
+        """
+        for start in range(0, len(self), chunk_size):
+            yield self.to_float(np.arange(start, min(start + chunk_size, len(self))))
+
+    def dot(self, query: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Produto interno de cada vetor armazenado com a consulta
+
+        Args:
+            query: Vetor (dimensão,) em float32
+            rows: Linhas a avaliar (padrão: todas)
+
+        Returns:
+            Vetor de produtos internos (similaridade cosseno para vetores normalizados)
+        """
+        query = np.asarray(query, dtype=np.float32)
+        data, scales = self._view()
+        if data is None:
+            return np.zeros(0, dtype=np.float32)
+
+        if self.precision == 'float32':
+            data = data if rows is None else data[rows]
+            return data @ query
+
+        n = len(data) if rows is None else len(rows)
+        scores = np.empty(n, dtype=np.float32)
+
+        # Converter em blocos limita a memória temporária a CHUNK_SIZE linhas
+        for start in range(0, n, CHUNK_SIZE):
+            block_rows = slice(start, start + CHUNK_SIZE) if rows is None else rows[start:start + CHUNK_SIZE]
+            block = data[block_rows].astype(np.float32) @ query
+            if scales is not None:
+                block *= scales[block_rows]
+            scores[start:start + len(block)] = block
+
+        return scores
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Arrays para persistência (np.savez)"""
+        data, scales = self._view()
+        arrays = {
+            'data': data if data is not None else np.zeros((0, self.dimension or 0), dtype=np.float32),
+            'precision': np.array(self.precision)
+        }
+        if scales is not None:
+            arrays['scales'] = scales
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays) -> 'CompactEmbeddings':
+        """Reconstrói o armazenamento a partir de to_arrays()"""
+        storage = cls(str(arrays['precision']), dimension=arrays['data'].shape[1])
+        if len(arrays['data']):
+            storage.data = arrays['data']
+            storage.scales = arrays['scales'] if 'scales' in arrays else None
+        return storage
+
+def ranking_agreement(vectors: np.ndarray, queries: np.ndarray, k: int = 10,
+                      precisions: Tuple[str, ...] = PRECISIONS) -> Dict[str, Dict[str, float]]:
+    """
+    Compara o ranking top-k de cada precisão com o float32
+
+    Args:
+        vectors: Matriz (n, dimensão) de embeddings normalizados em float32
+        queries: Matriz (m, dimensão) de consultas normalizadas (ex: vagas)
+        k: Tamanho do ranking avaliado
+        precisions: Precisões a avaliar
+
+    Returns:
+        Para cada precisão: memória (MB), compressão, recall@k médio,
+        concordância do top-1 e maior erro absoluto de similaridade
+
+    Raises:
+        ValueError: Se k for menor que 1 ou não houver vetores
+    """
+    if k < 1:
+        raise ValueError(f"k deve ser pelo menos 1 (recebido: {k})")
+
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if len(vectors) == 0:
+        raise ValueError("ranking_agreement exige ao menos um vetor")
+    queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+    k = min(k, len(vectors))
+
+    reference = vectors @ queries.T
+    reference_top = np.argsort(-reference, axis=0, kind='stable')[:k]
+    full_bytes = vectors.nbytes
+
+    report = {}
+    for precision in precisions:
+        storage = CompactEmbeddings.from_float(vectors, precision)
+        scores = np.stack([storage.dot(query) for query in queries], axis=1)
+        top = np.argsort(-scores, axis=0, kind='stable')[:k]
+
+        recalls = [len(np.intersect1d(top[:, q], reference_top[:, q])) / k for q in range(len(queries))]
+        report[precision] = {
+            'memory_mb': storage.nbytes / (1024 * 1024),
+            'compression': full_bytes / storage.nbytes,
+            'recall_at_k': float(np.mean(recalls)),
+            'top1_agreement': float(np.mean(top[0] == reference_top[0])),
+            'max_abs_error': float(np.abs(scores - reference).max())
+        }
+
+        logger.info(
+            f"{precision}: {report[precision]['memory_mb']:.1f} MB, "
+            f"recall@{k} {report[precision]['recall_at_k']:.4f}, "
+            f"erro máximo {report[precision]['max_abs_error']:.5f}"
+        )
+
+    return report
@@ -0,0 +1,229 @@
+"""
+Armazenamento de embeddings em arquivos mapeados em memória (memmap)
+
+Os embeddings ficam em segmentos binários somente de acréscimo, descritos por um
+manifest.json, e os ids em um arquivo de texto (um por linha, na ordem das
+linhas). Abrir o store só mapeia os arquivos: nada é lido até ser usado, e
+processos diferentes compartilham as mesmas páginas pelo cache do sistema
+operacional. As linhas são devolvidas como views NumPy sem cópia.
+
+Regravar um id acrescenta uma nova linha e o mapeamento passa a apontar para ela
+(a última escrita vence). O store admite um único processo escritor e qualquer
+número de leitores.
+"""
+
+import json
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = 'manifest.json'
+IDS_FILE = 'ids.txt'
+
+class EmbeddingStore:
+    """
+    Store de embeddings em segmentos memmap com mapeamento id -> linha
+    """
+
+    def __init__(self, directory: str, dimension: Optional[int] = None, dtype: str = 'float32',
+                 namespace: str = ''):
+        """
+        Abre (ou cria) o store
+
+        Args:
+            directory: Diretório do store
+            dimension: Dimensão dos vetores (obrigatória apenas na criação)
+            dtype: 'float32' ou 'float16' (apenas na criação)
+            namespace: Identificador do modelo que gerou os embeddings (apenas na criação)
+        """
+        if dtype not in ('float32', 'float16'):
+            raise ValueError(f"Tipo não suportado no store: {dtype}")
+
+        self.directory = directory
+        self.manifest = {
+            'dimension': dimension,
+            'dtype': dtype,
+            'namespace': namespace,
+            'segments': []
+        }
+        self.ids: List[str] = []
+        self.id_to_row: Dict[str, int] = {}
+        self.segments: List[np.ndarray] = []
+        self._offsets: List[int] = [0]
+        self._ids_bytes = 0  # Bytes do arquivo de ids já associados a linhas do manifest
+
+        os.makedirs(directory, exist_ok=True)
+        self.refresh()
+
+    def __len__(self) -> int:
+        return self._offsets[-1]
+
+    def __contains__(self, item_id) -> bool:
+        return str(item_id) in self.id_to_row
+
+    @property
+    def dimension(self) -> Optional[int]:
+        return self.manifest['dimension']
+
+    @property
+    def namespace(self) -> str:
+        return self.manifest.get('namespace', '')
+
+    def refresh(self):
+        """
+        Relê o manifest e mapeia os segmentos novos (ex: acrescentados por outro processo)
+        """
+        manifest_path = os.path.join(self.directory, MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            return
+
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+
+        for segment in self.manifest['segments'][len(self.segments):]:
+            view = np.memmap(
+                os.path.join(self.directory, segment['file']),
+                dtype=self.manifest['dtype'],
+                mode='r',
+                shape=(segment['rows'], self.manifest['dimension'])
+            )
+            self.segments.append(view)
+            self._offsets.append(self._offsets[-1] + segment['rows'])
+
+        # Lê apenas os ids novos; linhas além do manifest vêm de uma escrita incompleta e ficam de fora
+        missing = len(self) - len(self.ids)
+        if missing > 0:
+            with open(os.path.join(self.directory, IDS_FILE), 'rb') as f:
+                f.seek(self._ids_bytes)
+                lines = f.read().split(b'\n')
+            if self.ids:
+                lines = lines[1:]  # Separador antes do primeiro id novo
+            for line in lines[:missing]:
+                item_id = line.decode('utf-8')
+                self.id_to_row[item_id] = len(self.ids)
+                self.ids.append(item_id)
+                self._ids_bytes += len(line) + 1
+            if self._ids_bytes and len(self.ids) == missing:
+                self._ids_bytes -= 1  # O primeiro id não tem separador
+
+    def append(self, ids: List[str], vectors: np.ndarray):
+        """
+        Acrescenta um segmento com novos vetores
+
+        Args:
+            ids: Identificadores, alinhados com `vectors`
+            vectors: Matriz (n, dimensão)
+        """
+        ids = [str(item_id) for item_id in ids]
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=self.manifest['dtype']))
+        if len(ids) != len(vectors):
+            raise ValueError("Número de ids diferente do número de vetores")
+        if any('\n' in item_id for item_id in ids):
+            raise ValueError("Ids não podem conter quebras de linha")
+        if not ids:
+            return
+
+        if self.dimension is None:
+            self.manifest['dimension'] = vectors.shape[1]
+        elif vectors.shape[1] != self.dimension:
+            raise ValueError(f"Dimensão {vectors.shape[1]} diferente da esperada ({self.dimension})")
+
+        # Ordem de escrita: dados, ids e por último o manifest (que torna o segmento visível)
+        segment_file = f"segment_{len(self.manifest['segments']):06d}.bin"
+        with open(os.path.join(self.directory, segment_file), 'wb') as f:
+            vectors.tofile(f)
+
+        ids_path = os.path.join(self.directory, IDS_FILE)
+        prefix = '\n' if len(self) else ''
+        with open(ids_path, 'r+b' if os.path.exists(ids_path) else 'wb') as f:
+            # Descarta restos de uma escrita interrompida antes do manifest
+            f.truncate(self._ids_bytes)
+            f.seek(self._ids_bytes)
+            f.write((prefix + '\n'.join(ids)).encode('utf-8'))
+
+        self.manifest['segments'].append({'file': segment_file, 'rows': len(ids)})
+        self._write_manifest()
+        self.refresh()
+
+    def _write_manifest(self):
+        """Grava o manifest de forma atômica"""
+        manifest_path = os.path.join(self.directory, MANIFEST_FILE)
+        temp_path = manifest_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f)
+        os.replace(temp_path, manifest_path)
+
+    def _locate(self, row: int) -> Tuple[int, int]:
+        """Converte uma linha global em (segmento, linha no segmento)"""
+        segment = int(np.searchsorted(self._offsets, row, side='right')) - 1
+        return segment, row - self._offsets[segment]
+
+    def row(self, row: int) -> np.ndarray:
+        """View sem cópia de uma linha"""
+        segment, local_row = self._locate(row)
+        return self.segments[segment][local_row]
+
+    def get(self, item_id) -> Optional[np.ndarray]:
+        """
+        Retorna o vetor de um id
+
+        Args:
+            item_id: Identificador
+
+        Returns:
+            View sem cópia do vetor, ou None se o id não existir
+        """
+        row = self.id_to_row.get(str(item_id))
+        return None if row is None else self.row(row)
+
+    def get_many(self, ids: List) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Retorna os vetores de vários ids
+
+        Args:
+            ids: Identificadores
+
+        Returns:
+            (matriz float32 com os vetores encontrados, máscara de ids encontrados)
+        """
+        rows = np.array([self.id_to_row.get(str(item_id), -1) for item_id in ids], dtype=np.int64)
+        found = rows >= 0
+        vectors = np.zeros((len(ids), self.dimension or 0), dtype=np.float32)
+
+        # Uma leitura vetorizada por segmento envolvido
+        segment_of = np.searchsorted(self._offsets, rows, side='right') - 1
+        for segment in np.unique(segment_of[found]):
+            positions = np.flatnonzero(found & (segment_of == segment))
+            vectors[positions] = self.segments[segment][rows[positions] - self._offsets[segment]]
+
+        return vectors, found
+
+    def iter_segments(self) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Percorre os segmentos como views sem cópia
+
+        Yields:
+            (linha global inicial, matriz do segmento)
+        """
+        for offset, segment in zip(self._offsets, self.segments):
+            yield offset, segment
+
+    def dot(self, query: np.ndarray) -> np.ndarray:
+        """
+        Produto interno de todas as linhas com a consulta, segmento a segmento
+
+        Args:
+            query: Vetor (dimensão,)
+
+        Returns:
+            Vetor float32 com um score por linha
+        """
+        query = np.asarray(query, dtype=np.float32)
+        scores = np.empty(len(self), dtype=np.float32)
+        for offset, segment in self.iter_segments():
+            scores[offset:offset + len(segment)] = segment @ query
+        return scores
@@ -0,0 +1,141 @@
+"""
+Índice de vagas para o match reverso: top-k vagas para um candidato
+
+Os embeddings das vagas abertas ficam em uma matriz pré-computada e os perfis
+léxicos (JobProfile) são construídos uma única vez na indexação. Para cada
+candidato o currículo é codificado e extraído uma vez, as vagas mais próximas
+são recuperadas por similaridade e só elas passam pelos scores léxicos.
+"""
+
+import json
+import os
+from typing import Dict, List, Any, Optional
+import logging
+
+from config import get_config
+from semantic_engine import SemanticEngine, JobProfile
+from candidate_index import VectorIndex
+
+logger = logging.getLogger(__name__)
+
+class JobIndex:
+    """
+    Índice de vagas com consulta reversa (currículo -> vagas)
+    """
+
+    def __init__(self, engine: SemanticEngine, vector_index: Optional[VectorIndex] = None):
+        """
+        Inicializa o índice de vagas
+
+        Args:
+            engine: Motor semântico usado para codificar e pontuar
+            vector_index: Índice vetorial existente (opcional)
+        """
+        self.engine = engine
+        self.vector_index = vector_index or VectorIndex()
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.profiles: Dict[str, JobProfile] = {}
+
+    def __len__(self) -> int:
+        return len(self.vector_index)
+
+    def add_jobs(self, jobs: List[Dict[str, Any]]):
+        """
+        Codifica e indexa vagas
+
+        Args:
+            jobs: Lista de vagas (cada uma com 'id' e 'description'; 'experience_level',
+                'title', 'company' etc. opcionais e devolvidos nos resultados)
+        """
+        if not jobs:
+            return
+
+        ids = [str(job['id']) for job in jobs]
+        embeddings = self.engine.encode_texts([job['description'] for job in jobs])
+        self.vector_index.add(ids, embeddings)
+
+        for job_id, job in zip(ids, jobs):
+            self.jobs[job_id] = dict(job, id=job_id)
+            self.profiles[job_id] = self.engine.build_job_profile(
+                job['description'],
+                job.get('experience_level', 'Pleno'),
+                with_embedding=False
+            )
+
+        logger.info(f"{len(ids)} vagas indexadas (total: {len(self)})")
+
+    def top_jobs(self, resume_text: str, k: int = 10, shortlist_size: Optional[int] = None) -> List[Dict]:
+        """
+        Retorna as k vagas mais compatíveis com o currículo
+
+        Args:
+            resume_text: Texto do currículo
+            k: Número de vagas retornadas
+            shortlist_size: Vagas recuperadas antes dos scores léxicos
+                (padrão: k * INDEX_SHORTLIST_FACTOR)
+
+        Returns:
+            Lista de resultados (análise + 'job_id' e 'job') ordenada por score geral
+        """
+        if shortlist_size is None:
+            shortlist_size = k * get_config().INDEX_SHORTLIST_FACTOR
+
+        # Currículo codificado e extraído uma única vez para todas as vagas
+        features = self.engine.extract_resume_features(resume_text)
+        resume_embedding = self.engine.encode_texts([resume_text])[0]
+
+        hits = self.vector_index.search(resume_embedding, max(k, shortlist_size))
+
+        results = []
+        for job_id, similarity in hits:
+            try:
+                analysis = self.engine.analyze_with_profile(features, self.profiles[job_id], similarity)
+            except Exception as e:
+                logger.error(f"Erro ao pontuar vaga {job_id}: {str(e)}")
+                continue
+
+            job = {key: value for key, value in self.jobs[job_id].items() if key != 'description'}
+            analysis['job_id'] = job_id
+            analysis['job'] = job
+            results.append(analysis)
+
+        results.sort(key=lambda x: x.get('overall_score', 0), reverse=True)
+        return results[:k]
+
+    def save(self, directory: str):
+        """
+        Salva o índice e as vagas em disco
+
+        Args:
+            directory: Diretório de destino
+        """
+        self.vector_index.save(directory)
+        with open(os.path.join(directory, 'jobs.json'), 'w', encoding='utf-8') as f:
+            json.dump(self.jobs, f, ensure_ascii=False)
+
+        logger.info(f"Índice de vagas salvo em: {directory}")
+
+    @classmethod
+    def load(cls, engine: SemanticEngine, directory: str) -> 'JobIndex':
+        """
+        Carrega um índice salvo com save(), reconstruindo os perfis léxicos
+
+        Args:
+            engine: Motor semântico
+            directory: Diretório do índice
+
+        Returns:
+            Índice de vagas carregado
+        """
+        index = cls(engine, VectorIndex.load(directory))
+        with open(os.path.join(directory, 'jobs.json'), 'r', encoding='utf-8') as f:
+            index.jobs = json.load(f)
+
+        for job_id, job in index.jobs.items():
+            index.profiles[job_id] = engine.build_job_profile(
+                job['description'],
+                job.get('experience_level', 'Pleno'),
+                with_embedding=False
+            )
+
+        return index
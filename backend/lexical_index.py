@@ -0,0 +1,493 @@
+"""
+Índice léxico esparso (BM25) para pré-filtrar currículos antes do modelo denso
+
+As frequências de termos ficam em uma matriz esparsa CSR (currículos x termos),
+com uma cópia CSC (por coluna) usada nas consultas. O vocabulário cresce de
+forma incremental: novos termos recebem novas colunas sem reprocessar os
+currículos já indexados. A consulta lê apenas as colunas dos termos da vaga,
+então um pool grande é reduzido a uma shortlist em CPU comum e só ela passa
+pelo SemanticEngine.
+
+Remoções marcam a linha com uma lápide e descontam seus termos das frequências
+de documento; compact() remove as linhas marcadas sem bloquear as consultas.
+"""
+
+import json
+import os
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Any, Optional, Tuple
+import logging
+
+import numpy as np
+from scipy import sparse
+
+from config import get_config
+from semantic_engine import SemanticEngine
+from skill_matcher import normalize_for_matching
+
+logger = logging.getLogger(__name__)
+
+# Tokens preservam skills como c++, c#, node.js e asp.net
+TOKEN_PATTERN = re.compile(r"\w[\w+#.]*")
+
+def tokenize(text: str) -> List[str]:
+    """
+    Divide o texto em termos normalizados
+
+    Args:
+        text: Texto de entrada
+
+    Returns:
+        Lista de termos (com repetição)
+    """
+    return [token.rstrip('.') for token in TOKEN_PATTERN.findall(normalize_for_matching(text))]
+
+class BM25Index:
+    """
+    Índice BM25 sobre uma matriz esparsa com vocabulário incremental
+    """
+
+    def __init__(self, k1: Optional[float] = None, b: Optional[float] = None):
+        """
+        Inicializa o índice vazio
+
+        Args:
+            k1: Saturação da frequência do termo (padrão: Config.BM25_K1)
+            b: Normalização pelo tamanho do documento (padrão: Config.BM25_B)
+        """
+        lexical_config = get_config().get_lexical_config()
+        self.k1 = k1 if k1 is not None else lexical_config['k1']
+        self.b = b if b is not None else lexical_config['b']
+
+        self.ids: List[str] = []
+        self.id_to_row: Dict[str, int] = {}
+        self.vocabulary: Dict[str, int] = {}
+        self.term_frequencies = sparse.csr_matrix((0, 0), dtype=np.float32)
+        # Cópia por coluna: fatiar as colunas da consulta em CSR varreria a matriz inteira
+        self.term_columns = sparse.csc_matrix((0, 0), dtype=np.float32)
+        self.document_frequencies = np.zeros(0, dtype=np.int64)
+        self.document_lengths = np.zeros(0, dtype=np.float32)
+        self.deleted = np.zeros(0, dtype=bool)  # Lápides, alinhadas com as linhas
+        self._lock = threading.RLock()
+        self._compaction_lock = threading.Lock()  # Uma compactação por vez
+
+    def __len__(self) -> int:
+        return len(self.id_to_row)
+
+    @property
+    def tombstone_ratio(self) -> float:
+        """Fração das linhas ocupada por documentos removidos"""
+        return float(self.deleted.mean()) if len(self.deleted) else 0.0
+
+    def add(self, ids: List[str], texts: List[str]):
+        """
+        Adiciona documentos ao índice, estendendo o vocabulário se necessário
+
+        Args:
+            ids: Identificadores únicos, alinhados com `texts`
+            texts: Textos dos documentos
+        """
+        if len(ids) != len(texts):
+            raise ValueError("Número de ids diferente do número de textos")
+
+        counts_per_text = [Counter(tokenize(text)) for text in texts]
+
+        with self._lock:
+            for item_id in ids:
+                if item_id in self.id_to_row:
+                    raise ValueError(f"Id duplicado no índice: {item_id}")
+
+            indptr = [0]
+            indices = []
+            data = []
+            lengths = []
+
+            for counts in counts_per_text:
+                for term, count in counts.items():
+                    column = self.vocabulary.get(term)
+                    if column is None:
+                        column = len(self.vocabulary)
+                        self.vocabulary[term] = column
+                    indices.append(column)
+                    data.append(count)
+                indptr.append(len(indices))
+                lengths.append(sum(counts.values()))
+
+            n_terms = len(self.vocabulary)
+            new_rows = sparse.csr_matrix(
+                (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr)),
+                shape=(len(texts), n_terms)
+            )
+
+            # Colunas novas entram à direita; as linhas antigas não mudam.
+            # Os arrays são substituídos, nunca alterados no lugar, para não afetar consultas em andamento
+            self.term_frequencies = sparse.vstack([self._widen(self.term_frequencies, n_terms), new_rows], format='csr')
+            self.term_columns = self.term_frequencies.tocsc()
+
+            document_frequencies = np.concatenate([
+                self.document_frequencies,
+                np.zeros(n_terms - len(self.document_frequencies), dtype=np.int64)
+            ])
+            self.document_frequencies = document_frequencies + np.bincount(new_rows.indices, minlength=n_terms)
+            self.document_lengths = np.concatenate([self.document_lengths, np.asarray(lengths, dtype=np.float32)])
+            self.deleted = np.concatenate([self.deleted, np.zeros(len(ids), dtype=bool)])
+
+            start = len(self.ids)
+            self.ids.extend(ids)
+            for offset, item_id in enumerate(ids):
+                self.id_to_row[item_id] = start + offset
+
+    @staticmethod
+    def _widen(matrix: sparse.csr_matrix, n_terms: int) -> sparse.csr_matrix:
+        """Nova matriz com colunas vazias à direita, compartilhando os dados da original"""
+        if matrix.shape[1] == n_terms:
+            return matrix
+        return sparse.csr_matrix((matrix.data, matrix.indices, matrix.indptr), shape=(matrix.shape[0], n_terms))
+
+    def update(self, ids: List[str], texts: List[str]):
+        """
+        Substitui (ou insere) documentos: a versão anterior vira lápide
+
+        Args:
+            ids: Identificadores, alinhados com `texts`
+            texts: Novos textos dos documentos
+        """
+        with self._lock:
+            self.delete(ids)
+            self.add(ids, texts)
+
+    def delete(self, ids: List[str]) -> int:
+        """
+        Remove documentos marcando suas linhas com lápides
+
+        Os termos dos documentos removidos deixam de contar nas frequências de
+        documento, então os scores dos demais não dependem de compactação.
+
+        Args:
+            ids: Identificadores a remover (ids inexistentes são ignorados)
+
+        Returns:
+            Número de documentos removidos
+        """
+        with self._lock:
+            rows = [self.id_to_row.pop(item_id) for item_id in ids if item_id in self.id_to_row]
+            if not rows:
+                return 0
+
+            removed_terms = self.term_frequencies[rows].indices
+            self.document_frequencies = self.document_frequencies - np.bincount(
+                removed_terms, minlength=len(self.document_frequencies)
+            )
+            deleted = self.deleted.copy()
+            deleted[rows] = True
+            self.deleted = deleted
+
+        return len(rows)
+
+    def compact(self):
+        """
+        Reconstrói a matriz sem as linhas removidas
+
+        A cópia é montada fora do lock; a troca final também aplica as inserções e
+        remoções feitas durante a compactação.
+        """
+        with self._compaction_lock:
+            self._compact()
+
+    def _compact(self):
+        """Etapas da compactação (chamado com _compaction_lock)"""
+        with self._lock:
+            term_frequencies = self.term_frequencies
+            n_rows = len(self.ids)
+            keep = np.flatnonzero(~self.deleted)
+            ids = list(self.ids)
+
+        if len(keep) == n_rows:
+            return
+
+        # Etapa pesada, sem lock
+        new_term_frequencies = term_frequencies[keep]
+        new_ids = [ids[row] for row in keep]
+
+        with self._lock:
+            n_terms = len(self.vocabulary)
+            added = np.arange(n_rows, len(self.ids))
+            rows = np.concatenate([keep, added])
+
+            self.term_frequencies = sparse.vstack([
+                self._widen(new_term_frequencies, n_terms),
+                self._widen(self.term_frequencies[n_rows:], n_terms)
+            ], format='csr')
+            self.term_columns = self.term_frequencies.tocsc()
+            self.document_lengths = self.document_lengths[rows]
+            self.deleted = self.deleted[rows]
+            self.ids = new_ids + self.ids[n_rows:]
+            self.id_to_row = {item_id: row for row, item_id in enumerate(self.ids) if not self.deleted[row]}
+
+        logger.info(f"Índice BM25 compactado: {n_rows - len(keep)} linhas removidas")
+
+    def scores(self, query: str) -> np.ndarray:
+        """
+        Calcula o score BM25 de todos os documentos para a consulta
+
+        Args:
+            query: Texto da consulta (ex: descrição da vaga)
+
+        Returns:
+            Vetor de scores, um por linha do índice (linhas removidas ficam com 0)
+        """
+        return self._scores(query)[0]
+
+    def _scores(self, query: str) -> Tuple[np.ndarray, List[str], np.ndarray]:
+        """Scores BM25 sobre uma visão consistente do índice: (scores, ids, lápides)"""
+        terms = tokenize(query)
+
+        with self._lock:
+            term_columns, ids, deleted = self.term_columns, self.ids, self.deleted
+            document_frequencies, document_lengths = self.document_frequencies, self.document_lengths
+            n_docs = len(self.id_to_row)
+            columns = sorted({self.vocabulary[term] for term in terms if term in self.vocabulary})
+
+        n_rows = len(deleted)
+        if not n_docs or not columns:
+            return np.zeros(n_rows, dtype=np.float32), ids, deleted
+
+        df = document_frequencies[columns]
+        idf = np.log1p((n_docs - df + 0.5) / (df + 0.5)).astype(np.float32)
+        average_length = document_lengths[~deleted].mean()
+
+        # Na cópia CSC, fatiar colunas lê apenas as entradas dos termos da consulta
+        matches = term_columns[:, columns].tocoo()
+        alive = ~deleted[matches.row]
+        rows, cols, tf = matches.row[alive], matches.col[alive], matches.data[alive]
+        length_norm = 1 - self.b + self.b * document_lengths[rows] / max(average_length, 1e-9)
+        weights = idf[cols] * tf * (self.k1 + 1) / (tf + self.k1 * length_norm)
+
+        return np.bincount(rows, weights=weights, minlength=n_rows).astype(np.float32), ids, deleted
+
+    def search(self, query: str, k: int) -> List[Tuple[str, float]]:
+        """
+        Retorna os k documentos de maior score BM25
+
+        Args:
+            query: Texto da consulta
+            k: Número de documentos
+
+        Returns:
+            Lista de (id, score BM25) em ordem decrescente
+        """
+        scores, ids, deleted = self._scores(query)
+        rows = np.flatnonzero(~deleted)
+        if not len(rows) or k <= 0:
+            return []
+
+        scores = scores[rows]
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+
+        return [(ids[rows[i]], float(scores[i])) for i in top]
+
+    def save(self, directory: str):
+        """
+        Salva o índice em disco
+
+        Args:
+            directory: Diretório de destino
+        """
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            term_frequencies, ids, vocabulary = self.term_frequencies, list(self.ids), dict(self.vocabulary)
+            stats = {
+                'document_frequencies': self.document_frequencies,
+                'document_lengths': self.document_lengths,
+                'deleted': self.deleted
+            }
+
+        sparse.save_npz(os.path.join(directory, 'bm25_tf.npz'), term_frequencies)
+        np.savez(os.path.join(directory, 'bm25_stats.npz'), **stats)
+
+        with open(os.path.join(directory, 'bm25_meta.json'), 'w', encoding='utf-8') as f:
+            json.dump({
+                'ids': ids,
+                'vocabulary': vocabulary,
+                'k1': self.k1,
+                'b': self.b
+            }, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, directory: str) -> 'BM25Index':
+        """
+        Carrega um índice salvo com save()
+
+        Args:
+            directory: Diretório do índice
+
+        Returns:
+            Índice carregado
+        """
+        with open(os.path.join(directory, 'bm25_meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+
+        index = cls(k1=meta['k1'], b=meta['b'])
+        stats = np.load(os.path.join(directory, 'bm25_stats.npz'))
+
+        index.ids = meta['ids']
+        index.deleted = stats['deleted'] if 'deleted' in stats else np.zeros(len(index.ids), dtype=bool)
+        index.id_to_row = {item_id: row for row, item_id in enumerate(index.ids) if not index.deleted[row]}
+        index.vocabulary = meta['vocabulary']
+        index.term_frequencies = sparse.load_npz(os.path.join(directory, 'bm25_tf.npz')).tocsr()
+        index.term_columns = index.term_frequencies.tocsc()
+        index.document_frequencies = stats['document_frequencies']
+        index.document_lengths = stats['document_lengths']
+
+        return index
+
+class LexicalPrefilter:
+    """
+    Primeira etapa barata: BM25 reduz o pool e só a shortlist vai ao modelo denso
+    """
+
+    def __init__(self, engine: SemanticEngine, bm25_index: Optional[BM25Index] = None):
+        """
+        Inicializa o pré-filtro
+
+        Args:
+            engine: Motor semântico usado na pontuação da shortlist
+            bm25_index: Índice BM25 existente (opcional)
+        """
+        self.engine = engine
+        self.bm25_index = bm25_index or BM25Index()
+        self.resumes: Dict[str, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.bm25_index)
+
+    def add_resumes(self, resumes: List[Dict[str, Any]]):
+        """
+        Indexa currículos (sem codificá-los)
+
+        Args:
+            resumes: Lista de currículos (cada um com 'id' e 'text'; 'filename' opcional)
+        """
+        if not resumes:
+            return
+
+        ids = [str(resume['id']) for resume in resumes]
+        self.bm25_index.add(ids, [resume['text'] for resume in resumes])
+
+        for item_id, resume in zip(ids, resumes):
+            self.resumes[item_id] = {
+                'id': item_id,
+                'filename': resume.get('filename', item_id),
+                'text': resume['text']
+            }
+
+        logger.info(f"{len(ids)} currículos indexados no BM25 (total: {len(self)})")
+
+    def update_resumes(self, resumes: List[Dict[str, Any]]):
+        """
+        Reindexa currículos alterados (ids ainda não indexados são inseridos)
+
+        Args:
+            resumes: Lista de currículos (cada um com 'id' e 'text'; 'filename' opcional)
+        """
+        if not resumes:
+            return
+
+        ids = [str(resume['id']) for resume in resumes]
+        for item_id, resume in zip(ids, resumes):
+            self.resumes[item_id] = {
+                'id': item_id,
+                'filename': resume.get('filename', item_id),
+                'text': resume['text']
+            }
+        self.bm25_index.update(ids, [resume['text'] for resume in resumes])
+
+        logger.info(f"{len(ids)} currículos atualizados no BM25 (total: {len(self)})")
+
+    def delete_resumes(self, ids: List[Any]) -> int:
+        """
+        Remove currículos do índice
+
+        Args:
+            ids: Identificadores dos currículos
+
+        Returns:
+            Número de currículos removidos
+        """
+        ids = [str(item_id) for item_id in ids]
+        removed = self.bm25_index.delete(ids)
+        for item_id in ids:
+            self.resumes.pop(item_id, None)
+
+        logger.info(f"{removed} currículos removidos do BM25 (total: {len(self)})")
+        return removed
+
+    @property
+    def tombstone_ratio(self) -> float:
+        return self.bm25_index.tombstone_ratio
+
+    def compact(self):
+        """Recupera o espaço dos currículos removidos (ver BM25Index.compact)"""
+        self.bm25_index.compact()
+
+    def rank(self, job_description: str, job_level: str = "Pleno", k: int = 50,
+             shortlist_size: Optional[int] = None) -> List[Dict]:
+        """
+        Pré-filtra por BM25 e pontua a shortlist com o SemanticEngine
+
+        Args:
+            job_description: Descrição da vaga
+            job_level: Nível da vaga
+            k: Número de currículos retornados
+            shortlist_size: Currículos que passam para o modelo denso
+                (padrão: Config.LEXICAL_SHORTLIST_SIZE)
+
+        Returns:
+            Lista de resultados ordenados por score (mesmo formato de batch_analyze)
+        """
+        if shortlist_size is None:
+            shortlist_size = get_config().LEXICAL_SHORTLIST_SIZE
+
+        hits = self.bm25_index.search(job_description, max(k, shortlist_size))
+        # Currículos removidos entre a busca e a pontuação ficam de fora
+        shortlist = [self.resumes[item_id] for item_id, _ in hits if item_id in self.resumes]
+
+        results = self.engine.batch_analyze(shortlist, job_description, job_level)
+        return results[:k]
+
+    def save(self, directory: Optional[str] = None):
+        """
+        Salva o índice e os currículos em disco
+
+        Args:
+            directory: Diretório de destino (padrão: Config.LEXICAL_INDEX_DIR)
+        """
+        directory = directory or get_config().LEXICAL_INDEX_DIR
+        self.bm25_index.save(directory)
+        with open(os.path.join(directory, 'resumes.json'), 'w', encoding='utf-8') as f:
+            json.dump(self.resumes, f, ensure_ascii=False)
+
+        logger.info(f"Índice BM25 salvo em: {directory}")
+
+    @classmethod
+    def load(cls, engine: SemanticEngine, directory: Optional[str] = None) -> 'LexicalPrefilter':
+        """
+        Carrega um pré-filtro salvo com save()
+
+        Args:
+            engine: Motor semântico
+            directory: Diretório do índice (padrão: Config.LEXICAL_INDEX_DIR)
+
+        Returns:
+            Pré-filtro carregado
+        """
+        directory = directory or get_config().LEXICAL_INDEX_DIR
+        prefilter = cls(engine, BM25Index.load(directory))
+        with open(os.path.join(directory, 'resumes.json'), 'r', encoding='utf-8') as f:
+            prefilter.resumes = json.load(f)
+
+        return prefilter
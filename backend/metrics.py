@@ -0,0 +1,399 @@
+"""
+Métricas de desempenho por etapa (formato de texto do Prometheus)
+
+Instrumentação opcional do motor: temporizadores monotônicos em torno da
+extração de características, de cada cálculo `calculate_*` e do encode do
+modelo, agregados em histogramas e contadores (requisições, acertos do cache,
+tamanho dos lotes de encode e erros).
+
+Desligada por padrão (Config.METRICS_ENABLED). Desligada, cada função decorada
+paga apenas a leitura de uma variável global antes de chamar a original; nada
+é medido nem alocado. As métricas são por processo: workers de
+parallel_scoring e shards mantêm os próprios registros.
+
+Uso:
+    import metrics
+    metrics.enable()
+    metrics.start_http_server(port=9464)   # GET http://127.0.0.1:9464/metrics
+"""
+
+import functools
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import logging
+
+from config import get_config
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Limites dos buckets (segundos): de 100 µs a 10 s
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+_enabled = bool(get_config().METRICS_ENABLED)
+
+def enable():
+    """Liga a coleta de métricas neste processo"""
+    global _enabled
+    _enabled = True
+
+def disable():
+    """Desliga a coleta de métricas (os valores acumulados são mantidos)"""
+    global _enabled
+    _enabled = False
+
+def is_enabled() -> bool:
+    return _enabled
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+class _CounterChild:
+    """Série de um contador para uma combinação de labels"""
+
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def reset(self):
+        with self._lock:
+            self.value = 0.0
+
+class _HistogramChild:
+    """Série de um histograma para uma combinação de labels"""
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count', '_lock')
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        # Um contador por bucket mais o +Inf; acumulados só na exportação
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        position = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[position] += 1
+            self.sum += value
+            self.count += 1
+
+    def reset(self):
+        with self._lock:
+            self.counts = [0] * (len(self.buckets) + 1)
+            self.sum = 0.0
+            self.count = 0
+
+class _Metric:
+    """Base de contadores e histogramas com labels"""
+
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str, **labels: str):
+        """
+        Retorna a série da combinação de labels (criada na primeira chamada)
+
+        Resolva a série uma vez fora do laço quente e reutilize-a.
+        """
+        if labels:
+            values = tuple(labels[name] for name in self.labelnames)
+        key = tuple(str(value) for value in values)
+        if len(key) != len(self.labelnames):
+            raise ValueError(f"{self.name} espera os labels {self.labelnames}")
+
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _series(self) -> List[Tuple[Tuple[str, ...], object]]:
+        with self._lock:
+            return sorted(self._children.items())
+
+    def reset(self):
+        """Zera as séries no lugar: timed/tracked guardam referências a elas"""
+        for _, child in self._series():
+            child.reset()
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        lines.extend(self._render_series())
+        return lines
+
+    def _render_series(self) -> List[str]:
+        raise NotImplementedError
+
+class Counter(_Metric):
+    """Contador monotônico"""
+
+    kind = 'counter'
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        self.labels(**labels).inc(amount)
+
+    def _render_series(self) -> List[str]:
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}'
+                for key, child in self._series()]
+
+class Histogram(_Metric):
+    """Histograma com buckets fixos"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float, **labels: str):
+        self.labels(**labels).observe(value)
+
+    def _render_series(self) -> List[str]:
+        lines = []
+        for key, child in self._series():
+            with child._lock:
+                counts = list(child.counts)
+                total, count = child.sum, child.count
+
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}')
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+            lines.append(f'{self.name}_count{labels} {count}')
+        return lines
+
+class MetricsRegistry:
+    """
+    Conjunto de métricas exportadas juntas
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Métrica já registrada: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def reset(self):
+        """Zera todas as séries (ex: entre execuções de benchmark)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.reset()
+
+    def render(self) -> str:
+        """
+        Exporta as métricas no formato de texto do Prometheus (versão 0.0.4)
+
+        Returns:
+            Texto pronto para a resposta de GET /metrics
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+REGISTRY = MetricsRegistry()
+
+REQUESTS = REGISTRY.counter(
+    'matchsense_requests_total', 'Chamadas das operações de análise', ('operation',))
+REQUEST_DURATION = REGISTRY.histogram(
+    'matchsense_request_duration_seconds', 'Duração das operações de análise', ('operation',))
+STAGE_DURATION = REGISTRY.histogram(
+    'matchsense_stage_duration_seconds', 'Duração de cada etapa da análise', ('stage',))
+ERRORS = REGISTRY.counter(
+    'matchsense_errors_total', 'Erros por operação ou etapa', ('operation',))
+CACHE_LOOKUPS = REGISTRY.counter(
+    'matchsense_embedding_cache_lookups_total', 'Consultas ao cache de embeddings', ('result',))
+ENCODE_BATCH_SIZE = REGISTRY.histogram(
+    'matchsense_encode_batch_size', 'Textos por chamada ao modelo de embedding', (),
+    buckets=BATCH_SIZE_BUCKETS)
+
+_CACHE_HITS = CACHE_LOOKUPS.labels(result='hit')
+_CACHE_MISSES = CACHE_LOOKUPS.labels(result='miss')
+_ENCODE_BATCH = ENCODE_BATCH_SIZE.labels()
+
+def timed(stage: str) -> Callable:
+    """
+    Decorador que mede a duração de uma etapa em matchsense_stage_duration_seconds
+
+    Args:
+        stage: Valor do label `stage`
+
+    Returns:
+        Decorador; com as métricas desligadas a função original é chamada direto
+    """
+    def decorator(fn: Callable) -> Callable:
+        series = STAGE_DURATION.labels(stage=stage)
+        errors = ERRORS.labels(operation=stage)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                errors.inc()
+                raise
+            finally:
+                series.observe(time.perf_counter() - start)
+
+        return wrapper
+    return decorator
+
+def tracked(operation: str) -> Callable:
+    """
+    Decorador de operações de entrada: conta a requisição, mede a duração
+    total e conta as exceções que escapam
+
+    Args:
+        operation: Valor do label `operation`
+
+    Returns:
+        Decorador; com as métricas desligadas a função original é chamada direto
+    """
+    def decorator(fn: Callable) -> Callable:
+        requests = REQUESTS.labels(operation=operation)
+        duration = REQUEST_DURATION.labels(operation=operation)
+        errors = ERRORS.labels(operation=operation)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+
+            requests.inc()
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                errors.inc()
+                raise
+            finally:
+                duration.observe(time.perf_counter() - start)
+
+        return wrapper
+    return decorator
+
+def count_error(operation: str):
+    """Conta um erro tratado (que não propaga exceção) na operação"""
+    if _enabled:
+        ERRORS.inc(operation=operation)
+
+def observe_cache(hits: int, misses: int):
+    """Registra o resultado de uma consulta em lote ao cache de embeddings"""
+    if _enabled:
+        _CACHE_HITS.inc(hits)
+        _CACHE_MISSES.inc(misses)
+
+def observe_encode_batch(size: int):
+    """Registra quantos textos foram enviados ao modelo em uma chamada"""
+    if _enabled:
+        _ENCODE_BATCH.observe(size)
+
+def render() -> str:
+    """Exporta o registro padrão no formato de texto do Prometheus"""
+    return REGISTRY.render()
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Responde GET /metrics com o registro padrão"""
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+
+        body = render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("metrics: " + format % args)
+
+def start_http_server(host: Optional[str] = None, port: Optional[int] = None) -> ThreadingHTTPServer:
+    """
+    Serve GET /metrics em uma thread daemon (para processos sem api.py,
+    como app.py, shards e jobs em lote)
+
+    Args:
+        host: Endereço de escuta (padrão: Config.METRICS_HOST, apenas local)
+        port: Porta (padrão: Config.METRICS_PORT; 0 escolhe uma porta livre)
+
+    Returns:
+        Servidor em execução; chame shutdown() para encerrá-lo
+    """
+    metrics_config = get_config().get_metrics_config()
+    host = host if host is not None else metrics_config['host']
+    port = port if port is not None else metrics_config['port']
+
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True)
+    thread.start()
+
+    logger.info(f"Métricas disponíveis em http://{host}:{server.server_address[1]}/metrics")
+    return server
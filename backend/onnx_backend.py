@@ -0,0 +1,320 @@
+"""
+Backend de inferência ONNX Runtime (opcionalmente quantizado em int8) para CPU
+
+Exporta o transformer do SentenceTransformer para ONNX uma única vez, aplica
+quantização dinâmica int8 se configurado e executa a inferência com ONNX
+Runtime, reproduzindo o pooling e a normalização do modelo original. A
+exportação é validada contra os embeddings do PyTorch por concordância de
+cosseno antes de ser usada.
+"""
+
+import inspect
+import json
+import os
+import re
+import shutil
+import tempfile
+from typing import Dict, List, Any, Optional
+import logging
+
+import numpy as np
+
+from config import get_config
+
+logger = logging.getLogger(__name__)
+
+# Frases usadas para validar o modelo exportado contra o PyTorch
+VALIDATION_TEXTS = [
+    "Desenvolvedor Full Stack com 5 anos de experiência em Python, Django e React",
+    "Buscamos engenheiro de dados com conhecimento em SQL Server, Spark e AWS",
+    "Senior backend engineer experienced with Kubernetes, Docker and CI/CD pipelines",
+    "Analista de RH com foco em recrutamento, comunicação e trabalho em equipe",
+    "Bacharelado em Ciência da Computação pela Universidade de São Paulo",
+    "Product designer skilled in Figma, user research and prototyping",
+]
+
+def _model_dirname(model_name: str, quantize: bool) -> str:
+    """Nome do diretório de exportação para o modelo"""
+    safe_name = re.sub(r'[^\w.-]', '_', model_name)
+    return f"{safe_name}-int8" if quantize else safe_name
+
+def export_onnx_model(model_name: str, export_dir: str, quantize: bool = True,
+                      opset_version: int = 14) -> str:
+    """
+    Exporta um SentenceTransformer para ONNX (e opcionalmente quantiza em int8)
+
+    Args:
+        model_name: Nome do modelo SentenceTransformer
+        export_dir: Diretório base de exportação
+        quantize: Se aplica quantização dinâmica int8 nos pesos
+        opset_version: Versão do opset ONNX
+
+    Returns:
+        Diretório com model.onnx, tokenizer e configuração de pooling
+    """
+    target_dir = os.path.join(export_dir, _model_dirname(model_name, quantize))
+    os.makedirs(export_dir, exist_ok=True)
+
+    # Tudo é gravado em um diretório temporário e renomeado no fim: uma
+    # exportação interrompida não deixa um diretório com cara de carregável
+    temp_dir = tempfile.mkdtemp(prefix=f".{os.path.basename(target_dir)}-", dir=export_dir)
+    try:
+        _export_to_directory(model_name, temp_dir, quantize, opset_version)
+        if os.path.exists(target_dir):
+            shutil.rmtree(target_dir)
+        os.replace(temp_dir, target_dir)
+    except BaseException:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise
+
+    return target_dir
+
+def _export_to_directory(model_name: str, target_dir: str, quantize: bool, opset_version: int):
+    """Grava model.onnx, tokenizer e onnx_config.json em target_dir"""
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    logger.info(f"Exportando {model_name} para ONNX em: {target_dir}")
+    st_model = SentenceTransformer(model_name, device='cpu')
+    transformer = st_model[0]
+    tokenizer = transformer.tokenizer
+    input_names = [name for name in tokenizer.model_input_names
+                   if name in ('input_ids', 'attention_mask', 'token_type_ids')]
+
+    class _TransformerWrapper(torch.nn.Module):
+        """Expõe apenas last_hidden_state com entradas posicionais"""
+
+        def __init__(self, auto_model):
+            super().__init__()
+            self.auto_model = auto_model
+
+        def forward(self, *inputs):
+            outputs = self.auto_model(**dict(zip(input_names, inputs)))
+            return outputs[0]
+
+    dummy = tokenizer(["exemplo de texto para exportação"], return_tensors='pt')
+    dummy_inputs = tuple(dummy[name] for name in input_names)
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names}
+    dynamic_axes['last_hidden_state'] = {0: 'batch', 1: 'sequence'}
+
+    fp32_path = os.path.join(target_dir, 'model_fp32.onnx' if quantize else 'model.onnx')
+    wrapper = _TransformerWrapper(transformer.auto_model).eval()
+
+    # torch >= 2.5 aceita `dynamo` (e passará a usá-lo por padrão); versões anteriores não
+    export_kwargs = {}
+    if 'dynamo' in inspect.signature(torch.onnx.export).parameters:
+        export_kwargs['dynamo'] = False
+
+    with torch.no_grad():
+        torch.onnx.export(
+            wrapper,
+            dummy_inputs,
+            fp32_path,
+            input_names=input_names,
+            output_names=['last_hidden_state'],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset_version,
+            **export_kwargs
+        )
+
+    if quantize:
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+
+        quantize_dynamic(fp32_path, os.path.join(target_dir, 'model.onnx'), weight_type=QuantType.QInt8)
+        os.remove(fp32_path)
+
+    tokenizer.save_pretrained(target_dir)
+
+    # Guardar o pooling e a normalização do pipeline original
+    pooling_mode = 'mean'
+    normalize = False
+    for module in list(st_model)[1:]:
+        module_name = type(module).__name__
+        if module_name == 'Pooling':
+            if getattr(module, 'pooling_mode_cls_token', False):
+                pooling_mode = 'cls'
+            elif getattr(module, 'pooling_mode_max_tokens', False):
+                pooling_mode = 'max'
+        elif module_name == 'Normalize':
+            normalize = True
+
+    with open(os.path.join(target_dir, 'onnx_config.json'), 'w', encoding='utf-8') as f:
+        json.dump({
+            'model_name': model_name,
+            'quantized': quantize,
+            'input_names': input_names,
+            'pooling_mode': pooling_mode,
+            'normalize': normalize,
+            'max_seq_length': st_model.max_seq_length
+        }, f, indent=2)
+
+class OnnxEncoder:
+    """
+    Encoder compatível com SentenceTransformer.encode executado no ONNX Runtime
+    """
+
+    def __init__(self, model_dir: str, intra_op_threads: Optional[int] = None):
+        """
+        Carrega um modelo exportado por export_onnx_model
+
+        Args:
+            model_dir: Diretório com model.onnx, tokenizer e onnx_config.json
+            intra_op_threads: Threads por operação do ONNX Runtime (padrão: automático)
+        """
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        with open(os.path.join(model_dir, 'onnx_config.json'), 'r', encoding='utf-8') as f:
+            self.onnx_config: Dict[str, Any] = json.load(f)
+
+        self.model_dir = model_dir
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.input_names: List[str] = self.onnx_config['input_names']
+        self.max_seq_length: int = self.onnx_config['max_seq_length']
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, 'model.onnx'),
+            sess_options=options,
+            providers=['CPUExecutionProvider']
+        )
+
+    def _pool(self, hidden_states: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        """Aplica o pooling configurado sobre os estados do último nível"""
+        mode = self.onnx_config['pooling_mode']
+
+        if mode == 'cls':
+            return hidden_states[:, 0]
+
+        mask = attention_mask[:, :, None].astype(np.float32)
+        if mode == 'max':
+            return np.where(mask > 0, hidden_states, -1e9).max(axis=1)
+
+        summed = (hidden_states * mask).sum(axis=1)
+        return summed / np.clip(mask.sum(axis=1), 1e-9, None)
+
+    def encode(self, texts, batch_size: int = 32, convert_to_numpy: bool = True,
+               normalize_embeddings: bool = False, show_progress_bar: bool = False,
+               **kwargs) -> np.ndarray:
+        """
+        Gera embeddings com a mesma interface básica de SentenceTransformer.encode
+
+        Args:
+            texts: Texto ou lista de textos
+            batch_size: Tamanho do lote
+            convert_to_numpy: Mantido por compatibilidade (sempre retorna NumPy)
+            normalize_embeddings: Se normaliza os embeddings para norma unitária
+            show_progress_bar: Ignorado
+
+        Returns:
+            Embedding (texto único) ou matriz de embeddings
+        """
+        single = isinstance(texts, str)
+        if single:
+            texts = [texts]
+
+        # Ordenar por tamanho reduz o padding dentro de cada lote
+        order = np.argsort([-len(text) for text in texts], kind='stable')
+        embeddings = [None] * len(texts)
+
+        for start in range(0, len(texts), batch_size):
+            batch_indices = order[start:start + batch_size]
+            encoded = self.tokenizer(
+                [texts[i] for i in batch_indices],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors='np'
+            )
+            feeds = {name: encoded[name].astype(np.int64) for name in self.input_names}
+            hidden_states = self.session.run(None, feeds)[0]
+            pooled = self._pool(hidden_states, encoded['attention_mask'])
+
+            for row, index in enumerate(batch_indices):
+                embeddings[index] = pooled[row]
+
+        result = np.vstack(embeddings).astype(np.float32)
+
+        if self.onnx_config['normalize'] or normalize_embeddings:
+            norms = np.linalg.norm(result, axis=1, keepdims=True)
+            result = result / np.clip(norms, 1e-12, None)
+
+        return result[0] if single else result
+
+def validate_onnx_encoder(reference_model, onnx_encoder: OnnxEncoder,
+                          texts: Optional[List[str]] = None) -> Dict[str, float]:
+    """
+    Compara os embeddings do ONNX com os do modelo PyTorch de referência
+
+    Args:
+        reference_model: SentenceTransformer original
+        onnx_encoder: Encoder ONNX a validar
+        texts: Textos de validação (padrão: VALIDATION_TEXTS)
+
+    Returns:
+        Dicionário com a concordância de cosseno média e mínima
+    """
+    texts = texts or VALIDATION_TEXTS
+    reference = reference_model.encode(texts, convert_to_numpy=True, normalize_embeddings=True,
+                                       show_progress_bar=False)
+    candidate = onnx_encoder.encode(texts, normalize_embeddings=True)
+
+    agreement = np.sum(reference * candidate, axis=1)
+    return {
+        'mean_cosine': float(agreement.mean()),
+        'min_cosine': float(agreement.min())
+    }
+
+def load_onnx_encoder(model_name: str, export_dir: str, quantize: bool = True,
+                      min_agreement: Optional[float] = None, intra_op_threads: Optional[int] = None) -> OnnxEncoder:
+    """
+    Carrega o encoder ONNX, exportando e validando o modelo na primeira vez
+
+    Args:
+        model_name: Nome do modelo SentenceTransformer
+        export_dir: Diretório base de exportação
+        quantize: Se usa a versão quantizada em int8
+        min_agreement: Cosseno mínimo exigido contra o PyTorch em cada frase de validação
+            (padrão: Config.ONNX_MIN_COSINE_AGREEMENT)
+        intra_op_threads: Threads por operação do ONNX Runtime
+
+    Returns:
+        OnnxEncoder pronto para uso
+
+    Raises:
+        ValueError: Se a exportação não atingir a concordância mínima
+    """
+    if min_agreement is None:
+        min_agreement = get_config().get_inference_config()['min_agreement']
+
+    model_dir = os.path.join(export_dir, _model_dirname(model_name, quantize))
+    report_path = os.path.join(model_dir, 'validation.json')
+
+    if not os.path.exists(os.path.join(model_dir, 'model.onnx')):
+        export_onnx_model(model_name, export_dir, quantize)
+
+    encoder = OnnxEncoder(model_dir, intra_op_threads)
+
+    if os.path.exists(report_path):
+        with open(report_path, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+    else:
+        # Validar uma única vez por exportação
+        from sentence_transformers import SentenceTransformer
+
+        report = validate_onnx_encoder(SentenceTransformer(model_name, device='cpu'), encoder)
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+        logger.info(f"Validação ONNX: cosseno médio {report['mean_cosine']:.4f}, mínimo {report['min_cosine']:.4f}")
+
+    if report['min_cosine'] < min_agreement:
+        raise ValueError(
+            f"Modelo ONNX abaixo da concordância mínima ({report['min_cosine']:.4f} < {min_agreement})"
+        )
+
+    return encoder
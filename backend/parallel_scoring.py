@@ -0,0 +1,216 @@
+"""
+Pontuação paralela em múltiplos processos para análises em lote
+
+Cada processo de trabalho carrega o modelo uma única vez, com as threads
+intra-op do torch fixadas para que os processos não disputem os mesmos
+núcleos. Os currículos são divididos em shards, pontuados com
+SemanticEngine.score_candidates e os resultados são reunidos na mesma lista
+ordenada que batch_analyze retorna.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+from typing import Dict, List, Any, Optional, Tuple
+import logging
+
+from config import get_config
+from semantic_engine import SemanticEngine, JobProfile
+
+logger = logging.getLogger(__name__)
+
+# Estado de cada processo de trabalho
+_worker_engine: Optional[SemanticEngine] = None
+_worker_profile: Optional[Tuple[str, str, JobProfile]] = None
+
+def create_worker_engine(model_name: str, threads_per_worker: int,
+                         engine_config: Optional[Dict[str, Any]] = None) -> SemanticEngine:
+    """
+    Prepara um processo de trabalho: limita as threads e carrega o modelo
+
+    Args:
+        model_name: Nome do modelo de embedding
+        threads_per_worker: Threads do torch/OpenMP neste processo
+        engine_config: Configuração aplicada ao motor (ex: pesos)
+
+    Returns:
+        Motor semântico aquecido
+    """
+    # Definido antes de importar torch para valer também para OpenMP/MKL
+    for variable in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS'):
+        os.environ[variable] = str(threads_per_worker)
+
+    try:
+        import torch
+        torch.set_num_threads(threads_per_worker)
+        torch.set_num_interop_threads(1)
+    except (ImportError, RuntimeError):
+        pass
+
+    engine = SemanticEngine(model_name)
+    if engine_config:
+        engine.update_config(engine_config)
+    engine.warmup()
+    return engine
+
+def _init_worker(model_name: str, threads_per_worker: int, engine_config: Optional[Dict[str, Any]]):
+    """Inicializa o processo: limita threads e carrega o modelo uma única vez"""
+    global _worker_engine
+    _worker_engine = create_worker_engine(model_name, threads_per_worker, engine_config)
+
+def _score_shard(resumes: List[Dict], job_description: str, job_level: str) -> List[Dict]:
+    """Pontua um shard de currículos no processo de trabalho (resultados na ordem de entrada)"""
+    global _worker_profile
+
+    # O perfil da vaga é construído uma vez por processo e reaproveitado entre shards
+    if _worker_profile is None or _worker_profile[:2] != (job_description, job_level):
+        profile = _worker_engine.build_job_profile(job_description, job_level)
+        _worker_profile = (job_description, job_level, profile)
+
+    # Sem ordenar: o processo principal desempata pela posição de entrada
+    return _worker_engine._score_resumes(resumes, _worker_profile[2])
+
+class ParallelScorer:
+    """
+    Executor de batch_analyze em um pool de processos
+    """
+
+    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+                 num_workers: Optional[int] = None, threads_per_worker: Optional[int] = None,
+                 shard_size: Optional[int] = None, engine_config: Optional[Dict[str, Any]] = None):
+        """
+        Inicializa o executor (os processos são criados no primeiro uso)
+
+        Args:
+            model_name: Nome do modelo de embedding
+            num_workers: Número de processos (padrão: Config.PARALLEL_WORKERS ou núcleos disponíveis)
+            threads_per_worker: Threads do torch por processo (padrão: núcleos / processos)
+            shard_size: Currículos por shard (padrão: Config.PARALLEL_SHARD_SIZE)
+            engine_config: Configuração aplicada ao motor de cada processo (ex: pesos)
+        """
+        app_config = get_config()
+        cpu_count = os.cpu_count() or 1
+
+        self.model_name = model_name
+        self.num_workers = num_workers or app_config.PARALLEL_WORKERS or cpu_count
+        self.threads_per_worker = threads_per_worker or max(1, cpu_count // self.num_workers)
+        self.shard_size = shard_size or app_config.PARALLEL_SHARD_SIZE
+        self.engine_config = engine_config
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> 'ParallelScorer':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Cria o pool de processos sob demanda"""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.num_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(self.model_name, self.threads_per_worker, self.engine_config)
+            )
+        return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor):
+        """Descarta um pool quebrado (o próximo _get_pool cria outro)"""
+        if self._pool is pool:
+            pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def close(self):
+        """Encerra os processos de trabalho"""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def batch_analyze(self, resumes: List[Dict], job_description: str, job_level: str = "Pleno") -> List[Dict]:
+        """
+        Analisa múltiplos currículos em paralelo contra uma vaga
+
+        A queda de um processo quebra o pool e derruba junto todos os shards em
+        andamento; eles são reenviados inteiros ao pool recriado, sem contar como
+        falha. Um shard que volte a cair depois disso é executado sozinho e, se
+        ainda derrubar o processo, dividido ao meio até isolar o currículo
+        problemático, que recebe um resultado de erro.
+
+        Args:
+            resumes: Lista de currículos (cada um com 'text' e 'filename')
+            job_description: Descrição da vaga
+            job_level: Nível da vaga
+
+        Returns:
+            Lista de resultados ordenados por score (mesmo formato de batch_analyze)
+        """
+        # Resultados acompanhados da posição de entrada do currículo, para desempate
+        results: List[Tuple[int, Dict]] = []
+        # Shards de (posição, currículo), com as quedas do pool com o shard em andamento
+        indexed = list(enumerate(resumes))
+        pending = [(indexed[start:start + self.shard_size], 0) for start in range(0, len(indexed), self.shard_size)]
+        suspects = []
+
+        while pending:
+            pool = self._get_pool()
+            futures = {pool.submit(_score_shard, [resume for _, resume in shard], job_description, job_level):
+                       (shard, crashes) for shard, crashes in pending}
+            pending = []
+
+            for future in as_completed(futures):
+                shard, crashes = futures[future]
+                try:
+                    results.extend(zip([position for position, _ in shard], future.result()))
+                except BrokenProcessPool:
+                    # O pool não pode ser reutilizado após a queda de um processo
+                    self._discard_pool(pool)
+                    if crashes == 0:
+                        pending.append((shard, 1))
+                    else:
+                        suspects.append(shard)
+                except Exception as e:
+                    if len(shard) == 1:
+                        position, resume = shard[0]
+                        results.append((position, self._error_result(resume, e)))
+                    else:
+                        middle = len(shard) // 2
+                        pending.extend([(shard[:middle], crashes), (shard[middle:], crashes)])
+
+        # Suspeitos rodam um por vez: uma queda agora só pode ter vindo deles
+        while suspects:
+            shard = suspects.pop()
+            pool = self._get_pool()
+            try:
+                future = pool.submit(_score_shard, [resume for _, resume in shard], job_description, job_level)
+                results.extend(zip([position for position, _ in shard], future.result()))
+            except Exception as e:
+                if isinstance(e, BrokenProcessPool):
+                    self._discard_pool(pool)
+
+                if len(shard) == 1:
+                    position, resume = shard[0]
+                    results.append((position, self._error_result(resume, e)))
+                else:
+                    middle = len(shard) // 2
+                    suspects.extend([shard[middle:], shard[:middle]])
+
+        # Ordenar por score geral; empates ficam na ordem de entrada, como em batch_analyze
+        results.sort(key=lambda item: (-item[1].get('overall_score', 0), item[0]))
+
+        logger.info(f"Análise paralela concluída para {len(results)} currículos em {self.num_workers} processos")
+        return [result for _, result in results]
+
+    @staticmethod
+    def _error_result(resume: Dict, error: Exception) -> Dict:
+        """Resultado de um currículo que não pôde ser pontuado"""
+        logger.error(f"Erro ao analisar {resume.get('filename', 'unknown')}: {str(error)}")
+        error_result = {
+            'filename': resume.get('filename', 'unknown'),
+            'overall_score': 0,
+            'error': str(error) or type(error).__name__
+        }
+        if 'id' in resume:
+            error_result['id'] = resume['id']
+        return error_result
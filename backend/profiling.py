@@ -0,0 +1,414 @@
+"""
+Perfilamento sob demanda de análises lentas (pilhas colapsadas / flamegraph)
+
+Envolve uma chamada do SemanticEngine ou do DocumentProcessor em um profiler e
+grava, em Config.PROFILING_DIR, dois arquivos por chamada perfilada:
+
+    <timestamp>-<operação>-<pid>-<id>.collapsed   pilhas "f1;f2;f3 valor", uma por linha
+    <timestamp>-<operação>-<pid>-<id>.json        operação, duração, modo e hashes das entradas
+
+O .collapsed abre direto no speedscope ou no flamegraph.pl
+(`flamegraph.pl arquivo.collapsed > flame.svg`). Os hashes SHA-256 das
+entradas permitem localizar o par currículo/vaga sem gravar o texto.
+
+Modos:
+    sampling       thread que amostra a pilha da chamada a cada PROFILING_INTERVAL_MS
+                   (valor = número de amostras); barato o bastante para produção
+    deterministic  sys.setprofile em todas as chamadas Python e C da thread
+                   (valor = microssegundos de tempo próprio); exato, porém lento
+
+O perfilamento é ativado por configuração (PROFILING_ENABLED, perfilando uma
+fração PROFILING_SAMPLE_RATE das chamadas) ou por requisição:
+
+    with profiling.force_profiling():
+        engine.analyze_compatibility(resume_text, job_description)
+"""
+
+import contextvars
+import functools
+import hashlib
+import inspect
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import logging
+
+from config import get_config
+
+logger = logging.getLogger(__name__)
+
+PROFILING_MODES = ('sampling', 'deterministic')
+
+# Perfilamento forçado pela requisição atual e chamada já sendo perfilada
+# (chamadas aninhadas, como analyze_compatibility -> analyze_with_profile,
+# entram no perfil da mais externa)
+_forced = contextvars.ContextVar('profiling_forced', default=False)
+_active = contextvars.ContextVar('profiling_active', default=False)
+
+@contextmanager
+def force_profiling(enabled: bool = True) -> Iterator[None]:
+    """
+    Perfila as chamadas decoradas dentro do bloco, independentemente da
+    configuração e da taxa de amostragem
+
+    Args:
+        enabled: Se False, o bloco não altera nada (útil para flags de requisição)
+    """
+    if not enabled:
+        yield
+        return
+
+    token = _forced.set(True)
+    try:
+        yield
+    finally:
+        _forced.reset(token)
+
+def input_digest(value: Any) -> str:
+    """
+    Hash SHA-256 de uma entrada da análise
+
+    Textos, bytes, ResumeFeatures (.text), JobProfile (.description), arquivos
+    carregados (.getvalue()) e listas de currículos ({'text': ...}) são
+    reduzidos ao conteúdo textual antes do hash.
+
+    Args:
+        value: Valor do argumento
+
+    Returns:
+        Hash hexadecimal
+    """
+    if isinstance(value, (list, tuple)):
+        digest = hashlib.sha256()
+        for item in value:
+            digest.update(input_digest(item).encode('ascii'))
+        return digest.hexdigest()
+
+    if isinstance(value, dict) and 'text' in value:
+        value = value['text']
+    elif hasattr(value, 'getvalue'):
+        value = value.getvalue()
+    elif hasattr(value, 'description') and not isinstance(value, str):
+        value = value.description
+    elif hasattr(value, 'text') and not isinstance(value, str):
+        value = value.text
+
+    if isinstance(value, str):
+        value = value.encode('utf-8')
+    elif not isinstance(value, (bytes, bytearray)):
+        value = repr(value).encode('utf-8')
+
+    return hashlib.sha256(value).hexdigest()
+
+def _frame_label(code) -> str:
+    """Nome de um frame no flamegraph: função qualificada (arquivo:linha)"""
+    name = getattr(code, 'co_qualname', code.co_name)
+    return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+def _c_label(function) -> str:
+    """Nome de uma função C (builtins, numpy, torch) no flamegraph"""
+    module = getattr(function, '__module__', None) or getattr(type(function), '__module__', '')
+    name = getattr(function, '__qualname__', None) or getattr(function, '__name__', repr(function))
+    return f"{module}.{name}" if module else name
+
+class _StackSampler:
+    """
+    Amostra periodicamente a pilha de uma thread (a que executa a chamada)
+    """
+
+    def __init__(self, thread_id: int, interval_seconds: float, root_code=None):
+        self.thread_id = thread_id
+        self.interval_seconds = interval_seconds
+        self.root_code = root_code
+        self.stacks: Dict[str, float] = defaultdict(float)
+        self._labels: Dict[Any, str] = {}
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='profiling-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = _frame_label(code)
+        return label
+
+    def _sample(self):
+        frame = sys._current_frames().get(self.thread_id)
+        labels = []
+        while frame is not None:
+            labels.append(self._label(frame.f_code))
+            # Pilha cortada na função perfilada (sem frames do servidor/threadpool)
+            if frame.f_code is self.root_code:
+                break
+            frame = frame.f_back
+        else:
+            # Amostra fora da função perfilada (antes de entrar ou depois de sair)
+            if self.root_code is not None:
+                return
+
+        if labels:
+            self.stacks[';'.join(reversed(labels))] += 1
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval_seconds):
+            self._sample()
+
+class _Tracer:
+    """
+    Profiler determinístico: tempo próprio de cada pilha via sys.setprofile
+    """
+
+    def __init__(self):
+        self.stacks: Dict[str, float] = defaultdict(float)
+        self._labels: List[str] = []
+        self._frames: List[List[float]] = []  # [início, tempo dos filhos]
+        self._totals: Dict[Tuple[str, ...], float] = defaultdict(float)
+        self._code_labels: Dict[Any, str] = {}
+        self._previous = None
+
+    def start(self):
+        self._previous = sys.getprofile()
+        sys.setprofile(self._callback)
+
+    def stop(self):
+        sys.setprofile(self._previous)
+        for labels, seconds in self._totals.items():
+            self.stacks[';'.join(labels)] += seconds * 1e6
+
+    def _callback(self, frame, event: str, arg):
+        now = time.perf_counter()
+
+        if event == 'call':
+            code = frame.f_code
+            label = self._code_labels.get(code)
+            if label is None:
+                label = self._code_labels[code] = _frame_label(code)
+            self._labels.append(label)
+            self._frames.append([now, 0.0])
+        elif event == 'c_call':
+            self._labels.append(_c_label(arg))
+            self._frames.append([now, 0.0])
+        elif event in ('return', 'c_return', 'c_exception'):
+            if not self._frames:
+                return
+            start, children = self._frames.pop()
+            elapsed = now - start
+            self._totals[tuple(self._labels)] += elapsed - children
+            self._labels.pop()
+            if self._frames:
+                self._frames[-1][1] += elapsed
+
+class ProfileSession:
+    """
+    Uma chamada perfilada: coleta as pilhas e grava os arquivos
+    """
+
+    def __init__(self, operation: str, inputs: Dict[str, str], mode: str = 'sampling',
+                 interval_ms: float = 5.0, root_code=None, forced: bool = False):
+        """
+        Inicializa a sessão
+
+        Args:
+            operation: Nome da operação perfilada
+            inputs: Hashes das entradas (ver input_digest)
+            mode: 'sampling' ou 'deterministic'
+            interval_ms: Intervalo entre amostras no modo sampling
+            root_code: Código da função perfilada (corta a pilha amostrada nela)
+            forced: Se o perfil foi pedido pela requisição
+        """
+        if mode not in PROFILING_MODES:
+            raise ValueError(f"Modo de perfilamento inválido: {mode} (use {', '.join(PROFILING_MODES)})")
+
+        self.operation = operation
+        self.inputs = inputs
+        self.mode = mode
+        self.interval_ms = interval_ms
+        self.root_code = root_code
+        self.forced = forced
+        self.duration_ms = 0.0
+        self.error: Optional[str] = None
+        self.path: Optional[str] = None
+        self.started_at = datetime.now()
+        self._collector = None
+        self._start = 0.0
+
+    @property
+    def stacks(self) -> Dict[str, float]:
+        return dict(self._collector.stacks) if self._collector is not None else {}
+
+    def start(self):
+        if self.mode == 'sampling':
+            self._collector = _StackSampler(threading.get_ident(), self.interval_ms / 1000.0, self.root_code)
+        else:
+            self._collector = _Tracer()
+        self._start = time.perf_counter()
+        self._collector.start()
+
+    def stop(self):
+        self._collector.stop()
+        self.duration_ms = (time.perf_counter() - self._start) * 1000
+
+    def write(self, output_dir: str) -> str:
+        """
+        Grava o .collapsed e o .json da sessão
+
+        Args:
+            output_dir: Diretório de saída
+
+        Returns:
+            Caminho do arquivo .collapsed
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        base = os.path.join(output_dir, '-'.join([
+            self.started_at.strftime('%Y%m%dT%H%M%S'), self.operation, str(os.getpid()), uuid.uuid4().hex[:8]
+        ]))
+
+        stacks = self.stacks
+        with open(base + '.collapsed', 'w', encoding='utf-8') as f:
+            for stack, value in sorted(stacks.items()):
+                value = int(round(value))
+                if value > 0:
+                    f.write(f"{stack} {value}\n")
+
+        metadata = {
+            'operation': self.operation,
+            'mode': self.mode,
+            'unit': 'samples' if self.mode == 'sampling' else 'microseconds',
+            'interval_ms': self.interval_ms if self.mode == 'sampling' else None,
+            'duration_ms': round(self.duration_ms, 3),
+            'total': int(round(sum(stacks.values()))),
+            'inputs': self.inputs,
+            'forced': self.forced,
+            'error': self.error,
+            'started_at': self.started_at.isoformat(),
+            'pid': os.getpid(),
+            'thread': threading.current_thread().name,
+            'collapsed': os.path.basename(base + '.collapsed')
+        }
+        with open(base + '.json', 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, indent=2, ensure_ascii=False)
+
+        self.path = base + '.collapsed'
+        return self.path
+
+class Profiler:
+    """
+    Decide quais chamadas perfilar e onde gravar os perfis
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Inicializa o profiler
+
+        Args:
+            config: Configuração no formato de Config.get_profiling_config()
+                (padrão: configuração da aplicação)
+        """
+        config = dict(get_config().get_profiling_config(), **(config or {}))
+        if config['mode'] not in PROFILING_MODES:
+            raise ValueError(f"Modo de perfilamento inválido: {config['mode']} (use {', '.join(PROFILING_MODES)})")
+
+        self.enabled = bool(config['enabled'])
+        self.sample_rate = float(config['sample_rate'])
+        self.mode = config['mode']
+        self.interval_ms = float(config['interval_ms'])
+        self.min_duration_ms = float(config['min_duration_ms'])
+        self.output_dir = config['output_dir']
+
+    def should_profile(self) -> bool:
+        """Sorteia se a chamada atual entra na fração amostrada"""
+        if _forced.get():
+            return True
+        return self.enabled and random.random() < self.sample_rate
+
+    @contextmanager
+    def profile(self, operation: str, inputs: Optional[Dict[str, str]] = None,
+                root_code=None) -> Iterator[ProfileSession]:
+        """
+        Perfila o bloco e grava o resultado
+
+        Perfis amostrados mais rápidos que min_duration_ms são descartados;
+        perfis forçados pela requisição são sempre gravados, exceto quando o
+        sampler não coletou nenhuma pilha (chamada mais curta que o intervalo).
+
+        Args:
+            operation: Nome da operação
+            inputs: Hashes das entradas
+            root_code: Código da função perfilada (opcional)
+
+        Yields:
+            ProfileSession; `path` é preenchido ao final se o perfil for gravado
+        """
+        session = ProfileSession(operation, inputs or {}, self.mode, self.interval_ms,
+                                 root_code, forced=_forced.get())
+        token = _active.set(True)
+        session.start()
+        try:
+            yield session
+        except Exception as e:
+            session.error = str(e)
+            raise
+        finally:
+            session.stop()
+            _active.reset(token)
+
+            if not session.stacks:
+                logger.warning(
+                    f"Perfil de {operation} sem amostras ({session.duration_ms:.1f} ms, intervalo de "
+                    f"{self.interval_ms:.1f} ms); use o modo 'deterministic' para chamadas curtas"
+                )
+            elif session.forced or session.duration_ms >= self.min_duration_ms:
+                try:
+                    path = session.write(self.output_dir)
+                    logger.info(f"Perfil de {operation} ({session.duration_ms:.1f} ms) gravado em {path}")
+                except Exception as e:
+                    logger.error(f"Erro ao gravar perfil de {operation}: {str(e)}")
+
+def profiled(operation: str, *input_names: str) -> Callable:
+    """
+    Decorador de métodos de objetos com atributo `profiler`
+
+    Fora de um perfil forçado e com o profiler desligado, o custo é o teste de
+    duas flags antes de chamar a função original.
+
+    Args:
+        operation: Nome da operação nos arquivos de perfil
+        *input_names: Argumentos cujos hashes vão para o .json
+
+    Returns:
+        Decorador
+    """
+    def decorator(fn: Callable) -> Callable:
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            profiler = self.profiler
+            if not (profiler.enabled or _forced.get()) or _active.get() or not profiler.should_profile():
+                return fn(self, *args, **kwargs)
+
+            arguments = signature.bind(self, *args, **kwargs).arguments
+            inputs = {name: input_digest(arguments[name]) for name in input_names if name in arguments}
+
+            with profiler.profile(operation, inputs, fn.__code__):
+                return fn(self, *args, **kwargs)
+
+        return wrapper
+    return decorator
@@ -0,0 +1,168 @@
+"""
+Tabela colunar de scores por componente para re-ranqueamento instantâneo
+
+O score geral é uma soma ponderada de cinco componentes. Guardando esses
+componentes em uma matriz (candidatos x componentes), uma mudança de pesos vira
+um único produto matriz-vetor seguido de uma reordenação, sem reprocessar
+currículos nem recalcular embeddings.
+"""
+
+import json
+import os
+from typing import Dict, List, Any, Optional, Tuple
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Colunas dos resultados de análise e chaves correspondentes em config['weights']
+COMPONENTS = [
+    ('semantic_similarity', 'semantic'),
+    ('skills_match', 'skills'),
+    ('experience_match', 'experience'),
+    ('education_match', 'education'),
+    ('soft_skills_match', 'soft_skills'),
+]
+
+class ScoreTable:
+    """
+    Scores por componente de cada candidato em formato colunar
+    """
+
+    def __init__(self, ids: List[str], components: np.ndarray):
+        """
+        Inicializa a tabela
+
+        Args:
+            ids: Identificadores dos candidatos, alinhados com as linhas
+            components: Matriz (n_candidatos, 5) na ordem de COMPONENTS (0-100)
+        """
+        components = np.asarray(components, dtype=np.float32).reshape(-1, len(COMPONENTS))
+        if len(ids) != len(components):
+            raise ValueError("Número de ids diferente do número de linhas")
+
+        self.ids = list(ids)
+        self.components = components
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_results(cls, results: List[Dict[str, Any]], ids: Optional[List[str]] = None,
+                     id_key: str = 'filename') -> 'ScoreTable':
+        """
+        Monta a tabela a partir de resultados de análise
+
+        Resultados com erro são ignorados.
+
+        Args:
+            results: Resultados de analyze_* / batch_analyze
+            ids: Identificadores alinhados com `results` (padrão: result[id_key])
+            id_key: Campo usado como identificador quando `ids` não é informado
+
+        Returns:
+            Tabela de scores
+        """
+        if ids is None:
+            ids = [result.get(id_key) for result in results]
+
+        valid = [(item_id, result) for item_id, result in zip(ids, results) if 'error' not in result]
+        components = np.array(
+            [[result[column] for column, _ in COMPONENTS] for _, result in valid],
+            dtype=np.float32
+        )
+
+        return cls([item_id for item_id, _ in valid], components)
+
+    @staticmethod
+    def weight_vector(weights: Dict[str, float]) -> np.ndarray:
+        """
+        Converte o dicionário de pesos em um vetor na ordem de COMPONENTS
+
+        Args:
+            weights: Pesos no formato de config['weights']
+
+        Returns:
+            Vetor de pesos
+        """
+        return np.array([weights.get(key, 0.0) for _, key in COMPONENTS], dtype=np.float32)
+
+    def overall_scores(self, weights: Dict[str, float]) -> np.ndarray:
+        """
+        Recalcula o score geral de todos os candidatos para novos pesos
+
+        Args:
+            weights: Pesos no formato de config['weights']
+
+        Returns:
+            Vetor de scores gerais, alinhado com `ids`
+        """
+        return self.components @ self.weight_vector(weights)
+
+    def rerank(self, weights: Dict[str, float], k: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Reordena os candidatos para novos pesos
+
+        Args:
+            weights: Pesos no formato de config['weights']
+            k: Se informado, retorna apenas os k melhores
+
+        Returns:
+            (linhas em ordem decrescente de score, scores correspondentes)
+        """
+        scores = self.overall_scores(weights)
+
+        if k is not None and k < len(scores):
+            order = np.argpartition(-scores, k - 1)[:k]
+            order = order[np.argsort(-scores[order], kind='stable')]
+        else:
+            order = np.argsort(-scores, kind='stable')
+
+        return order, scores[order]
+
+    def to_dataframe(self, weights: Dict[str, float], k: Optional[int] = None) -> pd.DataFrame:
+        """
+        Ranking para novos pesos como DataFrame
+
+        Args:
+            weights: Pesos no formato de config['weights']
+            k: Se informado, retorna apenas os k melhores
+
+        Returns:
+            DataFrame com id, score geral e componentes, ordenado por score geral
+        """
+        order, scores = self.rerank(weights, k)
+        df = pd.DataFrame(self.components[order], columns=[column for column, _ in COMPONENTS])
+        df.insert(0, 'overall_score', scores)
+        df.insert(0, 'id', [self.ids[row] for row in order])
+
+        return df
+
+    def save(self, path: str):
+        """
+        Salva a tabela em disco (.npz)
+
+        Args:
+            path: Caminho do arquivo
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        np.savez(path, components=self.components, ids=np.array(json.dumps(self.ids, ensure_ascii=False)))
+
+    @classmethod
+    def load(cls, path: str) -> 'ScoreTable':
+        """
+        Carrega uma tabela salva com save()
+
+        Args:
+            path: Caminho do arquivo
+
+        Returns:
+            Tabela de scores
+        """
+        data = np.load(path)
+        return cls(json.loads(str(data['ids'])), data['components'])
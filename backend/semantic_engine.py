@@ -1,27 +1,116 @@
+import heapq
+import itertools
 import numpy as np
-import pandas as pd
-from sentence_transformers import SentenceTransformer, util
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import re
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from typing import Dict, List, Tuple, Any
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Sized, Tuple, Any, Optional, Union
 import logging
 
-# Tentar importar spaCy, mas tornar opcional
-try:
-    import spacy
-    SPACY_AVAILABLE = True
-except ImportError:
-    SPACY_AVAILABLE = False
-    print("⚠️ spaCy não disponível. Algumas funcionalidades podem ser limitadas.")
+from config import Config, get_config
+from embedding_cache import EmbeddingCache
+from embedding_store import EmbeddingStore
+import metrics
+import profiling
+from skill_matcher import SkillMatcher, normalize_for_matching
+from skill_bitset import SkillBitset
+from skill_embeddings import SkillEmbeddingIndex
+
+# sentence-transformers (torch), NLTK e spaCy são importados sob demanda:
+# importar este módulo não carrega nenhuma biblioteca pesada nem acessa a rede
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Lista de skills técnicas comuns
+TECHNICAL_SKILLS = [
+    # Linguagens de programação
+    'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'php', 'ruby', 'go', 'rust',
+    'swift', 'kotlin', 'scala', 'r', 'matlab', 'perl', 'bash', 'powershell',
+
+    # Frameworks e bibliotecas
+    'react', 'angular', 'vue', 'node.js', 'express', 'django', 'flask', 'spring',
+    'laravel', 'asp.net', 'jquery', 'bootstrap', 'tailwind', 'material-ui',
+
+    # Bancos de dados
+    'mysql', 'postgresql', 'mongodb', 'redis', 'sqlite', 'oracle', 'sql server',
+    'elasticsearch', 'cassandra', 'dynamodb',
+
+    # Cloud e DevOps
+    'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'gitlab', 'github',
+    'terraform', 'ansible', 'prometheus', 'grafana',
+
+    # Ferramentas e tecnologias
+    'git', 'svn', 'jira', 'confluence', 'slack', 'teams', 'zoom', 'figma',
+    'adobe', 'photoshop', 'illustrator', 'sketch', 'invision',
+
+    # Metodologias
+    'agile', 'scrum', 'kanban', 'lean', 'devops', 'ci/cd', 'tdd', 'bdd',
+
+    # Outras tecnologias
+    'html', 'css', 'sass', 'less', 'webpack', 'babel', 'npm', 'yarn',
+    'rest', 'graphql', 'soap', 'microservices', 'api', 'json', 'xml'
+]
+
+# Lista de soft skills (português e inglês)
+SOFT_SKILLS = [
+    'liderança', 'leadership', 'comunicação', 'communication', 'trabalho em equipe',
+    'teamwork', 'resolução de problemas', 'problem solving', 'criatividade',
+    'creativity', 'adaptabilidade', 'adaptability', 'flexibilidade', 'flexibility',
+    'proatividade', 'proactivity', 'organização', 'organization', 'gestão de tempo',
+    'time management', 'negociação', 'negotiation', 'empatia', 'empathy',
+    'resiliência', 'resilience', 'pensamento crítico', 'critical thinking',
+    'inovação', 'innovation', 'colaboração', 'collaboration', 'autonomia',
+    'autonomy', 'responsabilidade', 'responsibility', 'comprometimento',
+    'commitment', 'motivação', 'motivation', 'aprendizado contínuo',
+    'continuous learning', 'gestão de conflitos', 'conflict management'
+]
+
+# Padrões pré-compilados para anos de experiência (aplicados ao texto em minúsculas)
+EXPERIENCE_PATTERNS = [
+    re.compile(r'(\d+)\s*(?:anos?|years?)\s*(?:de\s+)?(?:experiência|experience)'),
+    re.compile(r'(?:experiência|experience)\s*(?:de\s+)?(\d+)\s*(?:anos?|years?)'),
+    re.compile(r'(\d+)\s*(?:anos?|years?)\s*(?:no\s+)?(?:mercado|market)'),
+    re.compile(r'(\d+)\s*(?:anos?|years?)\s*(?:trabalhando|working)')
+]
+
+# Padrões pré-compilados para formações (aplicados ao texto em minúsculas)
+EDUCATION_PATTERNS = {
+    'graduação': re.compile(r'(?:graduação|graduation|bacharelado|bachelor|licenciatura)'),
+    'pós_graduação': re.compile(r'(?:pós\s*graduação|post\s*graduation|especialização|specialization)'),
+    'mestrado': re.compile(r'(?:mestrado|master|m\.s\.|ms)'),
+    'doutorado': re.compile(r'(?:doutorado|phd|doctorate|dr\.)'),
+    'técnico': re.compile(r'(?:técnico|technical|curso\s*técnico)'),
+    'certificação': re.compile(r'(?:certificação|certification|certificado|certificate)')
+}
+
+@dataclass
+class ResumeFeatures:
+    """
+    Características de um currículo extraídas em uma única passada e reutilizadas por todos os scores
+    """
+    text: str
+    normalized_text: str
+    skills: List[str]
+    soft_skills: List[str]
+    experience: Dict[str, Any]
+    education: Dict[str, Any]
+
+@dataclass
+class JobProfile:
+    """
+    Perfil pré-processado de uma vaga, construído uma vez e reutilizado para todos os candidatos
+    """
+    description: str
+    level: str
+    skills: List[str]
+    soft_skills: List[str]
+    education_requirements: Dict[str, bool]
+    embedding: Optional[np.ndarray] = field(default=None, repr=False)
+    skill_mask: Optional[np.ndarray] = field(default=None, repr=False)
+
 class SemanticEngine:
     """
     Motor principal para análise semântica de compatibilidade entre currículos e vagas
@@ -35,13 +124,39 @@ class SemanticEngine:
             model_name: Nome do modelo de embedding a ser usado
         """
         self.model_name = model_name
-        self.model = None
-        self.nlp = None
-        self.stop_words = set()
+        self._model = None
+        self._model_lock = threading.Lock()
+        self._nlp = None
+        self._nlp_loaded = False
+        self._stop_words = None
+        self._skill_embeddings = None
+        self._skill_embeddings_lock = threading.Lock()
+        self.embedding_cache = None
+        self.embedding_store = None
+        
+        # Autômatos compilados para extração de skills
+        self.skill_matcher = SkillMatcher(TECHNICAL_SKILLS)
+        self.soft_skill_matcher = SkillMatcher(SOFT_SKILLS)
+        
+        # Autômato combinado: skills técnicas e soft skills em uma só varredura do currículo
+        self.resume_matcher = SkillMatcher(TECHNICAL_SKILLS + SOFT_SKILLS)
+        self._technical_skill_set = set(self.skill_matcher.vocabulary)
+        self._soft_skill_set = set(self.soft_skill_matcher.vocabulary)
+        
+        # Bitsets sobre o vocabulário técnico para o match de skills vetorizado
+        self.skill_bitset = SkillBitset(self.skill_matcher.vocabulary)
+        
+        app_config = get_config()
         
         # Configurações padrão
         self.config = {
             'similarity_threshold': 0.7,
+            'semantic_skills': app_config.get_skill_matching_config(),
+            'batch_size': app_config.BATCH_SIZE,
+            'cache': app_config.get_cache_config(),
+            'embedding_store': app_config.get_embedding_store_config(),
+            'inference': app_config.get_inference_config(),
+            'profiling': app_config.get_profiling_config(),
             'weights': {
                 'semantic': 0.4,
                 'skills': 0.3,
@@ -51,40 +166,25 @@ class SemanticEngine:
             }
         }
         
+        # Perfilamento sob demanda (config['profiling'] ou profiling.force_profiling())
+        self.profiler = profiling.Profiler(self.config['profiling'])
+        
         # Inicializar recursos
         self._initialize_resources()
     
     def _initialize_resources(self):
-        """Inicializa os recursos necessários (modelo, spaCy, NLTK)"""
+        """
+        Inicializa os recursos leves (cache e store de embeddings)
+        
+        O modelo, o spaCy e as stop words do NLTK são carregados no primeiro uso,
+        sem downloads durante a inicialização.
+        """
         try:
-            logger.info(f"Carregando modelo: {self.model_name}")
-            self.model = SentenceTransformer(self.model_name)
-            
-            # Carregar spaCy para processamento de texto (opcional)
-            if SPACY_AVAILABLE:
-                try:
-                    self.nlp = spacy.load("pt_core_news_sm")
-                    logger.info("Modelo spaCy carregado com sucesso")
-                except OSError:
-                    logger.warning("Modelo spaCy pt_core_news_sm não encontrado. spaCy será usado em modo limitado.")
-                    self.nlp = None
-            else:
-                logger.warning("spaCy não disponível. Usando processamento de texto básico.")
-                self.nlp = None
+            # Cache persistente de embeddings (opcional)
+            self._initialize_cache()
             
-            # Baixar recursos NLTK se necessário
-            try:
-                nltk.data.find('tokenizers/punkt')
-            except LookupError:
-                nltk.download('punkt')
-            
-            try:
-                nltk.data.find('corpora/stopwords')
-            except LookupError:
-                nltk.download('stopwords')
-            
-            # Carregar stop words em português
-            self.stop_words = set(stopwords.words('portuguese'))
+            # Store memmap de embeddings de currículos (opcional)
+            self._initialize_embedding_store()
             
             logger.info("Recursos inicializados com sucesso!")
             
@@ -92,6 +192,194 @@ class SemanticEngine:
             logger.error(f"Erro ao inicializar recursos: {str(e)}")
             raise
     
+    @property
+    def model(self):
+        """Modelo de embedding, carregado no primeiro uso"""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    logger.info(f"Carregando modelo: {self.model_name}")
+                    self._model = self._load_model()
+        return self._model
+    
+    @model.setter
+    def model(self, value):
+        self._model = value
+    
+    def warmup(self):
+        """Carrega o modelo antecipadamente (ex: na inicialização de workers e serviços)"""
+        model = self.model
+        if self.config['semantic_skills'].get('enabled'):
+            _ = self.skill_embeddings
+        return model
+    
+    @property
+    def skill_embeddings(self) -> SkillEmbeddingIndex:
+        """Matriz de embeddings do vocabulário de skills, construída ou carregada no primeiro uso"""
+        if self._skill_embeddings is None:
+            with self._skill_embeddings_lock:
+                if self._skill_embeddings is None:
+                    skill_config = self.config['semantic_skills']
+                    self._skill_embeddings = SkillEmbeddingIndex(
+                        self.resume_matcher.vocabulary,
+                        self.encode_texts,
+                        namespace=self._embedding_namespace(),
+                        artifact_path=skill_config.get('artifact_path'),
+                        stop_words=self.stop_words,
+                        max_ngram=skill_config.get('max_ngram', 2)
+                    )
+        return self._skill_embeddings
+    
+    @property
+    def nlp(self):
+        """Pipeline spaCy pt_core_news_sm (opcional), carregado apenas quando usado"""
+        if not self._nlp_loaded:
+            self._nlp_loaded = True
+            try:
+                import spacy
+                self._nlp = spacy.load("pt_core_news_sm")
+                logger.info("Modelo spaCy carregado com sucesso")
+            except ImportError:
+                logger.warning("spaCy não disponível. Usando processamento de texto básico.")
+            except OSError:
+                logger.warning("Modelo spaCy pt_core_news_sm não encontrado. spaCy será usado em modo limitado.")
+        return self._nlp
+    
+    @property
+    def stop_words(self) -> set:
+        """Stop words em português do NLTK, carregadas no primeiro uso (sem download)"""
+        if self._stop_words is None:
+            try:
+                from nltk.corpus import stopwords
+                self._stop_words = set(stopwords.words('portuguese'))
+            except (ImportError, LookupError):
+                logger.warning("Stop words do NLTK indisponíveis. Execute: python -c \"import nltk; nltk.download('stopwords')\"")
+                self._stop_words = set()
+        return self._stop_words
+    
+    def _load_model(self):
+        """
+        Carrega o modelo de embedding no backend configurado
+        
+        Com backend 'onnx' o modelo é exportado/validado na primeira execução; se o
+        ONNX Runtime não estiver disponível ou a validação falhar, usa PyTorch.
+        """
+        inference = self.config['inference']
+        
+        if inference['backend'] == 'onnx':
+            try:
+                from onnx_backend import load_onnx_encoder
+                
+                model = load_onnx_encoder(
+                    self.model_name,
+                    inference['onnx_dir'],
+                    quantize=inference['quantize'],
+                    min_agreement=inference['min_agreement']
+                )
+                logger.info(f"Backend ONNX Runtime ativo ({'int8' if inference['quantize'] else 'fp32'})")
+                return model
+            except Exception as e:
+                logger.warning(f"Backend ONNX indisponível, usando PyTorch: {str(e)}")
+                self.config['inference'] = dict(inference, backend='torch')
+        
+        from sentence_transformers import SentenceTransformer
+        
+        return SentenceTransformer(self.model_name)
+    
+    def _embedding_namespace(self) -> str:
+        """Identifica modelo + backend nas chaves do cache (embeddings int8 diferem dos fp32)"""
+        inference = self.config['inference']
+        if inference['backend'] == 'onnx':
+            return f"{self.model_name}@onnx{'-int8' if inference['quantize'] else ''}"
+        return self.model_name
+    
+    def _initialize_cache(self):
+        """Abre o cache de embeddings em disco, se habilitado na configuração"""
+        cache_config = self.config['cache']
+        if not cache_config['enabled']:
+            self.embedding_cache = None
+            return
+        
+        try:
+            self.embedding_cache = EmbeddingCache(
+                cache_dir=cache_config['cache_dir'],
+                ttl=cache_config['ttl'],
+                max_size_mb=cache_config['max_size_mb']
+            )
+            logger.info(f"Cache de embeddings ativo em: {self.embedding_cache.db_path}")
+        except Exception as e:
+            logger.warning(f"Cache de embeddings indisponível: {str(e)}")
+            self.embedding_cache = None
+    
+    def _initialize_embedding_store(self):
+        """Abre o store memmap de embeddings, se habilitado na configuração"""
+        store_config = self.config['embedding_store']
+        if not store_config['enabled']:
+            self.embedding_store = None
+            return
+        
+        try:
+            self.attach_embedding_store(EmbeddingStore(
+                store_config['store_dir'],
+                dtype=store_config['dtype'],
+                namespace=self._embedding_namespace()
+            ))
+        except Exception as e:
+            logger.warning(f"Store de embeddings indisponível: {str(e)}")
+            self.embedding_store = None
+    
+    def attach_embedding_store(self, store: EmbeddingStore):
+        """
+        Passa a ler embeddings de currículos conhecidos do store em vez de codificá-los
+        
+        Args:
+            store: Store aberto com EmbeddingStore
+            
+        Raises:
+            ValueError: Se o store foi gerado por outro modelo
+        """
+        if store.namespace and store.namespace != self._embedding_namespace():
+            raise ValueError(
+                f"Store gerado com '{store.namespace}', incompatível com '{self._embedding_namespace()}'"
+            )
+        
+        self.embedding_store = store
+        logger.info(f"Store de embeddings ativo em: {store.directory} ({len(store)} vetores)")
+    
+    def store_resume_embeddings(self, resumes: List[Dict]):
+        """
+        Codifica currículos e grava os embeddings no store (um novo segmento)
+        
+        Args:
+            resumes: Lista de currículos (cada um com 'id' e 'text')
+        """
+        if self.embedding_store is None:
+            raise ValueError("Nenhum store de embeddings configurado")
+        
+        embeddings = self.encode_texts([resume['text'] for resume in resumes])
+        self.embedding_store.append([resume['id'] for resume in resumes], embeddings)
+    
+    def _resume_embeddings(self, texts: List[str], resume_ids: Optional[List] = None) -> np.ndarray:
+        """Embeddings dos currículos, lendo do store os ids conhecidos e codificando os demais"""
+        if self.embedding_store is None or resume_ids is None:
+            return self.encode_texts(texts)
+        
+        embeddings, found = self.embedding_store.get_many(resume_ids)
+        if not found.any():
+            # Store vazio (sem dimensão definida) ou nenhum id conhecido
+            return self.encode_texts(texts)
+        
+        missing = np.flatnonzero(~found)
+        if len(missing):
+            encoded = self.encode_texts([texts[i] for i in missing])
+            if encoded.shape[1] != embeddings.shape[1]:
+                raise ValueError(
+                    f"Dimensão do store ({embeddings.shape[1]}) difere da do modelo ({encoded.shape[1]})"
+                )
+            embeddings[missing] = encoded
+        
+        return embeddings
+    
     def preprocess_text(self, text: str) -> str:
         """
         Pré-processa o texto para análise
@@ -126,47 +414,7 @@ class SemanticEngine:
         Returns:
             Lista de skills encontradas
         """
-        # Lista de skills técnicas comuns
-        technical_skills = [
-            # Linguagens de programação
-            'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'php', 'ruby', 'go', 'rust',
-            'swift', 'kotlin', 'scala', 'r', 'matlab', 'perl', 'bash', 'powershell',
-            
-            # Frameworks e bibliotecas
-            'react', 'angular', 'vue', 'node.js', 'express', 'django', 'flask', 'spring',
-            'laravel', 'asp.net', 'jquery', 'bootstrap', 'tailwind', 'material-ui',
-            
-            # Bancos de dados
-            'mysql', 'postgresql', 'mongodb', 'redis', 'sqlite', 'oracle', 'sql server',
-            'elasticsearch', 'cassandra', 'dynamodb',
-            
-            # Cloud e DevOps
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'gitlab', 'github',
-            'terraform', 'ansible', 'prometheus', 'grafana',
-            
-            # Ferramentas e tecnologias
-            'git', 'svn', 'jira', 'confluence', 'slack', 'teams', 'zoom', 'figma',
-            'adobe', 'photoshop', 'illustrator', 'sketch', 'invision',
-            
-            # Metodologias
-            'agile', 'scrum', 'kanban', 'lean', 'devops', 'ci/cd', 'tdd', 'bdd',
-            
-            # Outras tecnologias
-            'html', 'css', 'sass', 'less', 'webpack', 'babel', 'npm', 'yarn',
-            'rest', 'graphql', 'soap', 'microservices', 'api', 'json', 'xml'
-        ]
-        
-        # Processar texto
-        processed_text = self.preprocess_text(text)
-        words = word_tokenize(processed_text)
-        
-        # Encontrar skills
-        found_skills = []
-        for word in words:
-            if word in technical_skills and word not in found_skills:
-                found_skills.append(word)
-        
-        return found_skills
+        return self._extract_skill_terms(normalize_for_matching(text))[0]
     
     def extract_experience_info(self, text: str) -> Dict[str, Any]:
         """
@@ -178,17 +426,13 @@ class SemanticEngine:
         Returns:
             Dicionário com informações de experiência
         """
-        # Padrões para encontrar anos de experiência
-        experience_patterns = [
-            r'(\d+)\s*(?:anos?|years?)\s*(?:de\s+)?(?:experiência|experience)',
-            r'(?:experiência|experience)\s*(?:de\s+)?(\d+)\s*(?:anos?|years?)',
-            r'(\d+)\s*(?:anos?|years?)\s*(?:no\s+)?(?:mercado|market)',
-            r'(\d+)\s*(?:anos?|years?)\s*(?:trabalhando|working)'
-        ]
-        
+        return self._experience_from_normalized(normalize_for_matching(text))
+    
+    def _experience_from_normalized(self, normalized_text: str) -> Dict[str, Any]:
+        """Extrai experiência de um texto já normalizado (minúsculas)"""
         years_experience = 0
-        for pattern in experience_patterns:
-            matches = re.findall(pattern, text.lower())
+        for pattern in EXPERIENCE_PATTERNS:
+            matches = pattern.findall(normalized_text)
             if matches:
                 years_experience = max([int(match) for match in matches])
                 break
@@ -220,19 +464,13 @@ class SemanticEngine:
         Returns:
             Dicionário com informações de educação
         """
-        # Padrões para encontrar formações
-        education_patterns = {
-            'graduação': r'(?:graduação|graduation|bacharelado|bachelor|licenciatura)',
-            'pós_graduação': r'(?:pós\s*graduação|post\s*graduation|especialização|specialization)',
-            'mestrado': r'(?:mestrado|master|m\.s\.|ms)',
-            'doutorado': r'(?:doutorado|phd|doctorate|dr\.)',
-            'técnico': r'(?:técnico|technical|curso\s*técnico)',
-            'certificação': r'(?:certificação|certification|certificado|certificate)'
-        }
-        
+        return self._education_from_normalized(normalize_for_matching(text))
+    
+    def _education_from_normalized(self, normalized_text: str) -> Dict[str, Any]:
+        """Extrai educação de um texto já normalizado (minúsculas)"""
         education_levels = []
-        for level, pattern in education_patterns.items():
-            if re.search(pattern, text.lower()):
+        for level, pattern in EDUCATION_PATTERNS.items():
+            if pattern.search(normalized_text):
                 education_levels.append(level)
         
         # Determinar nível mais alto
@@ -259,54 +497,193 @@ class SemanticEngine:
         Returns:
             Lista de soft skills encontradas
         """
-        soft_skills = [
-            'liderança', 'leadership', 'comunicação', 'communication', 'trabalho em equipe',
-            'teamwork', 'resolução de problemas', 'problem solving', 'criatividade',
-            'creativity', 'adaptabilidade', 'adaptability', 'flexibilidade', 'flexibility',
-            'proatividade', 'proactivity', 'organização', 'organization', 'gestão de tempo',
-            'time management', 'negociação', 'negotiation', 'empatia', 'empathy',
-            'resiliência', 'resilience', 'pensamento crítico', 'critical thinking',
-            'inovação', 'innovation', 'colaboração', 'collaboration', 'autonomia',
-            'autonomy', 'responsabilidade', 'responsibility', 'comprometimento',
-            'commitment', 'motivação', 'motivation', 'aprendizado contínuo',
-            'continuous learning', 'gestão de conflitos', 'conflict management'
-        ]
+        return self._extract_skill_terms(normalize_for_matching(text))[1]
+    
+    def _extract_skill_terms(self, normalized_text: str) -> Tuple[List[str], List[str]]:
+        """
+        Extrai skills técnicas e soft skills em uma só varredura do autômato
+        
+        Com o match semântico habilitado, n-gramas sem correspondência exata são
+        associados às skills canônicas acima de similarity_threshold.
+        
+        Args:
+            normalized_text: Texto já normalizado
+            
+        Returns:
+            (skills técnicas, soft skills)
+        """
+        terms = self.resume_matcher.find_all(normalized_text, normalized=True)
+        terms += self._semantic_skill_terms(normalized_text, terms)
+        
+        return (
+            [term for term in terms if term in self._technical_skill_set],
+            [term for term in terms if term in self._soft_skill_set]
+        )
+    
+    def _semantic_skill_terms(self, normalized_text: str, found: List[str]) -> List[str]:
+        """Skills canônicas encontradas por similaridade (vazio se o recurso estiver desabilitado)"""
+        if not self.config['semantic_skills'].get('enabled'):
+            return []
+        
+        try:
+            return self.skill_embeddings.match(normalized_text, self.config['similarity_threshold'], exclude=found)
+        except Exception as e:
+            logger.error(f"Erro no match semântico de skills: {str(e)}")
+            return []
+    
+    @metrics.timed('extract_features')
+    def extract_resume_features(self, resume_text: str) -> ResumeFeatures:
+        """
+        Extrai todas as características do currículo em uma única passada
+        
+        O texto é normalizado uma vez, as skills técnicas e soft skills saem de uma
+        só varredura do autômato (mais o match semântico, se habilitado) e os
+        padrões de experiência/educação são pré-compilados.
+        
+        Args:
+            resume_text: Texto do currículo
+            
+        Returns:
+            ResumeFeatures consumido por todos os cálculos de score
+        """
+        normalized_text = normalize_for_matching(resume_text)
+        
+        skills, soft_skills = self._extract_skill_terms(normalized_text)
+        
+        return ResumeFeatures(
+            text=resume_text,
+            normalized_text=normalized_text,
+            skills=skills,
+            soft_skills=soft_skills,
+            experience=self._experience_from_normalized(normalized_text),
+            education=self._education_from_normalized(normalized_text)
+        )
+    
+    def encode_texts(self, texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
+        """
+        Gera embeddings normalizados para uma lista de textos em lotes
+        
+        Args:
+            texts: Textos a serem codificados
+            batch_size: Tamanho do lote (padrão: config['batch_size'])
+            
+        Returns:
+            Matriz (n_textos, dimensão) com embeddings de norma unitária
+        """
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
         
-        processed_text = self.preprocess_text(text)
-        words = word_tokenize(processed_text)
+        if batch_size is None:
+            batch_size = self.config.get('batch_size', Config.BATCH_SIZE)
         
-        found_soft_skills = []
-        for word in words:
-            if word in soft_skills and word not in found_soft_skills:
-                found_soft_skills.append(word)
+        if self.embedding_cache is None:
+            return self._encode_with_model(texts, batch_size)
         
-        return found_soft_skills
+        # Consultar o cache e codificar apenas os textos ausentes (sem repetição)
+        namespace = self._embedding_namespace()
+        cached = self.embedding_cache.get_many(namespace, texts)
+        if metrics.is_enabled():
+            misses = sum(emb is None for emb in cached)
+            metrics.observe_cache(len(texts) - misses, misses)
+        missing = list(dict.fromkeys(text for text, emb in zip(texts, cached) if emb is None))
+        
+        if missing:
+            new_embeddings = self._encode_with_model(missing, batch_size)
+            self.embedding_cache.set_many(namespace, missing, new_embeddings)
+            encoded = dict(zip(missing, new_embeddings))
+            cached = [emb if emb is not None else encoded[text] for text, emb in zip(texts, cached)]
+        
+        return np.vstack(cached).astype(np.float32, copy=False)
     
-    def calculate_semantic_similarity(self, text1: str, text2: str) -> float:
+    @metrics.timed('encode')
+    def _encode_with_model(self, texts: List[str], batch_size: int) -> np.ndarray:
+        """Executa o modelo de embedding sobre os textos, em lotes"""
+        metrics.observe_encode_batch(len(texts))
+        embeddings = self.model.encode(
+            texts,
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+        
+        return np.asarray(embeddings, dtype=np.float32)
+    
+    @metrics.timed('calculate_semantic_similarity')
+    def calculate_semantic_similarity(self, text1: str, text2: str, resume_id: Optional[str] = None) -> float:
         """
         Calcula a similaridade semântica entre dois textos
         
         Args:
-            text1: Primeiro texto
+            text1: Primeiro texto (ex: currículo)
             text2: Segundo texto
+            resume_id: Id de text1 no store de embeddings; se encontrado, text1 não é codificado
             
         Returns:
             Score de similaridade (0-1)
         """
         try:
-            # Gerar embeddings
-            embedding1 = self.model.encode(text1, convert_to_tensor=True)
-            embedding2 = self.model.encode(text2, convert_to_tensor=True)
+            stored = self.embedding_store.get(resume_id) if (
+                self.embedding_store is not None and resume_id is not None) else None
             
-            # Calcular similaridade cosseno
-            similarity = util.pytorch_cos_sim(embedding1, embedding2).item()
+            if stored is not None:
+                embeddings = [stored, self.encode_texts([text2])[0]]
+            else:
+                # Gerar os dois embeddings em uma única chamada
+                embeddings = self.encode_texts([text1, text2])
+            
+            # Calcular similaridade cosseno (embeddings já normalizados)
+            similarity = float(np.dot(embeddings[0], embeddings[1]))
             
             return max(0, similarity)  # Garantir que não seja negativo
             
         except Exception as e:
             logger.error(f"Erro ao calcular similaridade semântica: {str(e)}")
+            metrics.count_error('calculate_semantic_similarity')
             return 0.0
     
+    @metrics.timed('batch_semantic_similarity')
+    def batch_semantic_similarity(self, texts: List[str], reference_text: Union[str, JobProfile],
+                                  resume_ids: Optional[List] = None) -> np.ndarray:
+        """
+        Calcula a similaridade semântica de vários textos contra um texto de referência
+        
+        O texto de referência é codificado uma única vez e os demais em lotes;
+        todas as similaridades saem de um único produto matriz-vetor.
+        
+        Args:
+            texts: Textos a comparar (ex: currículos)
+            reference_text: Texto de referência (ex: descrição da vaga) ou JobProfile já codificado
+            resume_ids: Ids alinhados com `texts`; os presentes no store não são codificados
+            
+        Returns:
+            Vetor de scores de similaridade (0-1), um por texto
+        """
+        if not texts:
+            return np.zeros(0, dtype=np.float32)
+        
+        try:
+            if isinstance(reference_text, JobProfile):
+                reference_embedding = reference_text.embedding
+                if reference_embedding is None:
+                    return np.zeros(len(texts), dtype=np.float32)
+            else:
+                reference_embedding = self.encode_texts([reference_text])[0]
+            text_embeddings = self._resume_embeddings(texts, resume_ids)
+            
+            similarities = text_embeddings @ reference_embedding
+            
+            return np.maximum(similarities, 0.0)
+            
+        except ValueError:
+            # Erros de forma (store x modelo) não podem virar score semântico 0 em silêncio
+            raise
+        except Exception as e:
+            logger.error(f"Erro ao calcular similaridade semântica em lote: {str(e)}")
+            metrics.count_error('batch_semantic_similarity')
+            return np.zeros(len(texts), dtype=np.float32)
+    
+    @metrics.timed('calculate_skills_match')
     def calculate_skills_match(self, resume_skills: List[str], job_skills: List[str]) -> float:
         """
         Calcula o match de skills entre currículo e vaga
@@ -335,6 +712,25 @@ class SemanticEngine:
         
         return min(100, match_percentage + extra_skills_bonus)
     
+    @metrics.timed('batch_skills_match')
+    def batch_skills_match(self, skill_lists: List[List[str]], job_profile: JobProfile) -> np.ndarray:
+        """
+        Calcula o match de skills de vários currículos de uma vez (AND + popcount em bitsets)
+        
+        Args:
+            skill_lists: Skills extraídas de cada currículo
+            job_profile: Perfil da vaga gerado por build_job_profile
+            
+        Returns:
+            Vetor de scores de match de skills (0-100), um por currículo
+        """
+        job_mask = job_profile.skill_mask
+        if job_mask is None:
+            job_mask = self.skill_bitset.encode(job_profile.skills)
+        
+        return self.skill_bitset.skills_match(self.skill_bitset.encode_many(skill_lists), job_mask)
+    
+    @metrics.timed('calculate_experience_match')
     def calculate_experience_match(self, resume_exp: Dict, job_level: str) -> float:
         """
         Calcula o match de experiência
@@ -372,17 +768,39 @@ class SemanticEngine:
         else:
             return 25.0   # Distante
     
-    def calculate_education_match(self, resume_edu: Dict, job_requirements: str) -> float:
+    def extract_education_requirements(self, job_requirements: str) -> Dict[str, bool]:
+        """
+        Identifica os requisitos educacionais mencionados na vaga
+        
+        Args:
+            job_requirements: Requisitos da vaga
+            
+        Returns:
+            Dicionário indicando quais formações a vaga menciona
+        """
+        text = job_requirements.lower()
+        requirements = {level: level in text for level in ['graduação', 'bacharelado', 'mestrado', 'doutorado']}
+        requirements['mentions_education'] = any(requirements.values())
+        
+        return requirements
+    
+    @metrics.timed('calculate_education_match')
+    def calculate_education_match(self, resume_edu: Dict, job_requirements: Union[str, JobProfile]) -> float:
         """
         Calcula o match de educação
         
         Args:
             resume_edu: Informações de educação do currículo
-            job_requirements: Requisitos da vaga
+            job_requirements: Requisitos da vaga (texto ou JobProfile pré-processado)
             
         Returns:
             Score de match de educação (0-100)
         """
+        if isinstance(job_requirements, JobProfile):
+            requirements = job_requirements.education_requirements
+        else:
+            requirements = self.extract_education_requirements(job_requirements)
+        
         highest_level = resume_edu.get('highest_level', 'sem_formação')
         
         # Mapeamento de níveis educacionais
@@ -398,24 +816,25 @@ class SemanticEngine:
         base_score = education_scores.get(highest_level, 0)
         
         # Verificar se a vaga menciona requisitos educacionais específicos
-        if any(word in job_requirements.lower() for word in ['graduação', 'bacharelado', 'mestrado', 'doutorado']):
+        if requirements['mentions_education']:
             # Ajustar score baseado nos requisitos
-            if 'doutorado' in job_requirements.lower() and highest_level != 'doutorado':
+            if requirements['doutorado'] and highest_level != 'doutorado':
                 base_score *= 0.7
-            elif 'mestrado' in job_requirements.lower() and highest_level not in ['mestrado', 'doutorado']:
+            elif requirements['mestrado'] and highest_level not in ['mestrado', 'doutorado']:
                 base_score *= 0.8
-            elif 'graduação' in job_requirements.lower() and highest_level in ['sem_formação', 'técnico']:
+            elif requirements['graduação'] and highest_level in ['sem_formação', 'técnico']:
                 base_score *= 0.6
         
         return min(100, base_score)
     
-    def calculate_soft_skills_match(self, resume_soft_skills: List[str], job_description: str) -> float:
+    @metrics.timed('calculate_soft_skills_match')
+    def calculate_soft_skills_match(self, resume_soft_skills: List[str], job_description: Union[str, JobProfile]) -> float:
         """
         Calcula o match de soft skills
         
         Args:
             resume_soft_skills: Soft skills do currículo
-            job_description: Descrição da vaga
+            job_description: Descrição da vaga (texto ou JobProfile pré-processado)
             
         Returns:
             Score de match de soft skills (0-100)
@@ -424,7 +843,10 @@ class SemanticEngine:
             return 50.0  # Score neutro
         
         # Extrair soft skills da descrição da vaga
-        job_soft_skills = self.extract_soft_skills(job_description)
+        if isinstance(job_description, JobProfile):
+            job_soft_skills = job_description.soft_skills
+        else:
+            job_soft_skills = self.extract_soft_skills(job_description)
         
         if not job_soft_skills:
             return 50.0  # Score neutro se não há soft skills mencionadas
@@ -471,6 +893,8 @@ class SemanticEngine:
         
         return recommendations
     
+    @metrics.tracked('analyze_compatibility')
+    @profiling.profiled('analyze_compatibility', 'resume_text', 'job_description', 'job_level')
     def analyze_compatibility(self, resume_text: str, job_description: str, job_level: str = "Pleno") -> Dict[str, Any]:
         """
         Analisa a compatibilidade entre um currículo e uma vaga
@@ -480,91 +904,204 @@ class SemanticEngine:
             job_description: Descrição da vaga
             job_level: Nível da vaga
             
+        Returns:
+            Dicionário com resultados da análise
+        """
+        job_profile = self.build_job_profile(job_description, job_level)
+        return self.analyze_with_profile(resume_text, job_profile)
+    
+    @metrics.timed('job_profile')
+    def build_job_profile(self, job_description: str, job_level: str = "Pleno",
+                          with_embedding: bool = True) -> JobProfile:
+        """
+        Pré-processa a vaga uma única vez (skills, soft skills, educação e embedding)
+        
+        Args:
+            job_description: Descrição da vaga
+            job_level: Nível da vaga
+            with_embedding: Se o embedding da vaga deve ser gerado
+            
+        Returns:
+            JobProfile reutilizável para qualquer número de currículos
+        """
+        embedding = None
+        if with_embedding:
+            try:
+                embedding = self.encode_texts([job_description])[0]
+            except Exception as e:
+                logger.error(f"Erro ao gerar embedding da vaga: {str(e)}")
+                metrics.count_error('job_profile')
+        
+        job_skills, job_soft_skills = self._extract_skill_terms(normalize_for_matching(job_description))
+        
+        return JobProfile(
+            description=job_description,
+            level=job_level,
+            skills=job_skills,
+            soft_skills=job_soft_skills,
+            education_requirements=self.extract_education_requirements(job_description),
+            embedding=embedding,
+            skill_mask=self.skill_bitset.encode(job_skills)
+        )
+    
+    @metrics.tracked('analyze_with_profile')
+    @profiling.profiled('analyze_with_profile', 'resume', 'job_profile')
+    def analyze_with_profile(self, resume: Union[str, ResumeFeatures], job_profile: JobProfile,
+                             semantic_similarity: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Analisa a compatibilidade de um currículo contra uma vaga já pré-processada
+        
+        Args:
+            resume: Texto do currículo ou ResumeFeatures já extraído
+            job_profile: Perfil da vaga gerado por build_job_profile
+            semantic_similarity: Similaridade (0-1) já calculada; se omitida, o currículo é codificado
+            
         Returns:
             Dicionário com resultados da análise
         """
         try:
             logger.info("Iniciando análise de compatibilidade...")
             
-            # Extrair informações do currículo
-            resume_skills = self.extract_skills(resume_text)
-            resume_experience = self.extract_experience_info(resume_text)
-            resume_education = self.extract_education_info(resume_text)
-            resume_soft_skills = self.extract_soft_skills(resume_text)
-            
-            # Extrair skills da vaga
-            job_skills = self.extract_skills(job_description)
-            
-            # Calcular scores individuais
-            semantic_similarity = self.calculate_semantic_similarity(resume_text, job_description) * 100
-            skills_match = self.calculate_skills_match(resume_skills, job_skills)
-            experience_match = self.calculate_experience_match(resume_experience, job_level)
-            education_match = self.calculate_education_match(resume_education, job_description)
-            soft_skills_match = self.calculate_soft_skills_match(resume_soft_skills, job_description)
-            
-            # Calcular score geral ponderado
-            weights = self.config['weights']
-            overall_score = (
-                semantic_similarity * weights['semantic'] +
-                skills_match * weights['skills'] +
-                experience_match * weights['experience'] +
-                education_match * weights['education'] +
-                soft_skills_match * weights['soft_skills']
-            )
+            if isinstance(resume, ResumeFeatures):
+                features = resume
+            else:
+                features = self.extract_resume_features(resume)
             
-            # Gerar pontos fortes e fracos
-            strengths = []
-            weaknesses = []
-            
-            if semantic_similarity >= 70:
-                strengths.append("Alta compatibilidade semântica com a descrição da vaga")
-            elif semantic_similarity < 40:
-                weaknesses.append("Baixa compatibilidade semântica com a descrição da vaga")
-            
-            if skills_match >= 70:
-                strengths.append("Excelente match de skills técnicas")
-            elif skills_match < 40:
-                weaknesses.append("Skills técnicas não atendem aos requisitos")
-            
-            if experience_match >= 70:
-                strengths.append("Nível de experiência adequado para a posição")
-            elif experience_match < 40:
-                weaknesses.append("Nível de experiência pode não ser adequado")
-            
-            # Gerar recomendações
-            recommendations = self.generate_recommendations({
-                'overall_score': overall_score,
-                'skills_match': skills_match,
-                'experience_match': experience_match,
-                'education_match': education_match
-            })
-            
-            results = {
-                'overall_score': overall_score,
-                'semantic_similarity': semantic_similarity,
-                'skills_match': skills_match,
-                'experience_match': experience_match,
-                'education_match': education_match,
-                'soft_skills_match': soft_skills_match,
-                'resume_skills': resume_skills,
-                'job_skills': job_skills,
-                'resume_experience': resume_experience,
-                'resume_education': resume_education,
-                'resume_soft_skills': resume_soft_skills,
-                'strengths': strengths,
-                'weaknesses': weaknesses,
-                'recommendations': recommendations,
-                'analysis_timestamp': pd.Timestamp.now().isoformat()
-            }
+            if semantic_similarity is None:
+                semantic_similarity = float(self.batch_semantic_similarity([features.text], job_profile)[0])
+            
+            results = self._build_analysis(features, job_profile, max(0.0, semantic_similarity) * 100)
             
-            logger.info(f"Análise concluída. Score geral: {overall_score:.1f}%")
+            logger.info(f"Análise concluída. Score geral: {results['overall_score']:.1f}%")
             return results
             
         except Exception as e:
             logger.error(f"Erro na análise de compatibilidade: {str(e)}")
             raise
     
-    def batch_analyze(self, resumes: List[Dict], job_description: str, job_level: str = "Pleno") -> List[Dict]:
+    def _lexical_scores(self, features: ResumeFeatures, job_profile: JobProfile,
+                        skills_match: Optional[float] = None) -> Dict[str, float]:
+        """
+        Calcula os scores que não dependem do modelo de embedding
+        
+        Args:
+            features: Características extraídas do currículo
+            job_profile: Perfil pré-processado da vaga
+            skills_match: Match de skills já calculado em lote (opcional)
+            
+        Returns:
+            Dicionário com skills_match, experience_match, education_match e soft_skills_match
+        """
+        if skills_match is None:
+            skills_match = self.calculate_skills_match(features.skills, job_profile.skills)
+        
+        return {
+            'skills_match': float(skills_match),
+            'experience_match': self.calculate_experience_match(features.experience, job_profile.level),
+            'education_match': self.calculate_education_match(features.education, job_profile),
+            'soft_skills_match': self.calculate_soft_skills_match(features.soft_skills, job_profile)
+        }
+    
+    def _weighted_lexical_score(self, lexical_scores: Dict[str, float]) -> float:
+        """Parte do score geral vinda dos scores léxicos (sem o termo semântico)"""
+        weights = self.config['weights']
+        return (
+            lexical_scores['skills_match'] * weights['skills'] +
+            lexical_scores['experience_match'] * weights['experience'] +
+            lexical_scores['education_match'] * weights['education'] +
+            lexical_scores['soft_skills_match'] * weights['soft_skills']
+        )
+    
+    def _build_analysis(self, features: ResumeFeatures, job_profile: JobProfile,
+                        semantic_similarity: float,
+                        lexical_scores: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """
+        Monta o resultado da análise a partir de uma similaridade semântica já calculada
+        
+        Args:
+            features: Características extraídas do currículo
+            job_profile: Perfil pré-processado da vaga
+            semantic_similarity: Similaridade semântica (0-100)
+            lexical_scores: Scores léxicos já calculados por _lexical_scores (opcional)
+            
+        Returns:
+            Dicionário com resultados da análise
+        """
+        # Informações do currículo (extraídas em uma única passada)
+        resume_skills = features.skills
+        resume_experience = features.experience
+        resume_education = features.education
+        resume_soft_skills = features.soft_skills
+        
+        # Skills da vaga já extraídas no JobProfile
+        job_skills = job_profile.skills
+        
+        # Calcular scores individuais
+        if lexical_scores is None:
+            lexical_scores = self._lexical_scores(features, job_profile)
+        skills_match = lexical_scores['skills_match']
+        experience_match = lexical_scores['experience_match']
+        education_match = lexical_scores['education_match']
+        soft_skills_match = lexical_scores['soft_skills_match']
+        
+        # Calcular score geral ponderado
+        overall_score = (
+            semantic_similarity * self.config['weights']['semantic'] +
+            self._weighted_lexical_score(lexical_scores)
+        )
+        
+        # Gerar pontos fortes e fracos
+        strengths = []
+        weaknesses = []
+        
+        if semantic_similarity >= 70:
+            strengths.append("Alta compatibilidade semântica com a descrição da vaga")
+        elif semantic_similarity < 40:
+            weaknesses.append("Baixa compatibilidade semântica com a descrição da vaga")
+        
+        if skills_match >= 70:
+            strengths.append("Excelente match de skills técnicas")
+        elif skills_match < 40:
+            weaknesses.append("Skills técnicas não atendem aos requisitos")
+        
+        if experience_match >= 70:
+            strengths.append("Nível de experiência adequado para a posição")
+        elif experience_match < 40:
+            weaknesses.append("Nível de experiência pode não ser adequado")
+        
+        # Gerar recomendações
+        recommendations = self.generate_recommendations({
+            'overall_score': overall_score,
+            'skills_match': skills_match,
+            'experience_match': experience_match,
+            'education_match': education_match
+        })
+        
+        results = {
+            'overall_score': overall_score,
+            'semantic_similarity': semantic_similarity,
+            'skills_match': skills_match,
+            'experience_match': experience_match,
+            'education_match': education_match,
+            'soft_skills_match': soft_skills_match,
+            'resume_skills': list(resume_skills),
+            'job_skills': list(job_skills),
+            'resume_experience': dict(resume_experience),
+            'resume_education': dict(resume_education),
+            'resume_soft_skills': list(resume_soft_skills),
+            'strengths': strengths,
+            'weaknesses': weaknesses,
+            'recommendations': recommendations,
+            'analysis_timestamp': datetime.now().isoformat()
+        }
+        
+        return results
+    
+    @metrics.tracked('batch_analyze')
+    @profiling.profiled('batch_analyze', 'resumes', 'job_description', 'job_level')
+    def batch_analyze(self, resumes: List[Dict], job_description: str, job_level: str = "Pleno",
+                      top_k: Optional[int] = None,
+                      progress_callback: Optional[Callable[[int, Optional[int]], None]] = None) -> List[Dict]:
         """
         Analisa múltiplos currículos contra uma vaga
         
@@ -572,33 +1109,251 @@ class SemanticEngine:
             resumes: Lista de currículos (cada um com 'text' e 'filename')
             job_description: Descrição da vaga
             job_level: Nível da vaga
+            top_k: Se informado, mantém apenas os k melhores em um heap (memória limitada)
+            progress_callback: Chamado com (processados, total) a cada lote concluído
+            
+        Returns:
+            Lista de resultados ordenados por score
+            
+        Raises:
+            ValueError: Se top_k for menor que 1
+        """
+        if top_k is not None and top_k < 1:
+            raise ValueError(f"top_k deve ser pelo menos 1 (recebido: {top_k})")
+        
+        if top_k is None and progress_callback is None:
+            # Vaga processada uma vez e currículos codificados em lotes de config['batch_size']
+            job_profile = self.build_job_profile(job_description, job_level)
+            results = self.score_candidates(resumes, job_profile)
+        else:
+            stream = self.iter_batch_analyze(resumes, job_description, job_level, progress_callback)
+            if top_k is None:
+                results = list(stream)
+                results.sort(key=lambda x: x.get('overall_score', 0), reverse=True)
+            else:
+                results = self._top_k(stream, top_k)
+        
+        logger.info(f"Análise em lote concluída para {len(results)} currículos")
+        return results
+    
+    def iter_batch_analyze(self, resumes: Iterable[Dict], job_description: str, job_level: str = "Pleno",
+                           progress_callback: Optional[Callable[[int, Optional[int]], None]] = None,
+                           chunk_size: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Versão em streaming de batch_analyze: produz os resultados à medida que
+        cada lote é concluído, sem manter todos em memória
+        
+        Args:
+            resumes: Currículos (lista ou qualquer iterável, inclusive geradores)
+            job_description: Descrição da vaga
+            job_level: Nível da vaga
+            progress_callback: Chamado com (processados, total) após cada lote;
+                total é None quando `resumes` não tem tamanho conhecido
+            chunk_size: Currículos por lote (padrão: config['batch_size'])
+            
+        Yields:
+            Resultados na ordem de entrada (não ordenados por score)
+        """
+        job_profile = self.build_job_profile(job_description, job_level)
+        chunk_size = chunk_size or self.config.get('batch_size', Config.BATCH_SIZE)
+        total = len(resumes) if isinstance(resumes, Sized) else None
+        
+        processed = 0
+        iterator = iter(resumes)
+        while True:
+            chunk = list(itertools.islice(iterator, chunk_size))
+            if not chunk:
+                break
+            
+            yield from self._score_resumes(chunk, job_profile)
+            
+            processed += len(chunk)
+            if progress_callback is not None:
+                progress_callback(processed, total)
+    
+    @staticmethod
+    def _push_top_k(heap: List[Tuple[float, int, Dict]], k: int, position: int, result: Dict):
+        """
+        Insere um resultado no heap dos k maiores scores
+        
+        Empates preservam a ordem de entrada, como na ordenação estável de score_candidates.
+        """
+        item = (result.get('overall_score', 0), -position, result)
+        if len(heap) < k:
+            heapq.heappush(heap, item)
+        elif item[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, item)
+    
+    @staticmethod
+    def _sorted_heap(heap: List[Tuple[float, int, Dict]]) -> List[Dict]:
+        """Resultados do heap em ordem decrescente de score"""
+        return [result for _, _, result in sorted(heap, key=lambda item: item[:2], reverse=True)]
+    
+    def _top_k(self, results: Iterable[Dict], k: int) -> List[Dict]:
+        """Mantém os k resultados de maior score com um heap de tamanho k"""
+        heap: List[Tuple[float, int, Dict]] = []
+        
+        for position, result in enumerate(results):
+            self._push_top_k(heap, k, position, result)
+        
+        return self._sorted_heap(heap)
+    
+    @metrics.tracked('cascade_analyze')
+    @profiling.profiled('cascade_analyze', 'resumes', 'job_description', 'job_level')
+    def cascade_analyze(self, resumes: List[Dict], job_description: str, job_level: str = "Pleno",
+                        k: int = 10, chunk_size: Optional[int] = None) -> List[Dict]:
+        """
+        Top-k em cascata: scores léxicos primeiro, embedding só para quem ainda pode entrar no top-k
+        
+        Como a similaridade semântica vale no máximo 100, o score geral de cada
+        currículo é limitado por (score léxico ponderado + 100 * peso semântico).
+        Os currículos são codificados em ordem decrescente desse limite e o
+        processo para quando o limite do próximo não supera o k-ésimo melhor score.
+        O resultado é idêntico ao top-k de batch_analyze.
+        
+        Args:
+            resumes: Lista de currículos (cada um com 'text' e 'filename')
+            job_description: Descrição da vaga
+            job_level: Nível da vaga
+            k: Número de currículos retornados
+            chunk_size: Currículos codificados por vez (padrão: config['batch_size'])
+            
+        Returns:
+            Os k melhores resultados ordenados por score
+            
+        Raises:
+            ValueError: Se k for menor que 1
+        """
+        if k < 1:
+            raise ValueError(f"k deve ser pelo menos 1 (recebido: {k})")
+        
+        job_profile = self.build_job_profile(job_description, job_level)
+        chunk_size = chunk_size or self.config.get('batch_size', Config.BATCH_SIZE)
+        semantic_weight = self.config['weights']['semantic']
+        heap: List[Tuple[float, int, Dict]] = []
+        
+        # Etapa 1: extração de todos os currículos
+        extracted = []
+        for position, resume in enumerate(resumes):
+            try:
+                extracted.append((position, self.extract_resume_features(resume['text'])))
+            except Exception as e:
+                logger.error(f"Erro ao analisar {resume.get('filename', 'unknown')}: {str(e)}")
+                metrics.count_error('analyze_resume')
+                error_result = {
+                    'filename': resume.get('filename', 'unknown'),
+                    'overall_score': 0,
+                    'error': str(e)
+                }
+                if 'id' in resume:
+                    error_result['id'] = resume['id']
+                self._push_top_k(heap, k, position, error_result)
+        
+        # Scores léxicos (match de skills do pool inteiro em uma operação) e limite superior
+        skills_scores = self.batch_skills_match([features.skills for _, features in extracted], job_profile)
+        candidates = []
+        for (position, features), skills_match in zip(extracted, skills_scores):
+            lexical_scores = self._lexical_scores(features, job_profile, skills_match)
+            upper_bound = self._weighted_lexical_score(lexical_scores) + 100 * semantic_weight
+            candidates.append((upper_bound, position, features, lexical_scores))
+        
+        candidates.sort(key=lambda item: (-item[0], item[1]))
+        
+        # Etapa 2: embedding apenas enquanto o limite superior ainda supera o k-ésimo score
+        encoded = 0
+        for start in range(0, len(candidates), chunk_size):
+            if len(heap) >= k and candidates[start][0] < heap[0][0]:
+                break
+            
+            chunk = candidates[start:start + chunk_size]
+            similarities = self.batch_semantic_similarity([features.text for _, _, features, _ in chunk], job_profile)
+            encoded += len(chunk)
+            
+            for (_, position, features, lexical_scores), similarity in zip(chunk, similarities):
+                analysis = self._build_analysis(features, job_profile, float(similarity) * 100, lexical_scores)
+                resume = resumes[position]
+                analysis['filename'] = resume['filename']
+                if 'id' in resume:
+                    analysis['id'] = resume['id']
+                self._push_top_k(heap, k, position, analysis)
+        
+        logger.info(f"Cascata concluída: {encoded} de {len(candidates)} currículos codificados")
+        return self._sorted_heap(heap)
+    
+    @metrics.tracked('score_candidates')
+    @profiling.profiled('score_candidates', 'resumes', 'job_profile')
+    def score_candidates(self, resumes: List[Dict], job_profile: JobProfile,
+                         semantic_scores: Optional[np.ndarray] = None) -> List[Dict]:
+        """
+        Pontua currículos contra uma vaga pré-processada e ordena por score geral
+        
+        Args:
+            resumes: Lista de currículos (cada um com 'text' e 'filename')
+            job_profile: Perfil da vaga gerado por build_job_profile
+            semantic_scores: Similaridades (0-1) já calculadas, alinhadas com `resumes`;
+                se omitido, os currículos são codificados em lote
             
         Returns:
             Lista de resultados ordenados por score
         """
+        results = self._score_resumes(resumes, job_profile, semantic_scores)
+        
+        # Ordenar por score geral
+        results.sort(key=lambda x: x.get('overall_score', 0), reverse=True)
+        
+        return results
+    
+    def _score_resumes(self, resumes: List[Dict], job_profile: JobProfile,
+                       semantic_scores: Optional[np.ndarray] = None) -> List[Dict]:
+        """Pontua currículos na ordem de entrada; falhas viram resultados com 'error'"""
         results = []
         
+        if semantic_scores is None:
+            texts = [resume.get('text') or '' for resume in resumes]
+            resume_ids = [resume.get('id') for resume in resumes] if self.embedding_store is not None else None
+            semantic_scores = self.batch_semantic_similarity(texts, job_profile, resume_ids)
+        
+        # Extração de todos os currículos; falhas viram resultados com 'error' abaixo
+        extracted: List[Union[ResumeFeatures, Exception]] = []
         for resume in resumes:
             try:
-                analysis = self.analyze_compatibility(
-                    resume['text'],
-                    job_description,
-                    job_level
+                extracted.append(self.extract_resume_features(resume['text']))
+            except Exception as e:
+                extracted.append(e)
+        
+        # Match de skills do lote inteiro em uma operação (bitsets)
+        valid = [features for features in extracted if isinstance(features, ResumeFeatures)]
+        skills_scores = iter(self.batch_skills_match([features.skills for features in valid], job_profile)
+                             if valid else [])
+        
+        for resume, features, semantic_similarity in zip(resumes, extracted, semantic_scores):
+            try:
+                if isinstance(features, Exception):
+                    raise features
+                
+                analysis = self._build_analysis(
+                    features,
+                    job_profile,
+                    float(semantic_similarity) * 100,
+                    self._lexical_scores(features, job_profile, next(skills_scores))
                 )
                 
                 analysis['filename'] = resume['filename']
+                if 'id' in resume:
+                    analysis['id'] = resume['id']
                 results.append(analysis)
                 
             except Exception as e:
                 logger.error(f"Erro ao analisar {resume.get('filename', 'unknown')}: {str(e)}")
-                results.append({
+                metrics.count_error('analyze_resume')
+                error_result = {
                     'filename': resume.get('filename', 'unknown'),
                     'overall_score': 0,
                     'error': str(e)
-                })
-        
-        # Ordenar por score geral
-        results.sort(key=lambda x: x.get('overall_score', 0), reverse=True)
+                }
+                if 'id' in resume:
+                    error_result['id'] = resume['id']
+                results.append(error_result)
         
         return results
     
@@ -610,4 +1365,13 @@ class SemanticEngine:
             new_config: Nova configuração
         """
         self.config.update(new_config)
+        
+        # Reabrir cache/store se a configuração deles mudou (ex: workers de parallel_scoring, benchmark)
+        if 'cache' in new_config:
+            self._initialize_cache()
+        if 'embedding_store' in new_config:
+            self._initialize_embedding_store()
+        if 'profiling' in new_config:
+            self.profiler = profiling.Profiler(self.config['profiling'])
+        
         logger.info("Configuração atualizada") 
\ No newline at end of file
@@ -0,0 +1,799 @@
+"""
+Índice de candidatos distribuído em shards com busca scatter-gather
+
+Cada shard é um CandidateIndex completo (embeddings + currículos) servido por
+um processo próprio em um socket local (multiprocessing.connection), na mesma
+máquina ou em outro nó. O coordenador constrói o perfil da vaga uma única vez,
+envia-o a todos os shards, recebe o top-k já pontuado de cada um e junta as
+listas pela mesma ordenação de batch_analyze (overall_score decrescente).
+
+Com shortlist_size maior ou igual ao tamanho de cada shard, o resultado é o
+mesmo de batch_analyze sobre o corpus inteiro. O coordenador mantém o mapa
+id -> shard, distribui novos currículos para o shard menor e rebalanceia movendo
+currículos com seus embeddings (sem recodificá-los).
+
+Execução de um shard em outro nó (fora do loopback a chave é obrigatória:
+multiprocessing.connection desserializa com pickle tudo o que recebe):
+    SHARD_AUTHKEY=<chave> python sharded_index.py --host 0.0.0.0 --port 9100 --index-dir index/shard0
+"""
+
+import heapq
+import ipaddress
+import multiprocessing
+import os
+import threading
+import time
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Dict, List, Any, Optional, Tuple
+import logging
+
+import numpy as np
+
+from candidate_index import CandidateIndex
+from compaction import BackgroundCompactor
+from config import get_config
+from parallel_scoring import create_worker_engine
+from semantic_engine import SemanticEngine, JobProfile
+
+logger = logging.getLogger(__name__)
+
+# Comandos que alteram o índice são executados um de cada vez em cada shard
+WRITE_COMMANDS = {'add', 'update', 'delete', 'compact', 'save'}
+
+def _is_loopback(host: str) -> bool:
+    """Se o endereço de escuta só é acessível pela própria máquina"""
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+class ShardServer:
+    """
+    Servidor de um shard: atende comandos do coordenador sobre um CandidateIndex
+    """
+
+    def __init__(self, index: CandidateIndex, address: Optional[Tuple[str, int]] = None,
+                 authkey: Optional[bytes] = None, index_dir: Optional[str] = None):
+        """
+        Abre o socket do shard
+
+        Args:
+            index: Índice de candidatos deste shard
+            address: (host, porta) de escuta (padrão: Config.SHARD_HOST, porta livre)
+            authkey: Chave compartilhada com o coordenador (padrão: Config.SHARD_AUTHKEY)
+            index_dir: Diretório usado por save() quando o coordenador não informa outro
+
+        Raises:
+            ValueError: Se o host não é de loopback e não há authkey
+        """
+        shard_config = get_config().get_shard_config()
+        self.index = index
+        self.index_dir = index_dir
+        self.authkey = authkey if authkey is not None else shard_config['authkey']
+        address = address or (shard_config['host'], 0)
+        if not self.authkey and not _is_loopback(address[0]):
+            raise ValueError(
+                f"Shard em {address[0]} exige SHARD_AUTHKEY: sem chave, qualquer cliente "
+                f"da rede executaria código no processo do shard"
+            )
+        self.listener = Listener(address, authkey=self.authkey)
+        self.address = self.listener.address
+
+        self._write_lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    def serve_forever(self):
+        """Aceita conexões até receber 'shutdown' (uma thread por conexão)"""
+        logger.info(f"Shard {os.getpid()} atendendo em {self.address} ({len(self.index)} currículos)")
+
+        while not self._stop_event.is_set():
+            try:
+                connection = self.listener.accept()
+            except (OSError, EOFError, multiprocessing.AuthenticationError) as e:
+                if self._stop_event.is_set():
+                    break
+                logger.error(f"Erro ao aceitar conexão no shard: {str(e)}")
+                continue
+
+            if self._stop_event.is_set():
+                connection.close()
+                break
+
+            threading.Thread(target=self._serve_connection, args=(connection,), daemon=True).start()
+
+        self.listener.close()
+
+    def shutdown(self):
+        """Interrompe serve_forever"""
+        self._stop_event.set()
+        try:
+            # Desbloqueia o accept() pendente
+            Client(self.address, authkey=self.authkey).close()
+        except OSError:
+            pass
+
+    def _serve_connection(self, connection: Connection):
+        """Atende os comandos de uma conexão até ela ser fechada"""
+        with connection:
+            while True:
+                try:
+                    command, args = connection.recv()
+                except (EOFError, OSError):
+                    return
+
+                try:
+                    if command in WRITE_COMMANDS:
+                        with self._write_lock:
+                            result = self.handle(command, args)
+                    else:
+                        result = self.handle(command, args)
+                    response = ('ok', result)
+                except Exception as e:
+                    logger.error(f"Erro no shard ao executar '{command}': {str(e)}")
+                    response = ('error', str(e) or type(e).__name__)
+
+                try:
+                    connection.send(response)
+                except OSError:
+                    # O coordenador descartou a conexão (ex: após um timeout)
+                    pass
+
+                if command == 'shutdown':
+                    self.shutdown()
+                    return
+
+    def handle(self, command: str, args: Tuple) -> Any:
+        """
+        Executa um comando no índice local
+
+        Args:
+            command: Nome do comando
+            args: Argumentos do comando
+
+        Returns:
+            Resultado serializável do comando
+        """
+        index = self.index
+
+        if command == 'rank':
+            return index.rank_profile(*args)
+        if command == 'search':
+            return index.vector_index.search(*args)
+        if command == 'add':
+            return index.add_resumes(*args)
+        if command == 'update':
+            return index.update_resumes(*args)
+        if command == 'delete':
+            return index.delete_resumes(*args)
+        if command == 'export':
+            return index.export_resumes(*args)
+        if command == 'ids':
+            with self._write_lock:
+                return list(index.resumes)
+        if command == 'stats':
+            return {'size': len(index), 'tombstone_ratio': index.tombstone_ratio, 'pid': os.getpid()}
+        if command == 'compact':
+            return index.compact()
+        if command == 'save':
+            directory = args[0] if args and args[0] else self.index_dir
+            if not directory:
+                raise ValueError("Shard sem diretório de índice configurado")
+            return index.save(directory)
+        if command in ('ping', 'shutdown'):
+            return None
+
+        raise ValueError(f"Comando desconhecido: {command}")
+
+def run_shard_server(model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+                     index_dir: Optional[str] = None, engine_config: Optional[Dict[str, Any]] = None,
+                     threads: int = 1, address: Optional[Tuple[str, int]] = None,
+                     authkey: Optional[bytes] = None, ready: Optional[Connection] = None):
+    """
+    Carrega o modelo e o índice do shard e atende o coordenador (bloqueante)
+
+    Args:
+        model_name: Nome do modelo de embedding (o mesmo do coordenador)
+        index_dir: Diretório do índice do shard (carregado se existir)
+        engine_config: Configuração aplicada ao motor (ex: pesos)
+        threads: Threads do torch neste processo
+        address: (host, porta) de escuta
+        authkey: Chave compartilhada com o coordenador
+        ready: Conexão pela qual o endereço de escuta é informado ao processo pai
+    """
+    engine = create_worker_engine(model_name, threads, engine_config)
+
+    if index_dir and os.path.exists(os.path.join(index_dir, 'resumes.json')):
+        index = CandidateIndex.load(engine, index_dir)
+    else:
+        index = CandidateIndex(engine)
+
+    server = ShardServer(index, address, authkey, index_dir)
+    if ready is not None:
+        ready.send(server.address)
+        ready.close()
+
+    with BackgroundCompactor([index]):
+        server.serve_forever()
+
+class ShardedCandidateIndex:
+    """
+    Coordenador: distribui currículos entre shards e junta os rankings
+    """
+
+    def __init__(self, engine: SemanticEngine, addresses: List[Tuple[str, int]],
+                 authkey: Optional[bytes] = None, timeout_seconds: Optional[float] = None):
+        """
+        Conecta aos shards e reconstrói o mapa id -> shard
+
+        Args:
+            engine: Motor semântico usado para construir o perfil da vaga
+            addresses: Endereços (host, porta) dos shards
+            authkey: Chave compartilhada com os shards (padrão: Config.SHARD_AUTHKEY)
+            timeout_seconds: Tempo máximo de resposta de um shard (padrão: Config.SHARD_TIMEOUT_SECONDS)
+        """
+        shard_config = get_config().get_shard_config()
+        self.engine = engine
+        self.authkey = authkey if authkey is not None else shard_config['authkey']
+        self.timeout_seconds = timeout_seconds or shard_config['timeout_seconds']
+
+        self.addresses: List[Tuple[str, int]] = []
+        self.connections: List[Connection] = []
+        self.placement: Dict[str, int] = {}
+        self._lock = threading.RLock()
+
+        for address in addresses:
+            self.addresses.append(address)
+            self.connections.append(Client(address, authkey=self.authkey))
+
+        self.refresh_placement()
+
+    def __len__(self) -> int:
+        return len(self.placement)
+
+    def __enter__(self) -> 'ShardedCandidateIndex':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def num_shards(self) -> int:
+        return len(self.connections)
+
+    def shard_sizes(self) -> List[int]:
+        """Número de currículos em cada shard"""
+        sizes = [0] * self.num_shards
+        for shard in self.placement.values():
+            sizes[shard] += 1
+        return sizes
+
+    def _scatter(self, requests: Dict[int, Tuple[str, Tuple]]) -> Dict[int, Any]:
+        """
+        Envia um comando a cada shard e só então aguarda as respostas (em paralelo)
+
+        Um shard que não responde dentro do prazo (ou cuja conexão falha) tem a
+        conexão fechada e reaberta: a resposta ainda pendente chegaria como
+        resposta do próximo comando. Os erros de todos os shards são reunidos
+        antes de levantar a exceção.
+
+        Args:
+            requests: shard -> (comando, argumentos)
+
+        Returns:
+            shard -> resultado
+
+        Raises:
+            RuntimeError: Se algum shard falhou ou não respondeu
+        """
+        with self._lock:
+            results = {}
+            errors = []
+
+            sent = []
+            for shard, request in requests.items():
+                try:
+                    self.connections[shard].send(request)
+                    sent.append(shard)
+                except (OSError, ValueError) as e:
+                    errors.append(f"shard {shard} ({self.addresses[shard]}): {str(e) or type(e).__name__}")
+                    self._reconnect(shard)
+
+            deadline = time.monotonic() + self.timeout_seconds
+            for shard in sent:
+                connection = self.connections[shard]
+                try:
+                    if not connection.poll(max(0.0, deadline - time.monotonic())):
+                        raise TimeoutError(f"sem resposta em {self.timeout_seconds}s")
+                    status, result = connection.recv()
+                except (OSError, EOFError, TimeoutError) as e:
+                    errors.append(f"shard {shard} ({self.addresses[shard]}): {str(e) or type(e).__name__}")
+                    self._reconnect(shard)
+                    continue
+
+                if status == 'ok':
+                    results[shard] = result
+                else:
+                    errors.append(f"shard {shard}: {result}")
+
+        if errors:
+            raise RuntimeError(f"Erro nos shards: {'; '.join(errors)}")
+        return results
+
+    def _reconnect(self, shard: int):
+        """Descarta a conexão (e respostas pendentes) de um shard e abre outra"""
+        self.connections[shard].close()
+        try:
+            self.connections[shard] = Client(self.addresses[shard], authkey=self.authkey)
+        except (OSError, multiprocessing.AuthenticationError) as e:
+            # A conexão fechada faz o próximo comando falhar (e tentar de novo)
+            logger.error(f"Erro ao reconectar ao shard {self.addresses[shard]}: {str(e)}")
+
+    def _broadcast(self, command: str, *args) -> Dict[int, Any]:
+        """Envia o mesmo comando a todos os shards"""
+        return self._scatter({shard: (command, args) for shard in range(self.num_shards)})
+
+    def refresh_placement(self):
+        """
+        Reconstrói o mapa id -> shard consultando os shards
+
+        Um id presente em mais de um shard (rebalanceamento interrompido) é
+        mantido no primeiro e removido dos demais.
+        """
+        placement: Dict[str, int] = {}
+        duplicates: Dict[int, List[str]] = {}
+
+        for shard, ids in sorted(self._broadcast('ids').items()):
+            for item_id in ids:
+                if item_id in placement:
+                    duplicates.setdefault(shard, []).append(item_id)
+                else:
+                    placement[item_id] = shard
+
+        if duplicates:
+            logger.info(f"Removendo {sum(map(len, duplicates.values()))} currículos duplicados entre shards")
+            self._scatter({shard: ('delete', (ids,)) for shard, ids in duplicates.items()})
+
+        self.placement = placement
+
+    def _place(self, ids: List[str]) -> Dict[int, List[int]]:
+        """Escolhe o shard de cada novo id (sempre o menor) e retorna shard -> posições"""
+        sizes = self.shard_sizes()
+        heap = [(size, shard) for shard, size in enumerate(sizes)]
+        heapq.heapify(heap)
+
+        positions: Dict[int, List[int]] = {}
+        for position in range(len(ids)):
+            size, shard = heapq.heappop(heap)
+            positions.setdefault(shard, []).append(position)
+            heapq.heappush(heap, (size + 1, shard))
+
+        return positions
+
+    def add_resumes(self, resumes: List[Dict[str, Any]]):
+        """
+        Distribui e indexa novos currículos (cada shard codifica a sua parte)
+
+        Args:
+            resumes: Lista de currículos (cada um com 'id' e 'text'; 'filename' opcional)
+        """
+        if not resumes:
+            return
+
+        ids = [str(resume['id']) for resume in resumes]
+        for item_id in ids:
+            if item_id in self.placement:
+                raise ValueError(f"Id duplicado no índice: {item_id}")
+
+        with self._lock:
+            positions = self._place(ids)
+            self._scatter({
+                shard: ('add', ([resumes[position] for position in shard_positions],))
+                for shard, shard_positions in positions.items()
+            })
+            for shard, shard_positions in positions.items():
+                for position in shard_positions:
+                    self.placement[ids[position]] = shard
+
+        logger.info(f"{len(ids)} currículos distribuídos em {len(positions)} shards (total: {len(self)})")
+
+    def update_resumes(self, resumes: List[Dict[str, Any]]):
+        """
+        Reindexa currículos alterados no shard onde estão (novos ids são distribuídos)
+
+        Args:
+            resumes: Lista de currículos (cada um com 'id' e 'text'; 'filename' opcional)
+        """
+        existing: Dict[int, List[Dict[str, Any]]] = {}
+        new = []
+        for resume in resumes:
+            shard = self.placement.get(str(resume['id']))
+            if shard is None:
+                new.append(resume)
+            else:
+                existing.setdefault(shard, []).append(resume)
+
+        if existing:
+            self._scatter({shard: ('update', (shard_resumes,)) for shard, shard_resumes in existing.items()})
+        self.add_resumes(new)
+
+    def delete_resumes(self, ids: List[Any]) -> int:
+        """
+        Remove currículos dos seus shards
+
+        Args:
+            ids: Identificadores dos currículos
+
+        Returns:
+            Número de currículos removidos
+        """
+        by_shard: Dict[int, List[str]] = {}
+        for item_id in map(str, ids):
+            shard = self.placement.get(item_id)
+            if shard is not None:
+                by_shard.setdefault(shard, []).append(item_id)
+
+        with self._lock:
+            removed = self._scatter({shard: ('delete', (shard_ids,)) for shard, shard_ids in by_shard.items()})
+            for shard_ids in by_shard.values():
+                for item_id in shard_ids:
+                    self.placement.pop(item_id, None)
+
+        return sum(removed.values())
+
+    def search(self, job: Any, k: int = 50) -> List[Tuple[str, float]]:
+        """
+        Recupera os k currículos mais próximos da vaga apenas por embedding
+
+        Args:
+            job: Texto da vaga ou JobProfile já construído
+            k: Número de currículos
+
+        Returns:
+            Lista de (id do currículo, similaridade cosseno)
+        """
+        query = job.embedding if isinstance(job, JobProfile) else self.engine.encode_texts([job])[0]
+        if query is None:
+            return []
+
+        hits = self._broadcast('search', np.asarray(query, dtype=np.float32), k)
+        merged = heapq.merge(*(hits[shard] for shard in sorted(hits)), key=lambda hit: hit[1], reverse=True)
+        return self._unique(merged, k, key=lambda hit: hit[0])
+
+    def rank(self, job_description: str, job_level: str = "Pleno", k: int = 50,
+             shortlist_size: Optional[int] = None) -> List[Dict]:
+        """
+        Retorna os k melhores currículos de todos os shards com a pontuação completa
+
+        Args:
+            job_description: Descrição da vaga
+            job_level: Nível da vaga
+            k: Número de currículos retornados
+            shortlist_size: Shortlist avaliada em cada shard (padrão: k * INDEX_SHORTLIST_FACTOR)
+
+        Returns:
+            Lista de resultados ordenados por score (mesmo formato de batch_analyze)
+        """
+        job_profile = self.engine.build_job_profile(job_description, job_level)
+        return self.rank_profile(job_profile, k, shortlist_size)
+
+    def rank_profile(self, job_profile: JobProfile, k: int = 50,
+                     shortlist_size: Optional[int] = None) -> List[Dict]:
+        """
+        Igual a rank(), para uma vaga já pré-processada (com embedding)
+
+        Args:
+            job_profile: Perfil da vaga gerado por build_job_profile
+            k: Número de currículos retornados
+            shortlist_size: Shortlist avaliada em cada shard (padrão: k * INDEX_SHORTLIST_FACTOR)
+
+        Returns:
+            Lista de resultados ordenados por score (mesmo formato de batch_analyze)
+        """
+        rankings = self._broadcast('rank', job_profile, k, shortlist_size)
+
+        # Cada shard devolve sua lista já ordenada: basta intercalar
+        merged = heapq.merge(
+            *(rankings[shard] for shard in sorted(rankings)),
+            key=lambda result: result.get('overall_score', 0),
+            reverse=True
+        )
+        return self._unique(merged, k, key=lambda result: result.get('id'))
+
+    @staticmethod
+    def _unique(items, k: int, key) -> List:
+        """Primeiros k itens sem ids repetidos (um currículo em movimento pode estar em dois shards)"""
+        seen = set()
+        unique = []
+        for item in items:
+            item_id = key(item)
+            if item_id in seen:
+                continue
+            seen.add(item_id)
+            unique.append(item)
+            if len(unique) >= k:
+                break
+        return unique
+
+    def _move(self, ids: List[str], source: int, target: int):
+        """Move currículos com seus embeddings: insere no destino antes de remover da origem"""
+        with self._lock:
+            resumes, embeddings = self._scatter({source: ('export', (ids,))})[source]
+            self._scatter({target: ('add', (resumes, embeddings))})
+            self._scatter({source: ('delete', (ids,))})
+            for item_id in ids:
+                self.placement[item_id] = target
+
+    def rebalance(self, tolerance: Optional[float] = None, batch_size: int = 1000) -> int:
+        """
+        Move currículos dos shards maiores para os menores até ficarem equilibrados
+
+        Args:
+            tolerance: Desvio tolerado em relação ao tamanho médio (padrão: Config.SHARD_REBALANCE_TOLERANCE)
+            batch_size: Currículos movidos por vez
+
+        Returns:
+            Número de currículos movidos
+        """
+        if tolerance is None:
+            tolerance = get_config().get_shard_config()['rebalance_tolerance']
+
+        moved = 0
+        with self._lock:
+            while self.num_shards > 1:
+                sizes = self.shard_sizes()
+                average = len(self) / self.num_shards
+                source = int(np.argmax(sizes))
+                target = int(np.argmin(sizes))
+
+                excess = min(sizes[source] - average, average - sizes[target])
+                if sizes[source] - sizes[target] <= max(1, tolerance * average) or excess < 1:
+                    break
+
+                count = min(int(np.ceil(excess)), batch_size)
+                ids = [item_id for item_id, shard in self.placement.items() if shard == source][:count]
+                self._move(ids, source, target)
+                moved += len(ids)
+
+        if moved:
+            logger.info(f"Rebalanceamento: {moved} currículos movidos; tamanhos {self.shard_sizes()}")
+        return moved
+
+    def add_shard(self, address: Tuple[str, int], rebalance: bool = True) -> int:
+        """
+        Conecta um novo shard e, opcionalmente, rebalanceia
+
+        Args:
+            address: Endereço (host, porta) do shard
+            rebalance: Se True, move currículos para o novo shard
+
+        Returns:
+            Índice do novo shard
+        """
+        with self._lock:
+            self.addresses.append(address)
+            self.connections.append(Client(address, authkey=self.authkey))
+            shard = self.num_shards - 1
+
+            # Um shard que já tenha currículos entra no mapa
+            for item_id in self._scatter({shard: ('ids', ())})[shard]:
+                self.placement.setdefault(item_id, shard)
+
+            if rebalance:
+                self.rebalance()
+
+        return shard
+
+    def remove_shard(self, shard: int, batch_size: int = 1000) -> Tuple[str, int]:
+        """
+        Esvazia um shard (movendo seus currículos para os demais) e o desconecta
+
+        Args:
+            shard: Índice do shard
+            batch_size: Máximo de currículos por movimentação
+
+        Returns:
+            Endereço do shard removido (o processo continua em execução)
+        """
+        with self._lock:
+            if self.num_shards == 1:
+                raise ValueError("Não é possível remover o único shard")
+
+            ids = [item_id for item_id, owner in self.placement.items() if owner == shard]
+            sizes = self.shard_sizes()
+            targets = [other for other in range(self.num_shards) if other != shard]
+
+            # Cada currículo vai para o menor shard restante naquele momento,
+            # deixando os tamanhos finais o mais próximos possível
+            heap = [(sizes[other], other) for other in targets]
+            heapq.heapify(heap)
+            assignment = {other: [] for other in targets}
+            for item_id in ids:
+                size, target = heapq.heappop(heap)
+                assignment[target].append(item_id)
+                heapq.heappush(heap, (size + 1, target))
+
+            for target, target_ids in assignment.items():
+                for start in range(0, len(target_ids), batch_size):
+                    self._move(target_ids[start:start + batch_size], shard, target)
+
+            self.connections.pop(shard).close()
+            address = self.addresses.pop(shard)
+            self.placement = {
+                item_id: owner - 1 if owner > shard else owner for item_id, owner in self.placement.items()
+            }
+
+        logger.info(f"Shard {address} removido; tamanhos {self.shard_sizes()}")
+        return address
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Tamanho, fração de lápides e pid de cada shard"""
+        results = self._broadcast('stats')
+        return [dict(results[shard], address=self.addresses[shard]) for shard in range(self.num_shards)]
+
+    def compact(self):
+        """Compacta todos os shards"""
+        self._broadcast('compact')
+
+    def save(self, directories: Optional[List[str]] = None):
+        """
+        Salva o índice de cada shard
+
+        Args:
+            directories: Diretório de cada shard (padrão: o diretório com que cada shard foi iniciado)
+        """
+        directories = directories or [None] * self.num_shards
+        self._scatter({shard: ('save', (directories[shard],)) for shard in range(self.num_shards)})
+
+    def close(self):
+        """Fecha as conexões com os shards (os processos continuam em execução)"""
+        with self._lock:
+            for connection in self.connections:
+                connection.close()
+            self.connections = []
+            self.addresses = []
+
+class LocalShardCluster:
+    """
+    Shards em processos locais, para testes e para uso em uma única máquina
+    """
+
+    def __init__(self, num_shards: int, model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+                 engine_config: Optional[Dict[str, Any]] = None, index_dirs: Optional[List[str]] = None,
+                 threads_per_shard: Optional[int] = None, authkey: Optional[bytes] = None):
+        """
+        Configura o cluster (os processos são iniciados em start())
+
+        Args:
+            num_shards: Número de processos
+            model_name: Nome do modelo de embedding
+            engine_config: Configuração aplicada ao motor de cada shard
+            index_dirs: Diretório de índice de cada shard (opcional)
+            threads_per_shard: Threads do torch por processo (padrão: núcleos / shards)
+            authkey: Chave compartilhada (padrão: Config.SHARD_AUTHKEY)
+        """
+        shard_config = get_config().get_shard_config()
+        self.num_shards = num_shards
+        self.model_name = model_name
+        self.engine_config = engine_config
+        self.index_dirs = list(index_dirs or [None] * num_shards)
+        self.threads_per_shard = threads_per_shard or max(1, (os.cpu_count() or 1) // num_shards)
+        self.authkey = authkey if authkey is not None else shard_config['authkey']
+        self.timeout_seconds = shard_config['timeout_seconds']
+
+        self.addresses: List[Tuple[str, int]] = []
+        self.processes: List[multiprocessing.Process] = []
+
+    def __enter__(self) -> 'LocalShardCluster':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self) -> List[Tuple[str, int]]:
+        """
+        Inicia os processos dos shards e aguarda todos ficarem prontos
+
+        Returns:
+            Endereços dos shards
+        """
+        pending = [self._spawn(index_dir) for index_dir in self.index_dirs[len(self.processes):]]
+        for reader in pending:
+            self.addresses.append(self._wait_ready(reader))
+        return list(self.addresses)
+
+    def add_shard(self, index_dir: Optional[str] = None) -> Tuple[str, int]:
+        """
+        Inicia mais um processo de shard
+
+        Args:
+            index_dir: Diretório de índice do novo shard (opcional)
+
+        Returns:
+            Endereço do novo shard
+        """
+        self.index_dirs.append(index_dir)
+        self.num_shards += 1
+        address = self._wait_ready(self._spawn(index_dir))
+        self.addresses.append(address)
+        return address
+
+    def _spawn(self, index_dir: Optional[str]) -> Connection:
+        """Cria um processo de shard e retorna a conexão pela qual ele informa o endereço"""
+        context = multiprocessing.get_context('spawn')
+        reader, writer = context.Pipe(duplex=False)
+        process = context.Process(
+            target=run_shard_server,
+            kwargs={
+                'model_name': self.model_name,
+                'index_dir': index_dir,
+                'engine_config': self.engine_config,
+                'threads': self.threads_per_shard,
+                'address': (get_config().SHARD_HOST, 0),
+                'authkey': self.authkey,
+                'ready': writer
+            },
+            daemon=True
+        )
+        process.start()
+        writer.close()
+        self.processes.append(process)
+        return reader
+
+    def _wait_ready(self, reader: Connection) -> Tuple[str, int]:
+        """Aguarda o shard informar o endereço de escuta"""
+        try:
+            if not reader.poll(self.timeout_seconds):
+                raise TimeoutError("Shard não ficou pronto a tempo")
+            return reader.recv()
+        except EOFError:
+            raise RuntimeError("Processo do shard terminou durante a inicialização")
+        finally:
+            reader.close()
+
+    def connect(self, engine: SemanticEngine) -> ShardedCandidateIndex:
+        """
+        Cria um coordenador conectado a todos os shards do cluster
+
+        Args:
+            engine: Motor semântico do coordenador (mesmo modelo dos shards)
+
+        Returns:
+            Coordenador do índice distribuído
+        """
+        return ShardedCandidateIndex(engine, self.addresses, self.authkey)
+
+    def stop(self):
+        """Encerra os processos dos shards"""
+        for address in self.addresses:
+            try:
+                with Client(address, authkey=self.authkey) as connection:
+                    connection.send(('shutdown', ()))
+                    if connection.poll(self.timeout_seconds):
+                        connection.recv()
+            except (OSError, EOFError):
+                pass
+
+        for process in self.processes:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+
+        self.addresses = []
+        self.processes = []
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Servidor de um shard do índice de candidatos")
+    parser.add_argument('--host', default=get_config().SHARD_HOST)
+    parser.add_argument('--port', type=int, default=0)
+    parser.add_argument('--index-dir', default=None)
+    parser.add_argument('--model', default="sentence-transformers/all-MiniLM-L6-v2")
+    parser.add_argument('--threads', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format=get_config().LOG_FORMAT)
+    run_shard_server(args.model, args.index_dir, threads=args.threads, address=(args.host, args.port))
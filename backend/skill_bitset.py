@@ -0,0 +1,137 @@
+"""
+Representação de skills em bitset sobre o vocabulário de skills técnicas
+
+Cada candidato vira uma linha de palavras uint64 (um bit por skill do
+vocabulário). O match de skills de um pool inteiro contra a vaga sai de uma
+única operação AND + popcount vetorizada, com a mesma fórmula de
+SemanticEngine.calculate_skills_match.
+"""
+
+from typing import Dict, List, Iterable
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Tabela de popcount por byte, usada quando np.bitwise_count não existe (NumPy < 2.0)
+_BYTE_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+def popcount(masks: np.ndarray) -> np.ndarray:
+    """
+    Conta os bits ligados de cada linha
+
+    Args:
+        masks: Matriz (n, n_palavras) ou vetor (n_palavras,) de uint64
+
+    Returns:
+        Número de bits ligados por linha
+    """
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(masks).sum(axis=-1, dtype=np.int64)
+
+    as_bytes = np.ascontiguousarray(masks).view(np.uint8)
+    return _BYTE_POPCOUNT[as_bytes].sum(axis=-1, dtype=np.int64)
+
+class SkillBitset:
+    """
+    Codificador de listas de skills em bitsets de largura fixa
+    """
+
+    def __init__(self, vocabulary: List[str]):
+        """
+        Inicializa o codificador
+
+        Args:
+            vocabulary: Vocabulário de skills (cada skill ocupa um bit)
+        """
+        self.vocabulary = list(dict.fromkeys(vocabulary))
+        self.bit_of: Dict[str, int] = {skill: bit for bit, skill in enumerate(self.vocabulary)}
+        self.n_words = max(1, (len(self.vocabulary) + 63) // 64)
+
+    def encode(self, skills: Iterable[str]) -> np.ndarray:
+        """
+        Converte uma lista de skills em bitset (skills fora do vocabulário são ignoradas)
+
+        Args:
+            skills: Skills normalizadas
+
+        Returns:
+            Vetor (n_palavras,) de uint64
+        """
+        mask = np.zeros(self.n_words, dtype=np.uint64)
+        for skill in skills:
+            bit = self.bit_of.get(skill)
+            if bit is not None:
+                mask[bit >> 6] |= np.uint64(1) << np.uint64(bit & 63)
+        return mask
+
+    def encode_many(self, skill_lists: List[Iterable[str]]) -> np.ndarray:
+        """
+        Converte várias listas de skills em uma matriz de bitsets
+
+        Args:
+            skill_lists: Uma lista de skills por candidato
+
+        Returns:
+            Matriz (n_candidatos, n_palavras) de uint64
+        """
+        masks = np.zeros((len(skill_lists), self.n_words), dtype=np.uint64)
+        for row, skills in enumerate(skill_lists):
+            masks[row] = self.encode(skills)
+        return masks
+
+    def decode(self, mask: np.ndarray) -> List[str]:
+        """
+        Converte um bitset de volta em lista de skills
+
+        Args:
+            mask: Vetor (n_palavras,) de uint64
+
+        Returns:
+            Skills cujo bit está ligado, na ordem do vocabulário
+        """
+        bits = np.unpackbits(np.ascontiguousarray(mask).view(np.uint8), bitorder='little')
+        return [self.vocabulary[bit] for bit in np.flatnonzero(bits[:len(self.vocabulary)])]
+
+    def skills_match(self, resume_masks: np.ndarray, job_mask: np.ndarray) -> np.ndarray:
+        """
+        Score de match de skills de todos os candidatos contra a vaga
+
+        Mesma fórmula de calculate_skills_match: proporção de skills da vaga
+        encontradas mais bônus de 2 pontos por skill extra (até 10), limitado a 100.
+
+        Args:
+            resume_masks: Matriz (n_candidatos, n_palavras) de bitsets
+            job_mask: Bitset das skills da vaga
+
+        Returns:
+            Vetor de scores (0-100), um por candidato
+        """
+        resume_masks = np.atleast_2d(resume_masks)
+        job_count = int(popcount(job_mask))
+
+        if job_count == 0:
+            return np.full(len(resume_masks), 50.0)  # Score neutro se não há skills especificadas
+
+        resume_count = popcount(resume_masks)
+        matching = popcount(resume_masks & job_mask)
+
+        scores = matching / job_count * 100 + np.minimum(resume_count - matching, 10) * 2
+        scores = np.minimum(100.0, scores)
+        scores[resume_count == 0] = 0.0
+
+        return scores
+
+    def missing_skills(self, resume_mask: np.ndarray, job_mask: np.ndarray) -> List[str]:
+        """
+        Skills da vaga ausentes no currículo
+
+        Args:
+            resume_mask: Bitset do currículo
+            job_mask: Bitset da vaga
+
+        Returns:
+            Lista de skills em falta
+        """
+        return self.decode(job_mask & ~resume_mask)
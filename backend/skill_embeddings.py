@@ -0,0 +1,147 @@
+"""
+Match semântico de skills contra uma matriz pré-computada de embeddings do vocabulário
+
+O vocabulário de skills (técnicas e soft skills) é codificado uma única vez e
+guardado em um artefato .npz. Os n-gramas candidatos de um texto são
+codificados juntos e associados à skill canônica mais próxima com um único
+produto matricial, aceitando apenas similaridades acima de similarity_threshold.
+Isso cobre sinônimos e variações ('postgres' -> 'postgresql', 'react.js' -> 'react')
+que o match exato não encontra.
+"""
+
+import hashlib
+import os
+import re
+from typing import Callable, Iterable, List, Optional, Set
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Tokens preservam skills como c++, c#, node.js e asp.net
+TOKEN_PATTERN = re.compile(r"\w[\w+#.]*")
+
+def _vocabulary_hash(vocabulary: List[str]) -> str:
+    """Identifica o vocabulário para invalidar o artefato quando ele mudar"""
+    return hashlib.sha256('\n'.join(vocabulary).encode('utf-8')).hexdigest()
+
+class SkillEmbeddingIndex:
+    """
+    Matriz de embeddings do vocabulário de skills com consulta em lote por n-gramas
+    """
+
+    def __init__(self, vocabulary: List[str], encode_fn: Callable[[List[str]], np.ndarray],
+                 namespace: str = '', artifact_path: Optional[str] = None,
+                 stop_words: Optional[Set[str]] = None, max_ngram: int = 2):
+        """
+        Carrega a matriz do artefato ou codifica o vocabulário uma única vez
+
+        Args:
+            vocabulary: Skills canônicas (normalizadas)
+            encode_fn: Função que gera embeddings normalizados para uma lista de textos
+            namespace: Identificador do modelo (o artefato só é reutilizado pelo mesmo modelo)
+            artifact_path: Arquivo .npz com a matriz (opcional)
+            stop_words: Palavras ignoradas na geração de n-gramas
+            max_ngram: Tamanho máximo dos n-gramas candidatos
+        """
+        self.vocabulary = list(dict.fromkeys(vocabulary))
+        self.encode_fn = encode_fn
+        self.stop_words = stop_words or set()
+        self.max_ngram = max_ngram
+        self._vocabulary_set = set(self.vocabulary)
+
+        fingerprint = f"{namespace}:{_vocabulary_hash(self.vocabulary)}"
+        self.matrix = self._load_artifact(artifact_path, fingerprint)
+
+        if self.matrix is None:
+            logger.info(f"Codificando vocabulário de {len(self.vocabulary)} skills...")
+            self.matrix = np.asarray(encode_fn(self.vocabulary), dtype=np.float32)
+            self._save_artifact(artifact_path, fingerprint)
+
+    def _load_artifact(self, artifact_path: Optional[str], fingerprint: str) -> Optional[np.ndarray]:
+        """Lê a matriz salva, se existir e corresponder ao mesmo modelo e vocabulário"""
+        if not artifact_path or not os.path.exists(artifact_path):
+            return None
+
+        try:
+            data = np.load(artifact_path)
+            if str(data['fingerprint']) == fingerprint:
+                return data['matrix']
+        except Exception as e:
+            logger.error(f"Erro ao carregar embeddings de skills: {str(e)}")
+
+        return None
+
+    def _save_artifact(self, artifact_path: Optional[str], fingerprint: str):
+        """Grava a matriz para as próximas inicializações"""
+        if not artifact_path:
+            return
+
+        try:
+            directory = os.path.dirname(artifact_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            np.savez(artifact_path, matrix=self.matrix, fingerprint=np.array(fingerprint))
+        except Exception as e:
+            logger.error(f"Erro ao salvar embeddings de skills: {str(e)}")
+
+    def candidate_phrases(self, normalized_text: str, exclude: Iterable[str] = ()) -> List[str]:
+        """
+        Gera os n-gramas candidatos do texto, sem repetição e em ordem de ocorrência
+
+        N-gramas formados só por stop words ou números, ou já presentes no
+        vocabulário (cobertos pelo match exato), são descartados.
+
+        Args:
+            normalized_text: Texto já normalizado
+            exclude: Frases a ignorar
+
+        Returns:
+            Lista de frases candidatas
+        """
+        tokens = [token.rstrip('.') for token in TOKEN_PATTERN.findall(normalized_text)]
+        excluded = set(exclude) | self._vocabulary_set
+        phrases = {}
+
+        for size in range(1, self.max_ngram + 1):
+            for start in range(len(tokens) - size + 1):
+                gram = tokens[start:start + size]
+                if all(token in self.stop_words or token.isdigit() or len(token) < 2 for token in gram):
+                    continue
+                phrase = ' '.join(gram)
+                if phrase not in excluded and phrase not in phrases:
+                    phrases[phrase] = start
+
+        return sorted(phrases, key=phrases.get)
+
+    def match(self, normalized_text: str, threshold: float, exclude: Iterable[str] = ()) -> List[str]:
+        """
+        Associa os n-gramas do texto às skills canônicas por similaridade
+
+        Args:
+            normalized_text: Texto já normalizado
+            threshold: Similaridade cosseno mínima (similarity_threshold)
+            exclude: Skills já encontradas pelo match exato
+
+        Returns:
+            Skills canônicas encontradas, sem repetição, em ordem de ocorrência
+        """
+        exclude = set(exclude)
+        phrases = self.candidate_phrases(normalized_text, exclude)
+        if not phrases:
+            return []
+
+        # Uma única consulta em lote contra a matriz do vocabulário
+        similarities = np.asarray(self.encode_fn(phrases), dtype=np.float32) @ self.matrix.T
+        best = similarities.argmax(axis=1)
+        best_scores = similarities[np.arange(len(phrases)), best]
+
+        found = []
+        for row in np.flatnonzero(best_scores >= threshold):
+            skill = self.vocabulary[best[row]]
+            if skill not in exclude:
+                exclude.add(skill)
+                found.append(skill)
+
+        return found
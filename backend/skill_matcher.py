@@ -0,0 +1,156 @@
+"""
+Matcher de skills baseado em autômato Aho-Corasick
+
+Encontra todas as skills de um vocabulário (inclusive termos com várias
+palavras ou pontuação, como 'sql server', 'node.js' e 'ci/cd') em uma única
+passada linear sobre o texto normalizado, independentemente do tamanho do
+vocabulário.
+"""
+
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+def normalize_for_matching(text: str) -> str:
+    """
+    Normaliza texto para o matcher (minúsculas e espaços colapsados)
+
+    Args:
+        text: Texto original
+
+    Returns:
+        Texto normalizado
+    """
+    if not text:
+        return ""
+    return _WHITESPACE_RE.sub(' ', text.lower()).strip()
+
+def _is_word_char(char: str) -> bool:
+    """Indica se o caractere faz parte de uma palavra (letras com acento, dígitos ou _)"""
+    return char.isalnum() or char == '_'
+
+class SkillMatcher:
+    """
+    Autômato Aho-Corasick compilado sobre um vocabulário de skills
+
+    Um termo só é reconhecido quando delimitado por fronteiras de palavra,
+    de modo que 'java' não casa dentro de 'javascript'.
+    """
+
+    def __init__(self, vocabulary: Iterable[str]):
+        """
+        Compila o autômato para o vocabulário
+
+        Args:
+            vocabulary: Termos a reconhecer (uma ou mais palavras)
+        """
+        self.vocabulary: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, int]]] = [[]]
+
+        seen = set()
+        for term in vocabulary:
+            pattern = normalize_for_matching(term)
+            if pattern and pattern not in seen:
+                seen.add(pattern)
+                self._add_pattern(pattern, len(self.vocabulary))
+                self.vocabulary.append(pattern)
+
+        self._build_failure_links()
+
+    def __len__(self) -> int:
+        return len(self.vocabulary)
+
+    def _add_pattern(self, pattern: str, index: int):
+        """Insere um padrão na trie"""
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state].append((len(pattern), index))
+
+    def _build_failure_links(self):
+        """Calcula os links de falha por busca em largura"""
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+
+                # Herdar as saídas do estado de falha (sufixos que também são padrões)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find_matches(self, text: str, normalized: bool = False) -> List[Tuple[int, int]]:
+        """
+        Encontra todas as ocorrências de termos do vocabulário
+
+        Args:
+            text: Texto a varrer
+            normalized: Se o texto já passou por normalize_for_matching
+
+        Returns:
+            Lista de (posição inicial, índice do termo) na ordem em que terminam no texto
+        """
+        if not normalized:
+            text = normalize_for_matching(text)
+
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        text_length = len(text)
+
+        matches = []
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            if output[state]:
+                for length, index in output[state]:
+                    start = position - length + 1
+                    if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+                        continue
+                    end = position + 1
+                    if end < text_length and _is_word_char(text[end]) and _is_word_char(text[position]):
+                        continue
+                    matches.append((start, index))
+
+        return matches
+
+    def find_all(self, text: str, normalized: bool = False) -> List[str]:
+        """
+        Retorna os termos encontrados, sem repetição, na ordem em que aparecem
+
+        Args:
+            text: Texto a varrer
+            normalized: Se o texto já passou por normalize_for_matching
+
+        Returns:
+            Lista de termos do vocabulário encontrados
+        """
+        matches = sorted(self.find_matches(text, normalized))
+
+        found = []
+        seen = set()
+        for _, index in matches:
+            if index not in seen:
+                seen.add(index)
+                found.append(self.vocabulary[index])
+
+        return found
@@ -328,6 +328,114 @@ Localização: São Paulo, SP
 Modelo de Trabalho: Híbrido
 """
 
+def text_to_docx_bytes(text: str) -> bytes:
+    """
+    Gera um DOCX mínimo com um parágrafo por linha do texto
+    
+    O pacote (content types, relacionamentos e document.xml) é montado
+    diretamente, dezenas de vezes mais rápido que via python-docx, que carrega o
+    template completo a cada documento.
+    
+    Args:
+        text: Texto do documento
+        
+    Returns:
+        Conteúdo do arquivo DOCX
+    """
+    import io
+    import re
+    import zipfile
+    from xml.sax.saxutils import escape
+    
+    # Caracteres de controle não são permitidos em XML
+    text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f]', '', text)
+    paragraphs = ''.join(
+        f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>' for line in text.splitlines()
+    )
+    
+    content_types = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        '</Types>'
+    )
+    relationships = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="word/document.xml"/>'
+        '</Relationships>'
+    )
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{paragraphs}</w:body></w:document>'
+    )
+    
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as package:
+        for name, content in (('[Content_Types].xml', content_types), ('_rels/.rels', relationships),
+                              ('word/document.xml', document)):
+            # Data fixa: o mesmo texto gera sempre os mesmos bytes
+            entry = zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0))
+            package.writestr(entry, content, compress_type=zipfile.ZIP_DEFLATED)
+    return buffer.getvalue()
+
+def text_to_pdf_bytes(text: str, lines_per_page: int = 60, max_line_length: int = 95) -> bytes:
+    """
+    Gera um PDF simples (Helvetica 10pt) com o texto, sem dependências externas
+    
+    Args:
+        text: Texto do documento
+        lines_per_page: Linhas por página
+        max_line_length: Linhas mais longas são quebradas neste número de caracteres
+        
+    Returns:
+        Conteúdo do arquivo PDF
+    """
+    import textwrap
+    
+    lines = []
+    for line in text.splitlines():
+        lines.extend(textwrap.wrap(line, max_line_length) or [''])
+    pages = [lines[start:start + lines_per_page] for start in range(0, len(lines), lines_per_page)] or [[]]
+    
+    def escape(line: str) -> bytes:
+        encoded = line.encode('cp1252', errors='replace')
+        return encoded.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+    
+    # Objetos: 1 catálogo, 2 árvore de páginas, 3 fonte, depois (página, conteúdo) por página
+    page_ids = [4 + 2 * index for index in range(len(pages))]
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [' + b' '.join(b'%d 0 R' % page_id for page_id in page_ids)
+        + b'] /Count %d >>' % len(pages),
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>'
+    ]
+    for page_id, page_lines in zip(page_ids, pages):
+        stream = b'BT /F1 10 Tf 12 TL 50 800 Td ' + b' '.join(b'(' + escape(line) + b") '" for line in page_lines) + b' ET'
+        objects.append(
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] '
+            b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % (page_id + 1)
+        )
+        objects.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+    
+    output = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    
+    xref_offset = len(output)
+    output += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    output += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    output += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref_offset)
+    return bytes(output)
+
 def calculate_statistics(results: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
     Calcula estatísticas dos resultados